@@ -0,0 +1,325 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: NumPy engine that plays thousands of HasamiShogiGame games in lockstep
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE BATCHED ENGINE WORKS ===============
+# 1) Storing N games
+#       Every board is a row of an int8 array of shape (N, 9, 9), indexed [game][y][x] like the Board class.
+#       Squares hold EMPTY (0), RED (1), or BLACK (-1), so a player's opponent is always -player.
+#       The active player, captured pieces counts, and game states are int arrays of shape (N,).
+#       Game states are UNFINISHED (0), RED_WON (1), BLACK_WON (2), or DRAW (3), GAME_STATES converts them to
+#       strings. Batched moves never draw a game, DRAW only comes from positions of HasamiShogiGame games with a
+#       repetition rule.
+#
+# 2) Making one move in every game
+#       make_moves takes an array of origin square indices and an array of destination square indices (-1 for
+#       no move) and makes every move at once. It does the same checks as HasamiShogiGame.make_move: the game is
+#       unfinished, the origin holds the active player's piece, the squares are different and in a line, and
+#       the path is clear. Path checks use a precomputed (81, 81, 81) table of the squares a move passes over.
+#
+# 3) Capturing
+#       For every direction out of the destination, the squares along the ray are looked up with a precomputed
+#       (81, 4, 8) table (missing squares point at an extra always empty square 81). The opponent pieces at
+#       the start of the ray are captured if the square after them holds the mover's piece.
+#       If the first square of the ray is a corner, the corner rule is used instead: the corner is captured when
+#       both of its neighbors hold the mover's pieces, exactly as HasamiShogiGame._check_sandwiched does.
+#       The rays out of one square never share squares, so every direction can be checked at the same time.
+#
+
+import time
+
+import numpy as np
+
+from HasamiShogiGame import HasamiShogiGame, RAYS
+
+EMPTY = 0
+RED = 1
+BLACK = -1
+PLAYER_CODES = {"RED": RED, "BLACK": BLACK, "NONE": EMPTY}
+PLAYER_NAMES = {RED: "RED", BLACK: "BLACK", EMPTY: "NONE"}
+
+UNFINISHED = 0
+RED_WON = 1
+BLACK_WON = 2
+DRAW = 3
+GAME_STATES = ("UNFINISHED", "RED_WON", "BLACK_WON", "DRAW")
+
+_OFF_BOARD = 81  # Index of the extra empty square used for rays that leave the board
+_CORNERS = (0, 8, 72, 80)
+
+
+def _build_tables():
+    """
+    Builds the lookup tables used to check paths and captures.
+    :return: (paths, rays, corner_neighbors) tuple:
+             paths is a bool array of shape (81, 81, 81), paths[origin, destination] marks every square from the one
+             after the origin up to the destination, and is all False when the squares aren't in a line.
+             rays is an int array of shape (81, 4, 8) of the squares walked from each square in each direction.
+             corner_neighbors is an int array of shape (82, 2) of the two neighbors of each corner (81 elsewhere).
+    """
+    paths = np.zeros((81, 81, 81), dtype=bool)
+    rays = np.full((81, 4, 8), _OFF_BOARD, dtype=np.int64)
+    for origin in range(81):
+        for direction_number, direction in enumerate(("LEFT", "RIGHT", "DOWN", "UP")):
+            ray = RAYS[direction][origin]
+            rays[origin, direction_number, :len(ray)] = ray
+            for length, destination in enumerate(ray):
+                paths[origin, destination, list(ray[:length + 1])] = True
+    corner_neighbors = np.full((82, 2), _OFF_BOARD, dtype=np.int64)
+    for corner in _CORNERS:
+        corner_neighbors[corner] = [ray[0] for ray in (RAYS[direction][corner] for direction in RAYS) if ray]
+    return paths, rays, corner_neighbors
+
+
+_PATHS, _RAYS, _CORNER_NEIGHBORS = _build_tables()
+_ALIGNED = _PATHS.any(axis=2)  # _ALIGNED[origin, destination] is True for different squares in one line
+_IS_CORNER = np.zeros(82, dtype=bool)
+_IS_CORNER[list(_CORNERS)] = True
+_ON_BOARD = _RAYS != _OFF_BOARD  # _ON_BOARD[square, direction, step] is False past the edge of the board
+
+
+class BatchGame:
+    """The BatchGame class holds N hasami shogi games and makes one move in each of them at a time.
+    This class will contain the following data members:
+    An int8 array of shape (N, 9, 9) holding every board
+    An int8 array of the active player of each game (init'd as BLACK)
+    An int16 array of the pieces captured by red in each game
+    An int16 array of the pieces captured by black in each game
+    An int8 array of the game state of each game (init'd as UNFINISHED)"""
+
+    def __init__(self, games):
+        """The constructor for the BatchGame class.
+        :param games: Int number of games, every one starts in the starting position"""
+        self._boards = np.zeros((games, 9, 9), dtype=np.int8)
+        self._boards[:, 0, :] = RED
+        self._boards[:, 8, :] = BLACK
+        self._active = np.full(games, BLACK, dtype=np.int8)
+        self._captured_by_red = np.zeros(games, dtype=np.int16)
+        self._captured_by_black = np.zeros(games, dtype=np.int16)
+        self._states = np.zeros(games, dtype=np.int8)
+
+    @classmethod
+    def from_games(cls, games):
+        """
+        Method that creates a BatchGame holding copies of the positions of HasamiShogiGame objects.
+        :param games: List of HasamiShogiGame
+        :return: A BatchGame
+        """
+        batch = cls(len(games))
+        for number, game in enumerate(games):
+            batch.set_position(number, game._get_position())
+        return batch
+
+    def __len__(self):
+        """
+        Method that returns the number of games.
+        :return: Int
+        """
+        return len(self._states)
+
+    def get_boards(self):
+        """
+        Method that returns the boards.
+        :return: int8 array of shape (N, 9, 9), indexed [game][y][x]
+        """
+        return self._boards
+
+    def get_active_players(self):
+        """
+        Method that returns whose turn it is in every game.
+        :return: int8 array of RED or BLACK
+        """
+        return self._active
+
+    def get_game_states(self):
+        """
+        Method that returns the state of every game.
+        :return: int8 array of UNFINISHED, RED_WON, BLACK_WON, or DRAW. Batched moves don't apply a repetition
+                 rule, so DRAW only comes from a position set from a drawn HasamiShogiGame
+        """
+        return self._states
+
+    def get_num_captured_pieces(self, player: str):
+        """
+        Method that returns the number of pieces of a color captured in every game.
+        :param player: "BLACK" or "RED"
+        :return: int16 array
+        """
+        if player == "BLACK":
+            return self._captured_by_red
+        return self._captured_by_black
+
+    def get_position(self, number):
+        """
+        Method that returns one game's position in the format of HasamiShogiGame._get_position.
+        :param number: Int game number
+        :return: (board, active player, game state, captured by black, captured by red) tuple
+        """
+        characters = {RED: "R", BLACK: "B", EMPTY: "."}
+        board = "".join(characters[value] for value in self._boards[number].ravel().tolist())
+        return (board, PLAYER_NAMES[int(self._active[number])], GAME_STATES[self._states[number]],
+                int(self._captured_by_black[number]), int(self._captured_by_red[number]))
+
+    def set_position(self, number, position):
+        """
+        Method that replaces one game's position.
+        :param number: Int game number
+        :param position: Tuple in the format of HasamiShogiGame._get_position
+        :return: None
+        """
+        codes = {"R": RED, "B": BLACK, ".": EMPTY}
+        board, active, state, captured_by_black, captured_by_red = position
+        self._boards[number] = np.array([codes[character] for character in board], dtype=np.int8).reshape(9, 9)
+        self._active[number] = PLAYER_CODES[active]
+        self._states[number] = GAME_STATES.index(state)
+        self._captured_by_black[number] = captured_by_black
+        self._captured_by_red[number] = captured_by_red
+
+    def _get_reachable(self):
+        """
+        Finds every square each of the active player's pieces can slide to, as steps along the precomputed rays.
+        :return: (pieces, reachable) tuple. pieces is an int array of shape (N, 9) of the square of each of the
+                 active player's pieces. reachable is a bool array of shape (N, 9, 4, 8), True at
+                 [game, piece, direction, step] when the ray is empty up to that step. Rows for pieces a player
+                 no longer has, and every row of finished games, are all False. A player never has more than 9
+                 pieces, since pieces are never added after the starting position
+        """
+        flat = self._boards.reshape(len(self), 81)
+        own = (flat == self._active[:, None]) & (self._states == UNFINISHED)[:, None]
+        pieces = np.argsort(~own, axis=1, kind="stable")[:, :9]  # Own pieces first, in square order
+        has_piece = np.take_along_axis(own, pieces, axis=1)
+        padded = np.concatenate([flat, np.zeros((len(self), 1), dtype=np.int8)], axis=1)
+        rays = _RAYS[pieces]  # (N, 9, 4, 8)
+        empty = np.take_along_axis(padded, rays.reshape(len(self), -1), axis=1).reshape(rays.shape) == EMPTY
+        empty &= _ON_BOARD[pieces] & has_piece[:, :, None, None]
+        for step in range(1, 8):
+            empty[:, :, :, step] &= empty[:, :, :, step - 1]
+        return pieces, empty
+
+    def get_legal_moves(self):
+        """
+        Method that finds every legal move in every game.
+        :return: bool array of shape (N, 81, 81), True at [game, origin, destination] for legal moves
+        """
+        pieces, reachable = self._get_reachable()
+        legal = np.zeros((len(self), 81, 81), dtype=bool)
+        games, piece_numbers, directions, steps = np.nonzero(reachable)
+        origins = pieces[games, piece_numbers]
+        legal[games, origins, _RAYS[origins, directions, steps]] = True
+        return legal
+
+    def random_moves(self, rng):
+        """
+        Method that picks a random legal move in every game, every legal move being equally likely.
+        :param rng: numpy.random.Generator
+        :return: (origins, destinations) int arrays of square indices, -1 for games without a legal move
+        """
+        pieces, reachable = self._get_reachable()
+        reachable = reachable.reshape(len(self), 9 * 32)
+        weights = np.where(reachable, rng.random(reachable.shape, dtype=np.float32), -1.0)
+        picked = weights.argmax(axis=1)
+        games = np.arange(len(self))
+        origins = pieces[games, picked // 32]
+        destinations = _RAYS.reshape(81, 32)[origins, picked % 32]
+        has_move = reachable.any(axis=1)
+        return np.where(has_move, origins, -1), np.where(has_move, destinations, -1)
+
+    def make_moves(self, origins, destinations):
+        """
+        Method that makes one move in every game, following the same rules as HasamiShogiGame.make_move.
+        :param origins: int array of origin square indices, -1 for no move
+        :param destinations: int array of destination square indices, -1 for no move
+        :return: bool array, True for every game where the move was legal and was made
+        """
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        games = np.arange(len(self))
+        flat = self._boards.reshape(len(self), 81)
+        player = self._active
+
+        # Check every move, using square 0 as a stand in for missing squares so the lookups are in range
+        given = (origins >= 0) & (destinations >= 0)
+        safe_origins = np.where(given, origins, 0)
+        safe_destinations = np.where(given, destinations, 0)
+        legal = (given & (self._states == UNFINISHED) &
+                 (flat[games, safe_origins] == player) &
+                 _ALIGNED[safe_origins, safe_destinations])
+        path_blocked = ((flat != EMPTY) & _PATHS[safe_origins, safe_destinations]).any(axis=1)
+        legal &= ~path_blocked
+        moving = games[legal]
+        if len(moving) == 0:
+            return legal
+
+        # Move the pieces
+        origins = safe_origins[moving]
+        destinations = safe_destinations[moving]
+        player = player[moving]
+        flat[moving, origins] = EMPTY
+        flat[moving, destinations] = player
+
+        # Look up every ray out of the destinations on boards with an extra empty square
+        padded = np.concatenate([flat[moving], np.zeros((len(moving), 1), dtype=np.int8)], axis=1)
+        rays = _RAYS[destinations]  # (moving, 4, 8)
+        values = np.take_along_axis(padded, rays.reshape(len(moving), 32), axis=1).reshape(len(moving), 4, 8)
+
+        # Straight line captures: a run of opponent pieces followed by one of the mover's pieces
+        opponent_run = np.cumprod(values == -player[:, None, None], axis=2).astype(bool)
+        run_length = opponent_run.sum(axis=2)
+        stopper = np.take_along_axis(np.concatenate([values, np.zeros((len(moving), 4, 1), dtype=np.int8)],
+                                                    axis=2), run_length[:, :, None], axis=2)[:, :, 0]
+        captured = opponent_run & (stopper == player[:, None])[:, :, None]
+
+        # Corner captures replace straight line captures when the first square of a ray is a corner
+        first = rays[:, :, 0]
+        corner = _IS_CORNER[first]
+        neighbors = _CORNER_NEIGHBORS[first]  # (moving, 4, 2)
+        surrounded = (np.take_along_axis(padded, neighbors.reshape(len(moving), 8), axis=1).reshape(len(moving), 4, 2)
+                      == player[:, None, None]).all(axis=2)
+        captured[corner] = False
+        captured[:, :, 0] |= corner & surrounded
+
+        # Remove the captured pieces and count them
+        capture_games, capture_directions, capture_steps = np.nonzero(captured)
+        flat[moving[capture_games], rays[capture_games, capture_directions, capture_steps]] = EMPTY
+        counts = captured.sum(axis=(1, 2)).astype(np.int16)
+        self._captured_by_red[moving] += np.where(player == RED, counts, 0).astype(np.int16)
+        self._captured_by_black[moving] += np.where(player == BLACK, counts, 0).astype(np.int16)
+
+        # End games with 9 captures, otherwise pass the turn
+        over = (self._captured_by_red[moving] >= 9) | (self._captured_by_black[moving] >= 9)
+        self._states[moving[over]] = np.where(player[over] == RED, RED_WON, BLACK_WON)
+        self._active[moving[~over]] = -player[~over]
+        return legal
+
+
+def play_random_games(games, plies, seed=None):
+    """
+    Function that plays random moves in many games at once.
+    :param games: Int number of games
+    :param plies: Int number of plies to play (finished games stop moving)
+    :param seed: Seed for numpy's random generator, or None
+    :return: The BatchGame
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchGame(games)
+    for ply in range(plies):
+        origins, destinations = batch.random_moves(rng)
+        if not batch.make_moves(origins, destinations).any():
+            break
+    return batch
+
+
+def main():
+    start = time.perf_counter()
+    batch = play_random_games(1000, 200, seed=1)
+    seconds = time.perf_counter() - start
+    print("1000 games x 200 plies in %.2f seconds (%.0f plies/sec)" % (seconds, 1000 * 200 / seconds))
+    print("finished:", int((batch.get_game_states() != UNFINISHED).sum()))
+    game = HasamiShogiGame()
+    game._set_position(batch.get_position(0))
+    game._board.print()
+
+
+if __name__ == "__main__":
+    main()
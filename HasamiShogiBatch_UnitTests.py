@@ -0,0 +1,93 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiBatch module, checked against the HasamiShogiGame class
+
+import unittest
+import unittest.mock
+import io
+import random
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import SQUARE_NAMES as SQUARE_NAMES
+
+try:
+    import numpy
+    from HasamiShogiBatch import BatchGame as BatchGame
+except ImportError:  # numpy is only needed by the batched engine
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class Test_BatchGame(unittest.TestCase):
+    """Contains unit tests that play the same moves on a BatchGame and on HasamiShogiGame objects."""
+
+    def assert_same_games(self, batch, games):
+        for number, game in enumerate(games):
+            self.assertEqual(game._get_position(), batch.get_position(number))
+
+    # Random legal moves give the same boards, captures, turns, and game states
+    def test1(self):
+        rng = numpy.random.default_rng(162)
+        batch = BatchGame(40)
+        games = [HasamiShogiGame() for number in range(40)]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            for ply in range(250):
+                origins, destinations = batch.random_moves(rng)
+                made = batch.make_moves(origins, destinations)
+                for number, game in enumerate(games):
+                    if origins[number] == -1:
+                        self.assertFalse(made[number])
+                        continue
+                    self.assertEqual(game.make_move(SQUARE_NAMES[origins[number]], SQUARE_NAMES[destinations[number]]),
+                                     bool(made[number]))
+                if ply % 10 == 0:
+                    self.assert_same_games(batch, games)
+        self.assert_same_games(batch, games)
+
+    # Any origin and destination, legal or not, are accepted or rejected the same way
+    def test2(self):
+        rng = random.Random(5)
+        batch = BatchGame(30)
+        games = [HasamiShogiGame() for number in range(30)]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            for ply in range(300):
+                origins = [rng.randrange(81) for number in range(30)]
+                destinations = [rng.choice([square for square in range(81)
+                                            if square % 9 == origin % 9 or square // 9 == origin // 9])
+                                for origin in origins]
+                made = batch.make_moves(origins, destinations)
+                for number, game in enumerate(games):
+                    self.assertEqual(game.make_move(SQUARE_NAMES[origins[number]], SQUARE_NAMES[destinations[number]]),
+                                     bool(made[number]))
+        self.assert_same_games(batch, games)
+
+    # The legal moves match HasamiShogiGame.get_legal_moves
+    def test3(self):
+        games = [HasamiShogiGame() for number in range(3)]
+        games[1].make_move("i5", "c5")
+        games[2]._game_state = "RED_WON"
+        batch = BatchGame.from_games(games)
+        legal = batch.get_legal_moves()
+        for number, game in enumerate(games):
+            self.assertEqual(set(game.get_legal_moves()), {tuple(move) for move in numpy.argwhere(legal[number])})
+
+    # Winning by capturing the 9th piece, and corner captures
+    def test4(self):
+        game = HasamiShogiGame()
+        for squares, occupant in [("i1", "RED"), ("i9", "NONE")]:
+            game._board.set_space(game.alg_to_xy(squares), occupant)
+        game._captured_by_red = 2
+        game._active_player = "RED"
+        corner_game = HasamiShogiGame()
+        corner_game.make_move("i5", "h5")
+        corner_game.make_move("a2", "e2")
+        batch = BatchGame.from_games([game, corner_game])
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            game.make_move("a9", "i9")
+            corner_game.make_move("h5", "h1")
+        batch.make_moves([8, 67], [80, 63])
+        self.assert_same_games(batch, [game, corner_game])
+        self.assertEqual("RED_WON", game.get_game_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,445 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Benchmark suite for the HasamiShogiGame engine, with JSON results and baseline comparison
+#
+# Usage: python -m HasamiShogiBenchmarks [--output results.json] [--baseline baseline.json] [--threshold 0.25]
+#        (or python -m HasamiShogiTools bench ...)
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE BENCHMARKS WORK ===============
+# 1) Benchmarks
+#       Every benchmark is a setup function that prepares its objects once and returns a run function and the
+#       number of operations one call of the run function does. Benchmarks touching the board are run once for
+#       every board backend and named "name[backend]".
+#       Micro benchmarks: alg_to_xy, make_move for a legal move and for every MoveRejection, _check_sandwiched
+#       for straight lines and corners, cloning games, snapshots, and move generation.
+#       Macro benchmarks: full random games, perft to depth 2 (leaves per second), alpha-beta search, MCTS
+#       playouts, reading and replaying game records, and (when numpy is installed) the batched engine.
+#
+# 2) Measuring
+#       The run function is called in a loop, doubling the number of calls until one sample takes at least
+#       min_time seconds. Then repeats samples are timed and the fastest one is kept, since slower samples are
+#       slowed by the rest of the machine rather than by the code.
+#
+# 3) Results
+#       Results are written as JSON:
+#           {"version": 1, "python": "3.11.7", "platform": "...", "benchmarks":
+#               {"make_move.legal[standard]": {"seconds_per_op": ..., "ops_per_second": ...,
+#                                              "median_seconds_per_op": ..., "loops": ..., "repeats": ...}, ...}}
+#       Any results file can be used as the baseline of a later run.
+#
+# 4) Regressions
+#       A benchmark regresses when its seconds_per_op is more than (1 + threshold) times the baseline's.
+#       A benchmark also fails when it is slower than its entry in TARGETS (minimum operations per second).
+#       The command line exits with 1 if anything regressed or failed its target, so it can gate releases.
+#
+
+import argparse
+import functools
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from HasamiShogiGame import HasamiShogiGame, BOARD_BACKENDS, MoveRejection, SQUARE_NAMES
+from HasamiShogiMCTS import MCTSPlayer
+from HasamiShogiPerft import perft
+from HasamiShogiRecord import GameRecord, GameRecordWriter, iter_records, replay
+from HasamiShogiSearch import AlphaBetaSearch, TranspositionTable
+from HasamiShogiSelfPlay import play_game
+
+try:
+    import HasamiShogiBatch
+except ImportError:  # numpy is only needed by the batched engine
+    HasamiShogiBatch = None
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown against the baseline, as a fraction
+DEFAULT_MIN_TIME = 0.1  # Seconds each timed sample takes at least
+DEFAULT_REPEATS = 5  # Timed samples per benchmark
+_RECORD_GAMES = 50  # Games in the game record benchmarks
+
+# Minimum operations per second of benchmarks with a throughput target, met by a modest machine
+TARGETS = {
+    "record.read_plies": 1000000.0,
+    "record.replay_plies[standard]": 20000.0,
+    "record.replay_plies[bitboard]": 20000.0,
+    "record.replay_plies[lines]": 20000.0,
+    "snapshot.from_packed[standard]": 20000.0,
+    "snapshot.from_packed[bitboard]": 20000.0,
+    "snapshot.from_packed[lines]": 20000.0,
+}
+
+# A position and move for every way make_move can reject a move, checked when the benchmark is set up
+_REJECTIONS = {
+    MoveRejection.GAME_CONCLUDED: ("RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB b 0 9 BLACK_WON", "i1", "h1"),
+    MoveRejection.INVALID_ORIGIN: (None, "j1", "h1"),
+    MoveRejection.INVALID_DESTINATION: (None, "i1", "h0"),
+    MoveRejection.NOT_OWNED: (None, "a1", "b1"),
+    MoveRejection.SAME_SQUARE: (None, "i1", "i1"),
+    MoveRejection.NOT_IN_LINE: (None, "i1", "h2"),
+    MoveRejection.PATH_BLOCKED: (None, "i1", "i5"),
+}
+
+
+def _new_game(backend, snapshot=None):
+    """
+    Creates a quiet game, from a snapshot or the starting position.
+    :param backend: Board backend name
+    :param snapshot: Snapshot string, or None for the starting position
+    :return: HasamiShogiGame
+    """
+    if snapshot is None:
+        return HasamiShogiGame(backend, quiet=True)
+    return HasamiShogiGame.from_snapshot(snapshot, backend, quiet=True)
+
+
+def _bench_alg_to_xy(backend):
+    """Converts every square's algebraic notation."""
+    game = _new_game(backend)
+    alg_to_xy = game.alg_to_xy
+
+    def run():
+        for square in SQUARE_NAMES:
+            alg_to_xy(square)
+    return run, len(SQUARE_NAMES)
+
+
+def _bench_make_move_legal(backend):
+    """Makes a legal move and takes it back with undo_move."""
+    game = _new_game(backend)
+
+    def run():
+        game.make_move("i5", "c5")
+        game.undo_move()
+    return run, 1
+
+
+def _bench_make_move_rejection(rejection):
+    """Makes a move that is rejected with the given MoveRejection."""
+    def setup(backend):
+        snapshot, origin, destination = _REJECTIONS[rejection]
+        game = _new_game(backend, snapshot)
+        if game.try_move(origin, destination).get_reason() is not rejection:
+            raise AssertionError("Benchmark move isn't rejected with " + rejection.name)
+        make_move = game.make_move
+
+        def run():
+            make_move(origin, destination)
+        return run, 1
+    return setup
+
+
+def _bench_check_sandwiched(snapshot, origin, direction, captures):
+    """Checks one direction of a position for a capture of the given number of pieces."""
+    def setup(backend):
+        game = _new_game(backend, snapshot)
+        xy = game.alg_to_xy(origin)
+        if len(game._check_sandwiched(xy, direction)) != captures:
+            raise AssertionError("Benchmark position doesn't capture %d pieces" % captures)
+        check_sandwiched = game._check_sandwiched
+
+        def run():
+            check_sandwiched(xy, direction)
+        return run, 1
+    return setup
+
+
+def _bench_legal_moves(backend):
+    """Lists every legal move of the starting position."""
+    game = _new_game(backend)
+
+    def run():
+        list(game.get_legal_moves())
+    return run, 1
+
+
+def _bench_random_game(backend):
+    """Plays a whole seeded random game with make_move, one operation per ply."""
+    def play():
+        rng = random.Random(15)
+        game = _new_game(backend)
+        plies = 0
+        while game.get_game_state() == "UNFINISHED" and plies < 400:
+            origin, destination = rng.choice(list(game.get_legal_moves()))
+            game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+            plies += 1
+        return plies
+    return play, play()
+
+
+def _bench_perft(backend):
+    """Counts the move tree of the starting position to depth 2, one operation per leaf."""
+    game = _new_game(backend)
+
+    def run():
+        perft(game, 2)
+    return run, 3717
+
+
+def _bench_search(backend):
+    """Searches the starting position to depth 2 with an empty transposition table."""
+    game = _new_game(backend)
+    table = TranspositionTable(1)
+
+    def run():
+        table.clear()
+        AlphaBetaSearch(transposition_table=table).search(game, 2)
+    return run, 1
+
+
+def _bench_mcts(backend):
+    """Plays MCTS playouts from the starting position, one operation per playout."""
+    game = _new_game(backend)
+
+    def run():
+        MCTSPlayer(seed=15).search(game, playouts=64)
+    return run, 64
+
+
+def _bench_clone(backend):
+    """Clones a middle game position."""
+    game = _new_game(backend, "R1R1RR1R1/1R7/5B3/9/4R4/9/2B6/3B5/B1BB1B1BB r 1 2 UNFINISHED")
+
+    def run():
+        game.clone()
+    return run, 1
+
+
+def _bench_snapshot(packed, load):
+    """Saves, or creates a game from, a string or packed snapshot of a middle game position."""
+    def setup(backend):
+        game = _new_game(backend, "R1R1RR1R1/1R7/5B3/9/4R4/9/2B6/3B5/B1BB1B1BB r 1 2 UNFINISHED")
+        if not load:
+            def run():
+                game.to_snapshot(packed)
+            return run, 1
+        snapshot = game.to_snapshot(packed)
+
+        def run():
+            HasamiShogiGame.from_snapshot(snapshot, backend)
+        return run, 1
+    return setup
+
+
+def _record_file():
+    """
+    Plays the random games used by the game record benchmarks.
+    :return: (bytes of a game record file, total number of plies) tuple
+    """
+    output = io.BytesIO()
+    writer = GameRecordWriter(output)
+    plies = 0
+    for number in range(_RECORD_GAMES):
+        record = GameRecord.from_selfplay(play_game(number, seed=15, max_plies=200))
+        writer.write(record)
+        plies += len(record.get_moves())
+    return output.getvalue(), plies
+
+
+def _bench_record_read():
+    """Reads every game of a game record file, one operation per ply."""
+    data, plies = _record_file()
+
+    def run():
+        for record in iter_records(data):
+            pass
+    return run, plies
+
+
+def _bench_record_replay(backend):
+    """Replays and verifies every game of a game record file, one operation per ply."""
+    records = list(iter_records(_record_file()[0]))
+
+    def run():
+        for record in records:
+            replay(record, backend)
+    return run, sum(len(record.get_moves()) for record in records)
+
+
+def _bench_batch():
+    """Plays 256 random games for 50 plies with the batched engine, one operation per ply."""
+    def run():
+        HasamiShogiBatch.play_random_games(256, 50, seed=15)
+    return run, 256 * 50
+
+
+def get_benchmarks():
+    """
+    Function that lists every benchmark.
+    :return: List of (name, setup function) tuples. Setup functions take no arguments and return a
+             (run function, operations per call) tuple. Benchmarks named "name[backend]" are set up with
+             that board backend
+    """
+    per_backend = [("alg_to_xy", _bench_alg_to_xy),
+                   ("make_move.legal", _bench_make_move_legal)]
+    per_backend += [("make_move." + rejection.name.lower(), _bench_make_move_rejection(rejection))
+                    for rejection in MoveRejection]
+    per_backend += [
+        ("_check_sandwiched.line", _bench_check_sandwiched("RBBBBBBBR/9/9/9/9/9/9/9/9 r 0 0 UNFINISHED",
+                                                           "a9", "LEFT", 7)),
+        ("_check_sandwiched.none", _bench_check_sandwiched("RBBBBBBB1/9/9/9/9/9/9/9/9 r 0 0 UNFINISHED",
+                                                           "a1", "RIGHT", 0)),
+        ("_check_sandwiched.corner", _bench_check_sandwiched("BR7/R8/9/9/9/9/9/9/9 r 0 0 UNFINISHED",
+                                                             "b1", "UP", 1)),
+        ("game.clone", _bench_clone),
+        ("snapshot.to_string", _bench_snapshot(False, False)),
+        ("snapshot.to_packed", _bench_snapshot(True, False)),
+        ("snapshot.from_string", _bench_snapshot(False, True)),
+        ("snapshot.from_packed", _bench_snapshot(True, True)),
+        ("get_legal_moves", _bench_legal_moves),
+        ("game.random_plies", _bench_random_game),
+        ("perft.depth2", _bench_perft),
+        ("search.depth2", _bench_search),
+        ("mcts.playouts", _bench_mcts),
+        ("record.replay_plies", _bench_record_replay),
+    ]
+    benchmarks = [("%s[%s]" % (name, backend), functools.partial(setup, backend))
+                  for name, setup in per_backend for backend in BOARD_BACKENDS]
+    benchmarks.append(("record.read_plies", _bench_record_read))
+    if HasamiShogiBatch is not None:
+        benchmarks.append(("batch.random_plies", _bench_batch))
+    return benchmarks
+
+
+def measure(run, ops, min_time=DEFAULT_MIN_TIME, repeats=DEFAULT_REPEATS):
+    """
+    Function that times a run function.
+    :param run: Function taking no arguments
+    :param ops: Int number of operations one call of run does
+    :param min_time: Float number of seconds each sample takes at least
+    :param repeats: Int number of timed samples
+    :return: Dict of seconds_per_op (fastest sample), median_seconds_per_op, ops_per_second, loops, and repeats
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for loop in range(loops):
+            run()
+        seconds = time.perf_counter() - start
+        if seconds >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    for repeat in range(repeats):
+        start = time.perf_counter()
+        for loop in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) / (loops * ops))
+    fastest = min(samples)
+    return {"seconds_per_op": fastest,
+            "median_seconds_per_op": statistics.median(samples),
+            "ops_per_second": 1.0 / fastest if fastest > 0 else float("inf"),
+            "loops": loops,
+            "repeats": repeats}
+
+
+def run_benchmarks(names=None, min_time=DEFAULT_MIN_TIME, repeats=DEFAULT_REPEATS, progress=None):
+    """
+    Function that runs benchmarks.
+    :param names: List of strings, only benchmarks with a name containing one of them are run. None runs all
+    :param min_time: Float number of seconds each sample takes at least
+    :param repeats: Int number of timed samples per benchmark
+    :param progress: Function called with the name and result of every finished benchmark, or None
+    :return: Results dict (see the description at the top of the file)
+    """
+    results = {"version": RESULTS_VERSION,
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "benchmarks": {}}
+    for name, setup in get_benchmarks():
+        if names and not any(part in name for part in names):
+            continue
+        run, ops = setup()
+        result = measure(run, ops, min_time, repeats)
+        results["benchmarks"][name] = result
+        if progress is not None:
+            progress(name, result)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Function that compares benchmark results against a baseline and the throughput targets.
+    :param results: Results dict from run_benchmarks
+    :param baseline: Results dict of an earlier run, or None
+    :param threshold: Float allowed slowdown, 0.25 allows benchmarks to be 25% slower than the baseline
+    :return: List of (name, ratio of seconds_per_op to the baseline's or None, status) tuples, where status
+             is "ok", "new", "regressed", or "below target"
+    """
+    old = baseline["benchmarks"] if baseline else {}
+    comparison = []
+    for name, result in results["benchmarks"].items():
+        ratio = None
+        status = "ok" if name in old else "new"
+        if name in old and old[name]["seconds_per_op"] > 0:
+            ratio = result["seconds_per_op"] / old[name]["seconds_per_op"]
+            if ratio > 1.0 + threshold:
+                status = "regressed"
+        if name in TARGETS and result["ops_per_second"] < TARGETS[name]:
+            status = "below target"
+        comparison.append((name, ratio, status))
+    return comparison
+
+
+def add_arguments(parser):
+    """
+    Adds the benchmark command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("names", nargs="*", help="only run benchmarks with a name containing one of these")
+    parser.add_argument("--output", help="file to write the JSON results to, - for stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline, 0.25 is 25%%")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="seconds each sample takes at least")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed samples per benchmark")
+
+
+def run_command(args):
+    """
+    Runs the benchmarks from parsed command line arguments, printing a table to stderr.
+    :param args: argparse.Namespace from a parser set up with add_arguments
+    :return: Int exit code, 1 if a benchmark regressed or missed its target
+    """
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    def progress(name, result):
+        print("%-44s %14.1f ops/sec" % (name, result["ops_per_second"]), file=sys.stderr)
+
+    results = run_benchmarks(args.names, args.min_time, args.repeats, progress)
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    failed = 0
+    for name, ratio, status in compare(results, baseline, args.threshold):
+        if status in ("regressed", "below target"):
+            failed += 1
+        if baseline is not None or status not in ("ok", "new"):
+            print("%-44s %8s  %s" % (name, "" if ratio is None else "%.2fx" % ratio, status), file=sys.stderr)
+    if failed:
+        print("%d benchmarks regressed or missed their target" % failed, file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m HasamiShogiBenchmarks")
+    add_arguments(parser)
+    return run_command(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
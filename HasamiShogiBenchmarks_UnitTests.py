@@ -0,0 +1,102 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiBenchmarks module
+
+import unittest
+import unittest.mock
+import io
+import json
+import os
+import tempfile
+from HasamiShogiBenchmarks import compare as compare
+from HasamiShogiBenchmarks import get_benchmarks as get_benchmarks
+from HasamiShogiBenchmarks import measure as measure
+from HasamiShogiBenchmarks import run_benchmarks as run_benchmarks
+from HasamiShogiTools import main as tools_main
+
+
+def results_of(seconds):
+    """Builds a results dict with the given seconds_per_op for each benchmark name."""
+    return {"version": 1, "benchmarks": {name: {"seconds_per_op": value, "ops_per_second": 1.0 / value}
+                                         for name, value in seconds.items()}}
+
+
+class Test_run_benchmarks(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiBenchmarks.run_benchmarks() function."""
+
+    # Every benchmark sets up (which checks its positions) and runs
+    def test1(self):
+        names = [name for name, setup in get_benchmarks()]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn("make_move.path_blocked[bitboard]", names)
+        for name, setup in get_benchmarks():
+            if not name.startswith(("search", "mcts", "record", "batch", "game")):
+                run, ops = setup()
+                run()
+                self.assertGreater(ops, 0)
+
+    def test2(self):
+        results = run_benchmarks(["alg_to_xy", "_check_sandwiched.corner"], min_time=0.001, repeats=2)
+        self.assertEqual({"%s[%s]" % (name, backend) for name in ["alg_to_xy", "_check_sandwiched.corner"]
+                          for backend in ["standard", "bitboard", "lines"]}, set(results["benchmarks"]))
+        for result in results["benchmarks"].values():
+            self.assertGreater(result["ops_per_second"], 0)
+            self.assertLessEqual(result["seconds_per_op"], result["median_seconds_per_op"])
+        json.dumps(results)
+
+    def test3(self):
+        calls = []
+        result = measure(lambda: calls.append(1), 4, min_time=0.0, repeats=3)
+        self.assertEqual(1, result["loops"])
+        self.assertEqual(4, len(calls))
+
+
+class Test_compare(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiBenchmarks.compare() function."""
+
+    def test1(self):
+        baseline = results_of({"a": 1.0, "b": 1.0, "c": 1.0})
+        results = results_of({"a": 1.2, "b": 1.3, "d": 1.0})
+        comparison = {name: (ratio, status) for name, ratio, status in compare(results, baseline, 0.25)}
+        self.assertEqual((1.2, "ok"), comparison["a"])
+        self.assertEqual("regressed", comparison["b"][1])
+        self.assertEqual((None, "new"), comparison["d"])
+        self.assertNotIn("c", comparison)
+
+    # Throughput targets fail without a baseline
+    def test2(self):
+        results = results_of({"record.read_plies": 1.0, "alg_to_xy[standard]": 1.0})
+        self.assertEqual([("record.read_plies", None, "below target"), ("alg_to_xy[standard]", None, "new")],
+                         compare(results, None))
+
+
+class Test_run_command(unittest.TestCase):
+    """Contains unit tests for the benchmark command line."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    # Results are written as JSON, and a much faster baseline makes the command fail
+    def test1(self):
+        arguments = ["bench", "alg_to_xy", "--min-time", "0.001", "--repeats", "1"]
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO):
+            self.assertEqual(0, tools_main(arguments + ["--output", self.path]))
+        with open(self.path) as file:
+            results = json.load(file)
+        self.assertEqual(3, len(results["benchmarks"]))
+
+        for result in results["benchmarks"].values():
+            result["seconds_per_op"] /= 1000
+        with open(self.path, "w") as file:
+            json.dump(results, file)
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(1, tools_main(arguments + ["--baseline", self.path]))
+        self.assertIn("regressed", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,331 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Opening book built from saved games, stored as a sorted file that is searched through mmap
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE OPENING BOOK WORKS ===============
+# 1) Building
+#       OpeningBookBuilder replays games (GameRecords, self-play JSON lines records, or lists of encoded moves)
+#       from the starting position and counts, for the first max_plies plies, every (position, move) pair:
+#       how many games played the move there, and how many of them the player making the move won and lost.
+#       Positions are identified by HasamiShogiGame.get_position_hash, so the same position reached through
+#       different move orders shares its entries. The Zobrist keys use a fixed seed, so hashes don't change
+#       between runs.
+#
+# 2) File layout
+#       Every number is little endian.
+#       The file starts with a 16 byte header:
+#           4 bytes  magic b"HSOB"
+#           1 byte   format version (1)
+#           3 bytes  reserved, always 0
+#           8 bytes  number of entries
+#       followed by the entries, sorted by position hash and then move, 24 bytes each:
+#           8 bytes  position hash
+#           2 bytes  encoded move, origin square index * 81 + destination square index (see encode_move)
+#           2 bytes  reserved, always 0
+#           4 bytes  games that played the move
+#           4 bytes  games won by the player making the move
+#           4 bytes  games lost by the player making the move
+#       Moves played in fewer than min_games games are left out when the file is written.
+#
+# 3) Looking up
+#       OpeningBook maps the file with mmap and binary searches the entries by reading only the 8 byte hash of
+#       each entry it visits, so opening a book and probing it doesn't parse the file.
+#       choose_move picks one of a position's moves at random, weighted by the number of games that played it
+#       ("games") or by its score, wins plus half of the games that weren't won or lost ("score").
+#       Every probe is counted by ply (the number of moves made in the game), so get_hit_rates shows how deep
+#       into games the book is useful.
+#
+
+import json
+import mmap
+import random
+import struct
+import sys
+
+from HasamiShogiGame import HasamiShogiGame, MOVE_DESTINATIONS, MOVE_ORIGINS, SQUARE_INDICES
+from HasamiShogiRecord import MAGIC as RECORD_MAGIC, InvalidGameRecord, read_records
+
+MAGIC = b"HSOB"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<4sB3xQ")
+_ENTRY = struct.Struct("<QH2xIII")
+_HASH = struct.Struct("<Q")
+DEFAULT_BOOK_PLIES = 12  # Plies of every game added to a book
+WEIGHTINGS = ("games", "score")
+
+
+class InvalidOpeningBook(ValueError):
+    pass
+
+
+class OpeningBookBuilder:
+    """The OpeningBookBuilder class is used to collect move statistics from games and write them as an opening book
+    file.
+    This class will contain the following data members:
+    The number of plies of every game that are counted
+    The board backend name games are replayed with
+    A dict of (position hash, encoded move) -> [games, wins, losses]
+    The number of games added so far"""
+
+    def __init__(self, max_plies=DEFAULT_BOOK_PLIES, backend="standard"):
+        """The constructor for the OpeningBookBuilder class.
+        Starts with no games added.
+        :param max_plies: Int number of plies of every game that are counted
+        :param backend: Board backend name to replay games with"""
+        self._max_plies = max_plies
+        self._backend = backend
+        self._statistics = {}
+        self._games_added = 0
+
+    def add_game(self, moves, result):
+        """
+        Method that counts the opening moves of a game.
+        Raises an InvalidGameRecord exception if a move is illegal.
+        :param moves: Iterable of encoded move ints, starting from the starting position
+        :param result: "UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW"
+        :return: None
+        """
+        game = HasamiShogiGame(self._backend, quiet=True)
+        statistics = self._statistics
+        for ply, move in enumerate(moves):
+            if ply >= self._max_plies:
+                break
+            key = (game.get_position_hash(), move)
+            player = game.get_active_player()
+            if not game.try_move_encoded(move).is_success():
+                raise InvalidGameRecord("Illegal move at ply %d" % ply)
+            counts = statistics.get(key)
+            if counts is None:
+                counts = statistics[key] = [0, 0, 0]
+            counts[0] += 1
+            if result == player + "_WON":
+                counts[1] += 1
+            elif result.endswith("_WON"):
+                counts[2] += 1
+        self._games_added += 1
+
+    def add_record(self, record):
+        """
+        Method that counts the opening moves of a game record.
+        :param record: HasamiShogiRecord.GameRecord
+        :return: None
+        """
+        self.add_game(record.get_moves(), record.get_result())
+
+    def add_selfplay(self, game):
+        """
+        Method that counts the opening moves of a self-play game record (see HasamiShogiSelfPlay.py).
+        :param game: Dict with "moves" in algebraic notation and "result"
+        :return: None
+        """
+        self.add_game([SQUARE_INDICES[move[:2]] * 81 + SQUARE_INDICES[move[2:]] for move in game["moves"]],
+                      game["result"])
+
+    def get_games_added(self):
+        """
+        Method that returns how many games have been added.
+        :return: Int
+        """
+        return self._games_added
+
+    def write(self, output, min_games=1):
+        """
+        Method that writes the book file.
+        :param output: Writable binary file, positioned at its start
+        :param min_games: Int, moves played in fewer games are left out
+        :return: Int number of entries written
+        """
+        entries = sorted((key, counts) for key, counts in self._statistics.items() if counts[0] >= min_games)
+        output.write(_FILE_HEADER.pack(MAGIC, VERSION, len(entries)))
+        pack = _ENTRY.pack
+        output.write(b"".join(pack(position_hash, move, *counts) for (position_hash, move), counts in entries))
+        return len(entries)
+
+
+class OpeningBook:
+    """The OpeningBook class is used to look up moves in an opening book file.
+    This class will contain the following data members:
+    An mmap of the file (None for an empty file)
+    The number of entries in the file
+    A list of the number of positions looked up at each ply
+    A list of the number of positions looked up at each ply that had a move in the book"""
+
+    def __init__(self, path):
+        """The constructor for the OpeningBook class.
+        Opens a book file. Raises an InvalidOpeningBook exception if it isn't one.
+        :param path: Path of a file written by OpeningBookBuilder.write"""
+        with open(path, "rb") as file:
+            header = file.read(_FILE_HEADER.size)
+            if len(header) != _FILE_HEADER.size:
+                raise InvalidOpeningBook("File is too short to be an opening book")
+            magic, version, entries = _FILE_HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise InvalidOpeningBook("Not an opening book file, or an unsupported version")
+            if file.seek(0, 2) != _FILE_HEADER.size + entries * _ENTRY.size:
+                raise InvalidOpeningBook("Opening book size doesn't match its number of entries")
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if entries else None
+        self._entries = entries
+        self._probes = []
+        self._hits = []
+
+    def close(self):
+        """
+        Method that closes the file.
+        :return: None
+        """
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def get_num_entries(self):
+        """
+        Method that returns the number of (position, move) entries in the book.
+        :return: Int
+        """
+        return self._entries
+
+    def lookup(self, position_hash):
+        """
+        Method that finds the moves stored for a position. Doesn't count towards the hit rates.
+        :param position_hash: Int from HasamiShogiGame.get_position_hash
+        :return: List of (encoded move, games, wins, losses) tuples in increasing move order, empty if the
+                 position isn't in the book
+        """
+        buffer = self._buffer
+        if buffer is None:
+            return []
+        unpack_hash = _HASH.unpack_from
+        size = _ENTRY.size
+        base = _FILE_HEADER.size
+
+        # Find the first entry with a hash at least position_hash
+        low = 0
+        high = self._entries
+        while low < high:
+            middle = (low + high) // 2
+            if unpack_hash(buffer, base + middle * size)[0] < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        moves = []
+        offset = base + low * size
+        end = base + self._entries * size
+        while offset < end and unpack_hash(buffer, offset)[0] == position_hash:
+            moves.append(_ENTRY.unpack_from(buffer, offset)[1:])
+            offset += size
+        return moves
+
+    def get_moves(self, game):
+        """
+        Method that finds the moves stored for a game's current position, counting the probe for get_hit_rates at
+        the game's ply (see HasamiShogiGame.get_ply).
+        :param game: A HasamiShogiGame
+        :return: List of (encoded move, games, wins, losses) tuples, see lookup
+        """
+        moves = self.lookup(game.get_position_hash())
+        ply = game.get_ply()
+        while len(self._probes) <= ply:
+            self._probes.append(0)
+            self._hits.append(0)
+        self._probes[ply] += 1
+        if moves:
+            self._hits[ply] += 1
+        return moves
+
+    def choose_move(self, game, rng=None, weighting="games"):
+        """
+        Method that picks a book move for a game's current position at random.
+        :param game: A HasamiShogiGame
+        :param rng: random.Random to pick with, defaults to the random module
+        :param weighting: "games" to weight moves by how often they were played, "score" by their score
+        :return: (origin, destination) tuple of square indices, or None if the position isn't in the book (or no
+                 move has any weight)
+        """
+        if weighting not in WEIGHTINGS:
+            raise ValueError("Unknown opening book weighting: " + str(weighting))
+        if game.get_game_state() != "UNFINISHED":
+            return None
+        moves = self.get_moves(game)
+        if weighting == "games":
+            weights = [games for move, games, wins, losses in moves]
+        else:
+            weights = [wins + (games - wins - losses) / 2 for move, games, wins, losses in moves]
+        total = sum(weights)
+        if total <= 0:
+            return None
+        target = (rng or random).random() * total
+        for (move, games, wins, losses), weight in zip(moves, weights):
+            target -= weight
+            if target < 0:
+                break
+        else:
+            # Rounding left a little of the total over, it belongs to the last move with any weight
+            move = [move for (move, games, wins, losses), weight in zip(moves, weights) if weight > 0][-1]
+        return MOVE_ORIGINS[move], MOVE_DESTINATIONS[move]
+
+    def get_hit_rates(self):
+        """
+        Method that returns how often positions looked up with get_moves or choose_move were in the book.
+        :return: List of dicts, one per ply from 0, of "ply", "probes", "hits", and "hit_rate" (0.0 without probes)
+        """
+        return [{"ply": ply, "probes": probes, "hits": hits, "hit_rate": hits / probes if probes else 0.0}
+                for ply, (probes, hits) in enumerate(zip(self._probes, self._hits))]
+
+    def reset_hit_rates(self):
+        """
+        Method that sets the probe and hit counts back to zero.
+        :return: None
+        """
+        self._probes = []
+        self._hits = []
+
+
+def build_book(paths, output, max_plies=DEFAULT_BOOK_PLIES, min_games=1):
+    """
+    Function that builds a book file from game files.
+    :param paths: List of paths of binary game record files (see HasamiShogiRecord.py) or self-play JSON lines
+                  files (see HasamiShogiSelfPlay.py), told apart by the record file magic
+    :param output: Writable binary file
+    :param max_plies: Int number of plies of every game that are counted
+    :param min_games: Int, moves played in fewer games are left out
+    :return: (games added, entries written) tuple of ints
+    """
+    builder = OpeningBookBuilder(max_plies)
+    for path in paths:
+        with open(path, "rb") as file:
+            binary = file.read(len(RECORD_MAGIC)) == RECORD_MAGIC
+        if binary:
+            for record in read_records(path):
+                builder.add_record(record)
+        else:
+            with open(path) as file:
+                for line in file:
+                    if line.strip():
+                        builder.add_selfplay(json.loads(line))
+    return builder.get_games_added(), builder.write(output, min_games)
+
+
+def add_arguments(parser):
+    """
+    Adds the opening book command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("output", help="book file to write")
+    parser.add_argument("inputs", nargs="+", help="game record or self-play JSON lines files to build it from")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_BOOK_PLIES, help="plies of every game to count")
+    parser.add_argument("--min-games", type=int, default=1, help="leave out moves played in fewer games")
+
+
+def run_command(args):
+    """
+    Builds an opening book from parsed command line arguments and prints its size to stderr.
+    :param args: argparse.Namespace from a parser set up with add_arguments
+    :return: Int exit code
+    """
+    with open(args.output, "wb") as output:
+        games, entries = build_book(args.inputs, output, args.max_plies, args.min_games)
+    print("games: %d  entries: %d" % (games, entries), file=sys.stderr)
+    return 0
@@ -0,0 +1,170 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiBook module
+
+import unittest
+import unittest.mock
+import collections
+import io
+import json
+import os
+import random
+import tempfile
+from HasamiShogiBook import InvalidOpeningBook as InvalidOpeningBook
+from HasamiShogiBook import OpeningBook as OpeningBook
+from HasamiShogiBook import OpeningBookBuilder as OpeningBookBuilder
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import encode_move as encode_move
+from HasamiShogiRecord import GameRecord as GameRecord
+from HasamiShogiRecord import GameRecordWriter as GameRecordWriter
+from HasamiShogiSelfPlay import play_game as play_game
+from HasamiShogiSelfPlay import run_selfplay as run_selfplay
+from HasamiShogiTools import main as tools_main
+
+
+class Test_OpeningBook(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiBook.OpeningBook and OpeningBookBuilder classes."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "book.hsob")
+        self.books = []
+
+    def tearDown(self):
+        for book in self.books:
+            book.close()
+        self.directory.cleanup()
+
+    def write_book(self, builder, min_games=1):
+        with open(self.path, "wb") as output:
+            builder.write(output, min_games)
+        book = OpeningBook(self.path)
+        self.books.append(book)
+        return book
+
+    # Every counted move can be found again, with its statistics
+    def test1(self):
+        games = [play_game(number, seed=3, max_plies=40) for number in range(20)]
+        builder = OpeningBookBuilder(max_plies=6)
+        for game in games:
+            builder.add_selfplay(game)
+        book = self.write_book(builder)
+        self.assertEqual(20, builder.get_games_added())
+
+        first_moves = collections.Counter(encode_move(game["moves"][0][:2], game["moves"][0][2:]) for game in games)
+        start = book.lookup(HasamiShogiGame(quiet=True).get_position_hash())
+        self.assertEqual(sorted(first_moves.items()), [(move, games) for move, games, wins, losses in start])
+        black_won = sum(game["result"] == "BLACK_WON" for game in games)
+        self.assertEqual(black_won, sum(wins for move, games, wins, losses in start))
+
+        for record in games:
+            game = HasamiShogiGame(quiet=True)
+            for move in record["moves"][:6]:
+                encoded = encode_move(move[:2], move[2:])
+                self.assertIn(encoded, [entry[0] for entry in book.lookup(game.get_position_hash())])
+                game.make_move(move[:2], move[2:])
+        self.assertEqual([], book.lookup(12345))
+
+    # Weighted random selection
+    def test2(self):
+        builder = OpeningBookBuilder()
+        for count in range(3):
+            builder.add_game([encode_move("i2", "h2")], "BLACK_WON")
+        builder.add_game([encode_move("i5", "c5")], "RED_WON")
+        book = self.write_book(builder)
+        game = HasamiShogiGame(quiet=True)
+        rng = random.Random(0)
+        picks = collections.Counter(book.choose_move(game, rng) for count in range(400))
+        self.assertEqual({(73, 64), (76, 22)}, set(picks))
+        self.assertTrue(250 < picks[(73, 64)] < 350)
+        self.assertEqual({(73, 64)}, {book.choose_move(game, rng, "score") for count in range(50)})
+        with self.assertRaises(ValueError):
+            book.choose_move(game, rng, "wins")
+
+    # Hit rates are counted by ply
+    def test3(self):
+        builder = OpeningBookBuilder()
+        builder.add_game([encode_move("i2", "h2"), encode_move("a2", "b2")], "UNFINISHED")
+        builder.add_game([encode_move("i2", "h2"), encode_move("a3", "b3")], "UNFINISHED")
+        book = self.write_book(builder, min_games=2)
+        self.assertEqual(1, book.get_num_entries())
+        game = HasamiShogiGame(quiet=True)
+        self.assertEqual((73, 64), book.choose_move(game))
+        game.make_move("i2", "h2")
+        self.assertIsNone(book.choose_move(game))
+        self.assertEqual([{"ply": 0, "probes": 1, "hits": 1, "hit_rate": 1.0},
+                          {"ply": 1, "probes": 1, "hits": 0, "hit_rate": 0.0}], book.get_hit_rates())
+        book.reset_hit_rates()
+        self.assertEqual([], book.get_hit_rates())
+
+    def test4(self):
+        book = self.write_book(OpeningBookBuilder())
+        self.assertEqual(0, book.get_num_entries())
+        self.assertIsNone(book.choose_move(HasamiShogiGame(quiet=True)))
+        with open(self.path, "wb") as output:
+            output.write(b"HSGR\x01\x00\x00\x00")
+        with self.assertRaises(InvalidOpeningBook):
+            OpeningBook(self.path)
+
+
+class Test_build_book(unittest.TestCase):
+    """Contains unit tests for building books from files, and playing self-play games from them."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test1(self):
+        records = os.path.join(self.directory.name, "games.hsgr")
+        selfplay = os.path.join(self.directory.name, "games.jsonl")
+        book = os.path.join(self.directory.name, "book.hsob")
+        with open(records, "wb") as output:
+            writer = GameRecordWriter(output)
+            for number in range(4):
+                writer.write(GameRecord.from_selfplay(play_game(number, max_plies=30)))
+        with open(selfplay, "w") as output:
+            run_selfplay(4, output, seed=1, max_plies=30)
+
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(0, tools_main(["book", book, records, selfplay, "--max-plies", "4"]))
+        self.assertIn("games: 8", stderr.getvalue())
+        opening_book = OpeningBook(book)
+        try:
+            self.assertLessEqual(opening_book.get_num_entries(), 8 * 4)
+            self.assertEqual(16 + 24 * opening_book.get_num_entries(), os.path.getsize(book))
+            entries = opening_book.lookup(HasamiShogiGame(quiet=True).get_position_hash())
+            self.assertEqual(8, sum(games for move, games, wins, losses in entries))
+            start = {move for move, games, wins, losses in entries}
+        finally:
+            opening_book.close()
+
+        # Every game starts with a book move, and the book runs out after 4 plies
+        output = io.StringIO()
+        stats = run_selfplay(5, output, seed=2, max_plies=20, book=book)
+        for line in output.getvalue().splitlines():
+            record = json.loads(line)
+            self.assertIn(encode_move(record["moves"][0][:2], record["moves"][0][2:]), start)
+            self.assertTrue(1 <= record["book_plies"] <= 4)
+        self.assertEqual(stats["book_plies"], sum(json.loads(line)["book_plies"]
+                                                  for line in output.getvalue().splitlines()))
+
+
+    # Illegal book moves aren't played, the policy plays from the position instead
+    def test2(self):
+        builder = OpeningBookBuilder()
+        start = HasamiShogiGame(quiet=True).get_position_hash()
+        builder._statistics = {(start, encode_move("a1", "b1")): [5, 0, 0]}  # A red move for black to play
+        book = os.path.join(self.directory.name, "stale.hsob")
+        with open(book, "wb") as output:
+            builder.write(output)
+        record = play_game(0, seed=4, max_plies=6, book=book)
+        self.assertEqual(0, record["book_plies"])
+        game = HasamiShogiGame(quiet=True)
+        for move in record["moves"]:
+            self.assertTrue(game.make_move(move[:2], move[2:]))
+        self.assertEqual(6, len(record["moves"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,18 +5,19 @@
 
 # =============== DETAILED TEXT DESCRIPTIONS OF HOW TO HANDLE THE SCENARIOS ===============
 # 1) Determining how to store the board
-#       The board will be a list of lists, where the outer list covers the rows and the inner
-#       lists covers the columns. board[3[0]] would be space "d1". The lists' values will be
-#       either an 'R', 'B', or None.
+#       The board will be a flat bytearray of 81 small int codes, one per square in row order, so
+#       board[3 * 9 + 0] would be space "d1". The codes will be 0 for an empty square, 1 for 'R', or 2 for 'B'.
 #
-#       The board will have a method that converts an algebraic notation string to the indices
-#       of the inner and outer lists.
+#       The game will have a method that converts an algebraic notation string to (x, y) coordinates, and
+#       the bytearray index of (x, y) is y * 9 + x.
 #
 # 2) Initializing the board
 #       The board class will be initialized by the HasamiShogiGame class.
-#       In the board class's init method, a row list will be created and filled with the column lists.
-#       The column lists will be filled with an 'R' in the first index, 'B' in the last, and None in
-#       in every other index.
+#       In the board class's init method, the bytearray will be copied from the starting position, with
+#       'R' in the first row, 'B' in the last, and empty squares everywhere else.
+#       Both classes use __slots__, and clone copies a game with one copy of the bytearray (plus the undo and
+#       redo stacks), so many games can be kept in memory and copied cheaply. Pickling a game only sends its
+#       backend, a packed snapshot (see 8), and its quiet setting.
 #
 # 3) Determining how to track which player's turn it is to play right now
 #       The current player's turn will be tracked as a string, either "RED" or "BLACK", in the
@@ -49,87 +50,1279 @@
 #       so that the board isn't iterated over completely after each turn.
 #       If any player has <=1 pieces remaining, the game is over and that player loses.
 #
+# 7) Alternative board backends
+#       Every square also has a square index, row_number * 9 + column_number, so "a1" is 0 and "i9" is 80.
+#       The BitBoard class stores the board as two 81 bit integers (one for each color) where bit N is set
+#       if that color has a piece on square index N. Path and sandwich checks become mask operations.
+#       The LineBoard class stores every row and every column as a 9 digit base 3 int (0 empty, 1 red, 2 black).
+#       Splitting a line at a piece gives the squares before it (line % 3 ** index) and after it
+#       (line // 3 ** (index + 1)), and tables built when the module is loaded give, for every arrangement of
+#       those squares, how far the piece can slide and how many pieces it sandwiches. Sliding, path checks, and
+#       captures are then a few table lookups, with corners handled by a separate table of their two neighbors.
+#       Every board class shares the same methods, so HasamiShogiGame can use any of them.
 #
+# 8) Snapshots
+#       to_snapshot saves a whole position and from_snapshot creates a game from one, loading the board in one
+#       pass instead of one square at a time. Snapshots come in two forms:
+#       A FEN-like string of 5 space separated fields:
+#           The rows "a" to "i" separated by "/", each written as "R", "B", and a digit for a run of empty squares
+#           The active player, "b" or "r"
+#           The number of red pieces captured, then the number of black pieces captured
+#           The game state
+#       so the starting position is "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB b 0 0 UNFINISHED".
+#       23 packed bytes: a 168 bit little endian int (21 bytes) holding the red pieces in bits 0-80, the black
+#       pieces in bits 81-161 (2 bits per square), bit 162 set when black is the active player and the index of
+#       the game state in GAME_STATES in bits 163-164, then a byte each for the red and black captured counts.
+#
+# 9) Evaluation features
+#       get_features gives each player's number of pieces, mobility (number of legal moves), and number of
+#       threatened pieces (pieces an opponent's piece moving onto one empty square next to them would capture,
+#       an approximation that doesn't check whether any opponent's piece can reach that square).
+#       With set_feature_tracking on, a PositionFeatures object keeps every row and column as a base 3 int like
+#       LineBoard, and the mobility and threatened pieces of every line arrangement are calculated once and kept
+#       in a dict. A changed square only changes its row and its column, so every move, capture, and undo
+#       subtracts the old features of those two lines and adds the new ones, and no feature needs the whole board.
+#       The threatened squares of each player are kept as an 81 bit int and a count, and only the squares whose
+#       threatened bit changed in those two lines, and the corners next to the changed square, are checked again.
+#       Check mode recalculates the features from scratch after every change and raises an AssertionError if
+#       they differ, for testing.
+#
+# 10) Capture threats
+#       get_capturing_moves finds the legal moves that would capture without making them: the piece is put on
+#       its destination, the board's get_sandwiched (the check _check_sandwiched uses) is asked about every
+#       direction, and the piece is put back. A move can only capture next to an opponent's piece or a corner,
+#       so a mask of the squares next to those skips every other destination before the board is touched.
+#       get_attack_map adds which of the opponent's pieces the player can capture and which of the player's
+#       pieces the opponent could capture, and keeps the last map with the position it is for so it is only
+#       found again once a move changes the position.
+#
+# 11) Repetitions
+#       set_repetition_rule makes the game keep a dict of position hash -> number of times reached. Every move
+#       adds one to the count of the position it reaches and every undo takes one away, so counting is constant
+#       time and no boards are stored. A move reaching a position for the repetitions-th time ends the game as
+#       a "DRAW", or as a win for the other player if the rule's result is "LOSS". With max_plies, a game still
+#       unfinished after that many plies is a "DRAW". Without a rule nothing is counted and no game is drawn.
+#
+
+import random
+import re
+from enum import Enum
+
+
+class InvalidAlgebraicNotation(Exception):
+    pass
+
+
+class InvalidSnapshot(ValueError):
+    pass
+
+
+# Every game state, in the order used by packed snapshots
+GAME_STATES = ("UNFINISHED", "RED_WON", "BLACK_WON", "DRAW")
+
+# What happens when a position is repeated too often, see HasamiShogiGame.set_repetition_rule
+REPETITION_RESULTS = ("DRAW", "LOSS")
+
+
+# Offsets used to walk the board in each direction, as (x, y) steps
+DIRECTION_OFFSETS = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
+
+# (x, y) coordinate tuple of every square index
+SQUARE_XY = [(index % 9, index // 9) for index in range(81)]
+
+
+def _build_rays():
+    """
+    Builds the squares visited when walking from every square in every direction, nearest square first.
+    :return: A dict of direction -> list (indexed by square index) of tuples of square indices
+    """
+    rays = {}
+    for direction, offset in DIRECTION_OFFSETS.items():
+        rays[direction] = []
+        for x, y in SQUARE_XY:
+            ray = []
+            x, y = x + offset[0], y + offset[1]
+            while 0 <= x <= 8 and 0 <= y <= 8:
+                ray.append(y * 9 + x)
+                x, y = x + offset[0], y + offset[1]
+            rays[direction].append(tuple(ray))
+    return rays
+
+
+RAYS = _build_rays()
+
+# Small int codes of the occupants of squares, stored by the Board and LineBoard classes
+_CODE_OCCUPANTS = ("NONE", "RED", "BLACK")
+_OCCUPANT_CODES = {"NONE": 0, "RED": 1, "BLACK": 2}
+
+# Translations between board string characters ("R", "B", or ".") and bytes of occupant codes
+_CHARACTER_CODES = bytes.maketrans(b"RB.", b"\x01\x02\x00")
+_CODE_CHARACTERS = bytes.maketrans(b"\x00\x01\x02", b".RB")
+
+# Algebraic notation of every square index
+SQUARE_NAMES = [row + column for row in "abcdefghi" for column in "123456789"]
+
+# Square index of every algebraic notation square, in both lower and upper case
+SQUARE_INDICES = {name: index for index, name in enumerate(SQUARE_NAMES)}
+SQUARE_INDICES.update({name.upper(): index for index, name in enumerate(SQUARE_NAMES)})
+
+# Moves can be encoded as a single int, origin * 81 + destination (0 to 6560).
+# These tables give the origin, destination, and whether the squares are different and in a line for every move.
+MOVE_ORIGINS = [move // 81 for move in range(81 * 81)]
+MOVE_DESTINATIONS = [move % 81 for move in range(81 * 81)]
+_MOVE_IN_LINE = [(origin != destination and (origin // 9 == destination // 9 or origin % 9 == destination % 9))
+                 for origin, destination in zip(MOVE_ORIGINS, MOVE_DESTINATIONS)]
+
+# Rays from every square in the order they are walked when generating moves
+_MOVE_RAYS = [tuple(RAYS[direction][index] for direction in DIRECTION_OFFSETS if RAYS[direction][index])
+              for index in range(81)]
+
+
+def encode_move(origin: str, destination: str):
+    """
+    Function that encodes a move given in algebraic notation as an int.
+    Raises an InvalidAlgebraicNotation exception if either square is not a valid board position.
+    :param origin: Algebraic notation string for the square of the piece making a move
+    :param destination: Algebraic notation string for the destination of the move
+    :return: Int origin square index * 81 + destination square index
+    """
+    if origin not in SQUARE_INDICES or destination not in SQUARE_INDICES:
+        raise InvalidAlgebraicNotation
+    return SQUARE_INDICES[origin] * 81 + SQUARE_INDICES[destination]
+
+
+def decode_move(move: int):
+    """
+    Function that decodes a move encoded by encode_move.
+    :param move: Int from 0 to 6560
+    :return: (origin, destination) tuple of lowercase algebraic notation strings
+    """
+    return SQUARE_NAMES[MOVE_ORIGINS[move]], SQUARE_NAMES[MOVE_DESTINATIONS[move]]
+
+
+def _build_zobrist_keys():
+    """
+    Builds the random 64 bit keys used for Zobrist hashing. A fixed seed keeps hashes the same between runs,
+    so they can be stored on disk.
+    :return: A dict of "RED"/"BLACK" -> list of 81 keys (one per square index), the key XORed in when black
+             is the active player, and a dict of "RED"/"BLACK" -> list of keys for each captured pieces count
+    """
+    rng = random.Random(0x4A5A)
+    piece_keys = {player: [rng.getrandbits(64) for index in range(81)] for player in ("RED", "BLACK")}
+    black_to_move_key = rng.getrandbits(64)
+    captured_keys = {player: [rng.getrandbits(64) for count in range(82)] for player in ("RED", "BLACK")}
+    return piece_keys, black_to_move_key, captured_keys
+
+
+_ZOBRIST_PIECE_KEYS, _ZOBRIST_BLACK_TO_MOVE_KEY, _ZOBRIST_CAPTURED_KEYS = _build_zobrist_keys()
+
+# Masks used by the BitBoard class. Bit N represents square index N.
+_BITS = [1 << index for index in range(81)]
+_CORNER_MASK = _BITS[0] | _BITS[8] | _BITS[72] | _BITS[80]
+_NEIGHBOR_MASKS = [sum(_BITS[ray[0]] for ray in (RAYS[direction][index] for direction in RAYS) if ray)
+                   for index in range(81)]
+# _RAY_MASKS[direction][index][n] has the bits of the first n + 1 squares of a ray
+_RAY_MASKS = {direction: [[sum(_BITS[square] for square in ray[:length + 1]) for length in range(len(ray))]
+                          for ray in rays]
+              for direction, rays in RAYS.items()}
+
+
+def _build_row_hash_keys():
+    """
+    Builds tables of the Zobrist keys of every arrangement of one player's pieces within a row, so a whole
+    board can be hashed with 9 lookups per player.
+    :return: A dict of "RED"/"BLACK" -> list of 9 rows -> list of 512 keys, indexed by a 9 bit mask of the row
+    """
+    row_keys = {}
+    for player, piece_keys in _ZOBRIST_PIECE_KEYS.items():
+        row_keys[player] = []
+        for y in range(9):
+            keys = [0] * 512
+            for mask in range(1, 512):
+                lowest = mask & -mask
+                keys[mask] = keys[mask ^ lowest] ^ piece_keys[y * 9 + lowest.bit_length() - 1]
+            row_keys[player].append(keys)
+    return row_keys
+
+
+_ROW_HASH_KEYS = _build_row_hash_keys()
+
+
+def _masks_hash(red, black):
+    """
+    Calculates the Zobrist hash of the pieces on a board given as bitboards.
+    :param red: 81 bit int with a bit set for every square index holding a red piece
+    :param black: 81 bit int with a bit set for every square index holding a black piece
+    :return: A 64 bit int, equal to Board.compute_hash of the same board
+    """
+    key = 0
+    red_keys = _ROW_HASH_KEYS["RED"]
+    black_keys = _ROW_HASH_KEYS["BLACK"]
+    for y in range(9):
+        key ^= red_keys[y][(red >> (y * 9)) & 0x1FF] ^ black_keys[y][(black >> (y * 9)) & 0x1FF]
+    return key
+
+
+# Translations from an 81 character board string ("R", "B", or "." in square index order) to binary digits
+_RED_DIGITS = str.maketrans("RB.", "100")
+_BLACK_DIGITS = str.maketrans("RB.", "010")
+
+# Translations from a snapshot row to board string characters, and deleting every valid board string character
+_SNAPSHOT_ROW_CHARACTERS = str.maketrans({str(run): "." * run for run in range(1, 10)})
+_SQUARE_CHARACTERS = str.maketrans("", "", "RB.")
+_EMPTY_RUNS = re.compile(r"\.+")  # Runs of empty squares, written as a digit in snapshot strings
+_PACKED_SNAPSHOT_BYTES = 23
+
+
+def _empty_run_length(match):
+    """
+    Replaces a run of empty squares in a board string with its length, used when writing snapshot strings.
+    :param match: re.Match of one or more "." characters
+    :return: String digit
+    """
+    return str(len(match.group()))
+
+
+def _squares_to_masks(squares):
+    """
+    Converts a board string to bitboards.
+    :param squares: String of 81 "R", "B", or "." characters in square index order
+    :return: (red, black) tuple of 81 bit ints
+    """
+    return int(squares.translate(_RED_DIGITS)[::-1], 2), int(squares.translate(_BLACK_DIGITS)[::-1], 2)
+
+
+# Every row already converted by _row_characters, keyed by red row mask | black row mask << 9
+_ROW_CHARACTERS = {}
+
+
+def _row_characters(key):
+    """
+    Converts one row of a board given as bitboards to characters, remembering the result.
+    :param key: Int 9 bit red row mask | 9 bit black row mask << 9
+    :return: String of 9 "R", "B", or "." characters
+    """
+    row = _ROW_CHARACTERS.get(key)
+    if row is None:
+        row = "".join("R" if key >> x & 1 else "B" if key >> (x + 9) & 1 else "." for x in range(9))
+        _ROW_CHARACTERS[key] = row
+    return row
+
+
+def _masks_to_squares(red, black):
+    """
+    Converts bitboards to a board string.
+    :param red: 81 bit int with a bit set for every square index holding a red piece
+    :param black: 81 bit int with a bit set for every square index holding a black piece
+    :return: String of 81 "R", "B", or "." characters in square index order
+    """
+    return "".join([_row_characters(((red >> (y * 9)) & 0x1FF) | ((black >> (y * 9)) & 0x1FF) << 9)
+                    for y in range(9)])
+
+
+# Occupant codes of the starting position in square index order, and the hash of its pieces
+_START_CODES = b"\x01" * 9 + b"\x00" * 63 + b"\x02" * 9
+_START_HASH = _masks_hash(0x1FF, 0x1FF << 72)
+
+
+# Tables used by the LineBoard class, which stores every row and column as a base 3 int.
+# Digit N of a line is the occupant code of the Nth square along it: 0 for empty, 1 for red, or 2 for black.
+_POWERS_OF_3 = [3 ** power for power in range(10)]
+_TERNARY_DIGITS = str.maketrans("RB.", "120")  # Board string characters to line digits
+
+
+def _walk_line(cells):
+    """
+    Walks the squares of a line away from a piece, for _build_line_tables.
+    :param cells: List of line digits, nearest square first
+    :return: (empty squares before the first piece, squares sandwiched by a red piece, squares sandwiched by a
+             black piece) tuple of ints
+    """
+    run = 0
+    while run < len(cells) and cells[run] == 0:
+        run += 1
+    sandwiched = [0, 0, 0]
+    for digit in (1, 2):
+        count = 0
+        while count < len(cells) and cells[count] == 3 - digit:
+            count += 1
+        if count < len(cells) and cells[count] == digit:
+            sandwiched[digit] = count
+    return run, sandwiched[1], sandwiched[2]
+
+
+def _build_line_tables():
+    """
+    Builds the tables the LineBoard class slides and captures with. A line is split at the square of a piece
+    into its prefix, the squares before it (the line modulo 3 ** index), and its suffix, the squares after it
+    (the line divided by 3 ** (index + 1)), so every table only covers arrangements of up to 8 squares.
+    Squares past the end of a suffix read as empty, which stops captures just like the edge of the board does.
+    :return: (prefix runs, suffix runs, prefix captures, suffix captures) tuple:
+             prefix runs[index][prefix] is the number of empty squares walking down from square index - 1
+             suffix runs[suffix] is the number of empty squares walking up from the lowest digit, 8 for 0
+             prefix captures[digit][index][prefix] and suffix captures[digit][suffix] are the number of squares,
+             nearest first, sandwiched by a piece with that line digit. Digit 0 never sandwiches anything
+    """
+    prefix_runs = []
+    prefix_captures = [[], [], []]
+    for index in range(9):
+        runs = []
+        captures = ([], [], [])
+        for prefix in range(_POWERS_OF_3[index]):
+            walk = _walk_line([prefix // _POWERS_OF_3[power] % 3 for power in range(index - 1, -1, -1)])
+            runs.append(walk[0])
+            captures[1].append(walk[1])
+            captures[2].append(walk[2])
+        prefix_runs.append(runs)
+        prefix_captures[0].append([0] * len(runs))
+        prefix_captures[1].append(captures[1])
+        prefix_captures[2].append(captures[2])
+
+    suffix_runs = []
+    suffix_captures = [[0] * _POWERS_OF_3[8], [], []]
+    for suffix in range(_POWERS_OF_3[8]):
+        walk = _walk_line([suffix // _POWERS_OF_3[power] % 3 for power in range(8)])
+        suffix_runs.append(walk[0])
+        suffix_captures[1].append(walk[1])
+        suffix_captures[2].append(walk[2])
+    return prefix_runs, suffix_runs, prefix_captures, suffix_captures
+
+
+_PREFIX_RUNS, _SUFFIX_RUNS, _PREFIX_CAPTURES, _SUFFIX_CAPTURES = _build_line_tables()
+
+# The two squares next to every corner, which capture the corner when both hold the same player's pieces
+_CORNER_NEIGHBORS = {corner: tuple(SQUARE_XY[RAYS[direction][corner][0]] for direction in RAYS
+                                   if RAYS[direction][corner])
+                     for corner in (0, 8, 72, 80)}
+
+# The corners whose capture depends on every square, a corner and the two squares next to it
+_CORNERS_WATCHING = [tuple(corner for corner, neighbors in _CORNER_NEIGHBORS.items()
+                           if index == corner or SQUARE_XY[index] in neighbors) for index in range(81)]
+
+# Every line already converted by _line_characters and _line_pieces, keyed by the line
+_LINE_CHARACTERS = {}
+_LINE_PIECES = {}
+
+
+def _line_characters(line):
+    """
+    Converts a line of a LineBoard to characters, remembering the result.
+    :param line: Base 3 int of a row or column
+    :return: String of 9 "R", "B", or "." characters
+    """
+    characters = _LINE_CHARACTERS.get(line)
+    if characters is None:
+        characters = "".join(".RB"[line // _POWERS_OF_3[power] % 3] for power in range(9))
+        _LINE_CHARACTERS[line] = characters
+    return characters
+
+
+def _line_pieces(line):
+    """
+    Finds the pieces in a line of a LineBoard, remembering the result.
+    :param line: Base 3 int of a row or column
+    :return: Tuple indexed by line digit of tuples of the positions along the line holding that digit
+    """
+    pieces = _LINE_PIECES.get(line)
+    if pieces is None:
+        digits = [line // _POWERS_OF_3[power] % 3 for power in range(9)]
+        pieces = tuple(tuple(position for position in range(9) if digits[position] == digit) for digit in range(3))
+        _LINE_PIECES[line] = pieces
+    return pieces
+
+
+# Every line already scored by _line_features, keyed by the line
+_LINE_FEATURES = {}
+
+
+def _line_features(line):
+    """
+    Scores the pieces in a row or column for PositionFeatures, remembering the result.
+    A piece is threatened along a line when it is part of a run of its own pieces with an opponent's piece at one
+    end and an empty square at the other, so an opponent's piece moving onto the empty square captures the run.
+    :param line: Base 3 int of a row or column (see LineBoard)
+    :return: (red moves, black moves, red threatened, black threatened) tuple. Moves count every empty square a
+             piece of that color can slide to along the line, threatened are 9 bit masks of positions along it
+    """
+    features = _LINE_FEATURES.get(line)
+    if features is not None:
+        return features
+
+    digits = [line // _POWERS_OF_3[power] % 3 for power in range(9)]
+    moves = [0, 0, 0]
+    threatened = [0, 0, 0]
+    start = 0
+    while start < 9:
+        digit = digits[start]
+        end = start
+        while end < 8 and digits[end + 1] == digit:
+            end += 1
+        if digit == 0:
+            # An empty gap is a move for the pieces on both ends of it
+            for bound in (start - 1, end + 1):
+                if 0 <= bound <= 8:
+                    moves[digits[bound]] += end - start + 1
+        else:
+            before = digits[start - 1] if start > 0 else -1
+            after = digits[end + 1] if end < 8 else -1
+            if (before == 3 - digit and after == 0) or (before == 0 and after == 3 - digit):
+                threatened[digit] |= ((1 << (end - start + 1)) - 1) << start
+        start = end + 1
+
+    features = (moves[1], moves[2], threatened[1], threatened[2])
+    _LINE_FEATURES[line] = features
+    return features
+
+
+class Board:
+    """The Board class is solely used as a container for board states, used in the HasamiShogiGame class.
+        This class will contain the following data members:
+        A bytearray of 81 occupant codes (0 for "NONE", 1 for "RED", 2 for "BLACK"), one per square index
+        The Zobrist hash of the pieces on the board"""
+
+    __slots__ = ("_board", "_hash")
+
+    def __init__(self):
+        """The constructor for the Board class. Takes no parameters.
+        Fills the bytearray with the pieces or empty spaces, red on row "a" and black on row "i".
+        Elements are accessed via self._board[Y * 9 + X], the square index of (X, Y).
+        Also tracks the Zobrist hash of the pieces on the board, updated every time a space is set"""
+        self._board = bytearray(_START_CODES)
+        self._hash = _START_HASH
+
+    def clone(self):
+        """
+        Method used to copy the board, with one copy of the bytearray.
+        :return: A new Board with the same pieces and hash
+        """
+        board = Board.__new__(Board)
+        board._board = self._board[:]
+        board._hash = self._hash
+        return board
+
+    def get_space(self, xy):
+        """
+        Method used to get the contents of a space (referenced by (column#, row#)).
+        :param xy: An (x, y) coordinate tuple for a square to pull the contents of.
+        :return: "BLACK", "RED", or "NONE"
+        """
+        if xy[0] > 8 or xy[0] < 0 or xy[1] > 8 or xy[1] < 0:
+            return "NONE"
+        return _CODE_OCCUPANTS[self._board[xy[1] * 9 + xy[0]]]
+
+    def set_space(self, xy, val):
+        """
+        Method used to overwrite the contents of a space (referenced by (column#, row#).
+        :param xy: An (x, y) coordinate tuple for a square to set the contents of.
+        :param val: "BLACK", "RED", or "NONE"
+        :return: None
+        """
+        index = xy[1] * 9 + xy[0]
+        previous = self._board[index]
+        if previous:
+            self._hash ^= _ZOBRIST_PIECE_KEYS[_CODE_OCCUPANTS[previous]][index]
+        if val != "NONE":
+            self._hash ^= _ZOBRIST_PIECE_KEYS[val][index]
+        self._board[index] = _OCCUPANT_CODES[val]
+
+    def get_hash(self):
+        """
+        Method used to get the Zobrist hash of the pieces on the board, kept up to date by set_space.
+        :return: A 64 bit int
+        """
+        return self._hash
+
+    def compute_hash(self):
+        """
+        Method used to calculate the Zobrist hash of the pieces on the board from scratch.
+        :return: A 64 bit int
+        """
+        key = 0
+        for index, xy in enumerate(SQUARE_XY):
+            occupant = self.get_space(xy)
+            if occupant != "NONE":
+                key ^= _ZOBRIST_PIECE_KEYS[occupant][index]
+        return key
+
+    def get_squares(self):
+        """
+        Method used to get the whole board at once.
+        :return: String of 81 "R", "B", or "." characters in square index order
+        """
+        return self._board.translate(_CODE_CHARACTERS).decode("ascii")
+
+    def set_squares(self, squares):
+        """
+        Method used to overwrite the whole board at once, recalculating the hash in one pass.
+        :param squares: String of 81 "R", "B", or "." characters in square index order
+        :return: None
+        """
+        self._board = bytearray(squares.encode("ascii").translate(_CHARACTER_CODES))
+        self._hash = _masks_hash(*_squares_to_masks(squares))
+
+    def get_masks(self):
+        """
+        Method used to get the whole board as bitboards.
+        :return: (red, black) tuple of 81 bit ints, bit N is set if that color has a piece on square index N
+        """
+        return _squares_to_masks(self.get_squares())
+
+    def set_masks(self, red, black):
+        """
+        Method used to overwrite the whole board from bitboards.
+        :param red: 81 bit int with a bit set for every square index holding a red piece
+        :param black: 81 bit int with a bit set for every square index holding a black piece
+        :return: None
+        """
+        self._board = bytearray(_masks_to_squares(red, black).encode("ascii").translate(_CHARACTER_CODES))
+        self._hash = _masks_hash(red, black)
+
+    def get_pieces(self, player):
+        """
+        Method used to find every piece belonging to a player.
+        :param player: "BLACK" or "RED"
+        :return: List of square indices holding the player's pieces, in increasing order
+        """
+        code = _OCCUPANT_CODES[player]
+        return [index for index, occupant in enumerate(self._board) if occupant == code]
+
+    def get_destinations(self, index):
+        """
+        Method used to find every empty square a piece could slide to, following the precomputed rays.
+        :param index: Square index of the piece to move
+        :return: List of square indices, walking up, down, left, then right
+        """
+        destinations = []
+        board = self._board
+        for ray in _MOVE_RAYS[index]:
+            for square in ray:
+                if board[square]:
+                    break
+                destinations.append(square)
+        return destinations
+
+    def print(self):
+        """
+        Method used to display the board in a human readable format.
+        :return: None
+        """
+
+        # Create an iterator for row labels
+        row_labels = iter("abcdefghi")
+
+        # Draw the top row of column labels
+        print("  1 2 3 4 5 6 7 8 9")
+
+        for y in range(9):
+            # Print a single row
+            print(next(row_labels), end=" ")  # Print row Label
+            for x in range(9):  # Spaces
+                spaces = self.get_space((x, y))
+                if spaces == "BLACK":
+                    print("B", end=" ")
+                elif spaces == "RED":
+                    print("R", end=" ")
+                else:
+                    print(".", end=" ")
+            print()  # End of line, since end=" " overwrites default \n with " "
+        print()
+
+    def is_corner(self, xy):
+        """
+        Method used to check if any given square is in the corner of the board, used for corner capturing.
+        :param xy: An (x, y) coordinate tuple of a square on the board to check
+        :return: True if the square is in the corner of the board, false otherwise
+        """
+        if ((xy[0] == 0 or xy[0] == 8) and
+                (xy[1] == 0 or xy[1] == 8)):
+            return True
+        return False
+
+    def is_path_clear(self, origin, destination):
+        """
+        Method used to check that a piece can slide from one square to another.
+        The squares must be different and share a row or column.
+        :param origin: (x, y) coordinate tuple of the square the piece starts on
+        :param destination: (x, y) coordinate tuple of the square the piece ends on
+        :return: True if every square after the origin up to and including the destination is empty
+        """
+
+        # Determine direction to iterate down while checking for blocking pieces
+        if origin[0] - destination[0] != 0:  # If moving along the X axis
+            if origin[0] > destination[0]:
+                offset = (-1, 0)  # "LEFT"
+            else:
+                offset = (1, 0)  # "RIGHT"
+        else:  # If moving along the Y axis
+            if origin[1] < destination[1]:
+                offset = (0, 1)  # "DOWN"
+            else:
+                offset = (0, -1)  # "UP"
+
+        # Iterate along spaces in a line until either the first blocking piece or destination square is reached
+        current_square_xy = (origin[0] + offset[0], origin[1] + offset[1])
+        while (self.get_space(current_square_xy) == "NONE" and
+               current_square_xy != destination):
+            current_square_xy = (current_square_xy[0] + offset[0], current_square_xy[1] + offset[1])
+        return self.get_space(current_square_xy) == "NONE"
+
+    def get_sandwiched(self, origin, direction, player):
+        """
+        Method used to find the pieces sandwiched by a piece in a given direction.
+        :param origin: (x, y) coordinate tuple of a piece immediately after a move.
+        :param direction: Direction that should be checked in, either "UP", "DOWN", "LEFT", or "RIGHT"
+        :param player: The player doing the sandwiching, "BLACK" or "RED"
+        :return: List of (x, y)s for pieces that should be captured
+        """
+        offset = DIRECTION_OFFSETS[direction]
+        capturing = []
+        current_square_xy = (origin[0] + offset[0], origin[1] + offset[1])
+
+        if self.is_corner(current_square_xy) is True:  # Check for corner capturing if corner
+            # Check all spaces around a corner piece (Including spaces off the board, since those return "NONE")
+            # If it has 2 of the player's pieces next to it, its surrounded
+            sandwichers = 0
+            for offsets in DIRECTION_OFFSETS.values():
+                checking = (current_square_xy[0] + offsets[0], current_square_xy[1] + offsets[1])
+                if self.get_space(checking) == player:
+                    sandwichers += 1
+            if sandwichers == 2:
+                capturing.append(current_square_xy)
+        else:  # If not a corner, check for sandwiches in a line
+            # Iterate down a line until the first "NONE" or player's piece. Add all squares checked to capturing
+            while (self.get_space(current_square_xy) != "NONE" and
+                   self.get_space(current_square_xy) != player):
+                capturing.append(current_square_xy)
+                current_square_xy = (current_square_xy[0] + offset[0], current_square_xy[1] + offset[1])
+            # If the line didn't end with a piece of the player, the piece isn't sandwiched
+            if self.get_space(current_square_xy) != player:
+                capturing = []
+
+        return capturing
+
+
+class BitBoard(Board):
+    """The BitBoard class is a drop in replacement for the Board class that stores the board as bitboards.
+        This class will contain the following data members:
+        An 81 bit integer with a bit set for every square holding a red piece
+        An 81 bit integer with a bit set for every square holding a black piece"""
+
+    __slots__ = ("_red", "_black")
+
+    def __init__(self):
+        """The constructor for the BitBoard class. Takes no parameters.
+        Sets the top row to red pieces and the bottom row to black pieces, matching the Board class."""
+        self._red = 0x1FF  # Square indices 0-8, row "a"
+        self._black = 0x1FF << 72  # Square indices 72-80, row "i"
+        self._hash = _START_HASH
+
+    def clone(self):
+        """
+        Method used to copy the board. Ints can't change, so they are shared.
+        :return: A new BitBoard with the same pieces and hash
+        """
+        board = BitBoard.__new__(BitBoard)
+        board._red = self._red
+        board._black = self._black
+        board._hash = self._hash
+        return board
+
+    def get_space(self, xy):
+        """
+        Method used to get the contents of a space (referenced by (column#, row#)).
+        :param xy: An (x, y) coordinate tuple for a square to pull the contents of.
+        :return: "BLACK", "RED", or "NONE"
+        """
+        if xy[0] > 8 or xy[0] < 0 or xy[1] > 8 or xy[1] < 0:
+            return "NONE"
+        bit = _BITS[xy[1] * 9 + xy[0]]
+        if self._red & bit:
+            return "RED"
+        if self._black & bit:
+            return "BLACK"
+        return "NONE"
+
+    def set_space(self, xy, val):
+        """
+        Method used to overwrite the contents of a space (referenced by (column#, row#).
+        :param xy: An (x, y) coordinate tuple for a square to set the contents of.
+        :param val: "BLACK", "RED", or "NONE"
+        :return: None
+        """
+        index = xy[1] * 9 + xy[0]
+        bit = _BITS[index]
+        if self._red & bit:
+            self._hash ^= _ZOBRIST_PIECE_KEYS["RED"][index]
+            self._red ^= bit
+        elif self._black & bit:
+            self._hash ^= _ZOBRIST_PIECE_KEYS["BLACK"][index]
+            self._black ^= bit
+        if val == "RED":
+            self._hash ^= _ZOBRIST_PIECE_KEYS["RED"][index]
+            self._red |= bit
+        elif val == "BLACK":
+            self._hash ^= _ZOBRIST_PIECE_KEYS["BLACK"][index]
+            self._black |= bit
+
+    def get_squares(self):
+        """
+        Method used to get the whole board at once.
+        :return: String of 81 "R", "B", or "." characters in square index order
+        """
+        return _masks_to_squares(self._red, self._black)
+
+    def set_squares(self, squares):
+        """
+        Method used to overwrite the whole board at once, recalculating the hash in one pass.
+        :param squares: String of 81 "R", "B", or "." characters in square index order
+        :return: None
+        """
+        self.set_masks(*_squares_to_masks(squares))
+
+    def get_masks(self):
+        """
+        Method used to get the whole board as bitboards.
+        :return: (red, black) tuple of 81 bit ints, bit N is set if that color has a piece on square index N
+        """
+        return self._red, self._black
+
+    def set_masks(self, red, black):
+        """
+        Method used to overwrite the whole board from bitboards.
+        :param red: 81 bit int with a bit set for every square index holding a red piece
+        :param black: 81 bit int with a bit set for every square index holding a black piece
+        :return: None
+        """
+        self._red = red
+        self._black = black
+        self._hash = _masks_hash(red, black)
+
+    def get_pieces(self, player):
+        """
+        Method used to find every piece belonging to a player.
+        :param player: "BLACK" or "RED"
+        :return: List of square indices holding the player's pieces, in increasing order
+        """
+        pieces = []
+        remaining = self._red if player == "RED" else self._black
+        while remaining:
+            lowest = remaining & -remaining
+            pieces.append(lowest.bit_length() - 1)
+            remaining ^= lowest
+        return pieces
+
+    def get_destinations(self, index):
+        """
+        Method used to find every empty square a piece could slide to, following the precomputed rays.
+        :param index: Square index of the piece to move
+        :return: List of square indices, walking up, down, left, then right
+        """
+        destinations = []
+        occupied = self._red | self._black
+        for ray in _MOVE_RAYS[index]:
+            for square in ray:
+                if occupied & _BITS[square]:
+                    break
+                destinations.append(square)
+        return destinations
+
+    def is_corner(self, xy):
+        """
+        Method used to check if any given square is in the corner of the board, used for corner capturing.
+        :param xy: An (x, y) coordinate tuple of a square on the board to check
+        :return: True if the square is in the corner of the board, false otherwise
+        """
+        if xy[0] > 8 or xy[0] < 0 or xy[1] > 8 or xy[1] < 0:
+            return False
+        return _CORNER_MASK & _BITS[xy[1] * 9 + xy[0]] != 0
+
+    def is_path_clear(self, origin, destination):
+        """
+        Method used to check that a piece can slide from one square to another.
+        The squares must be different and share a row or column.
+        :param origin: (x, y) coordinate tuple of the square the piece starts on
+        :param destination: (x, y) coordinate tuple of the square the piece ends on
+        :return: True if every square after the origin up to and including the destination is empty
+        """
+        if origin[0] > destination[0]:
+            direction, length = "LEFT", origin[0] - destination[0]
+        elif origin[0] < destination[0]:
+            direction, length = "RIGHT", destination[0] - origin[0]
+        elif origin[1] < destination[1]:
+            direction, length = "DOWN", destination[1] - origin[1]
+        else:
+            direction, length = "UP", origin[1] - destination[1]
+        path = _RAY_MASKS[direction][origin[1] * 9 + origin[0]][length - 1]
+        return (self._red | self._black) & path == 0
+
+    def get_sandwiched(self, origin, direction, player):
+        """
+        Method used to find the pieces sandwiched by a piece in a given direction.
+        :param origin: (x, y) coordinate tuple of a piece immediately after a move.
+        :param direction: Direction that should be checked in, either "UP", "DOWN", "LEFT", or "RIGHT"
+        :param player: The player doing the sandwiching, "BLACK" or "RED"
+        :return: List of (x, y)s for pieces that should be captured
+        """
+        ray = RAYS[direction][origin[1] * 9 + origin[0]]
+        if not ray:  # Moved piece is on the edge of the board in this direction
+            return []
+
+        if player == "RED":
+            own, opponent = self._red, self._black
+        else:
+            own, opponent = self._black, self._red
+
+        first = ray[0]
+        if _CORNER_MASK & _BITS[first]:  # Corner capturing, both orthogonal neighbors must be the player's
+            if own & _NEIGHBOR_MASKS[first] == _NEIGHBOR_MASKS[first]:
+                return [SQUARE_XY[first]]
+            return []
+
+        # Find the first square along the ray that isn't an opponent's piece
+        ray_mask = _RAY_MASKS[direction][origin[1] * 9 + origin[0]][-1]
+        stoppers = ray_mask & ~opponent
+        if stoppers == 0:  # Opponent pieces all the way to the edge of the board
+            return []
+        if direction == "RIGHT" or direction == "DOWN":  # Square indices increase along the ray
+            stopper = stoppers & -stoppers
+        else:
+            stopper = 1 << (stoppers.bit_length() - 1)
+        if own & stopper == 0:
+            return []
+
+        # Everything between the moved piece and the stopping piece is an opponent's piece
+        stopper_index = stopper.bit_length() - 1
+        distance = abs(stopper_index - ray[0]) // abs(ray[0] - (origin[1] * 9 + origin[0]))
+        return [SQUARE_XY[square] for square in ray[:distance]]
+
+
+class LineBoard(Board):
+    """The LineBoard class is a drop in replacement for the Board class that slides and captures with lookup tables.
+        This class will contain the following data members:
+        A list of 9 base 3 ints, one per row, where digit x is the occupant of square (x, y) (see _OCCUPANT_CODES)
+        A list of 9 base 3 ints, one per column, where digit y is the occupant of square (x, y)"""
+
+    __slots__ = ("_rows", "_columns")
+
+    def __init__(self):
+        """The constructor for the LineBoard class. Takes no parameters.
+        Sets the top row to red pieces and the bottom row to black pieces, matching the Board class."""
+        red_line = sum(_POWERS_OF_3[:9])
+        self._rows = [red_line] + [0] * 7 + [2 * red_line]
+        self._columns = [1 + 2 * _POWERS_OF_3[8]] * 9
+        self._hash = _START_HASH
+
+    def clone(self):
+        """
+        Method used to copy the board, with one copy each of the row and column lists.
+        :return: A new LineBoard with the same pieces and hash
+        """
+        board = LineBoard.__new__(LineBoard)
+        board._rows = self._rows[:]
+        board._columns = self._columns[:]
+        board._hash = self._hash
+        return board
+
+    def get_space(self, xy):
+        """
+        Method used to get the contents of a space (referenced by (column#, row#)).
+        :param xy: An (x, y) coordinate tuple for a square to pull the contents of.
+        :return: "BLACK", "RED", or "NONE"
+        """
+        if xy[0] > 8 or xy[0] < 0 or xy[1] > 8 or xy[1] < 0:
+            return "NONE"
+        return _CODE_OCCUPANTS[self._rows[xy[1]] // _POWERS_OF_3[xy[0]] % 3]
+
+    def set_space(self, xy, val):
+        """
+        Method used to overwrite the contents of a space (referenced by (column#, row#).
+        :param xy: An (x, y) coordinate tuple for a square to set the contents of.
+        :param val: "BLACK", "RED", or "NONE"
+        :return: None
+        """
+        x, y = xy
+        previous = self._rows[y] // _POWERS_OF_3[x] % 3
+        digit = _OCCUPANT_CODES[val]
+        if previous:
+            self._hash ^= _ZOBRIST_PIECE_KEYS[_CODE_OCCUPANTS[previous]][y * 9 + x]
+        if digit:
+            self._hash ^= _ZOBRIST_PIECE_KEYS[val][y * 9 + x]
+        self._rows[y] += (digit - previous) * _POWERS_OF_3[x]
+        self._columns[x] += (digit - previous) * _POWERS_OF_3[y]
+
+    def get_squares(self):
+        """
+        Method used to get the whole board at once.
+        :return: String of 81 "R", "B", or "." characters in square index order
+        """
+        return "".join([_line_characters(row) for row in self._rows])
+
+    def set_squares(self, squares):
+        """
+        Method used to overwrite the whole board at once, recalculating the hash in one pass.
+        :param squares: String of 81 "R", "B", or "." characters in square index order
+        :return: None
+        """
+        self._set_lines(squares)
+        self._hash = _masks_hash(*_squares_to_masks(squares))
+
+    def _set_lines(self, squares):
+        """
+        Sets every row and column from a board string, without touching the hash.
+        :param squares: String of 81 "R", "B", or "." characters in square index order
+        :return: None
+        """
+        digits = squares.translate(_TERNARY_DIGITS)
+        self._rows = [int(digits[y * 9:y * 9 + 9][::-1], 3) for y in range(9)]
+        self._columns = [int(digits[x::9][::-1], 3) for x in range(9)]
+
+    def set_masks(self, red, black):
+        """
+        Method used to overwrite the whole board from bitboards.
+        :param red: 81 bit int with a bit set for every square index holding a red piece
+        :param black: 81 bit int with a bit set for every square index holding a black piece
+        :return: None
+        """
+        self._set_lines(_masks_to_squares(red, black))
+        self._hash = _masks_hash(red, black)
+
+    def get_pieces(self, player):
+        """
+        Method used to find every piece belonging to a player.
+        :param player: "BLACK" or "RED"
+        :return: List of square indices holding the player's pieces, in increasing order
+        """
+        digit = _OCCUPANT_CODES[player]
+        return [y * 9 + x for y, row in enumerate(self._rows) if row for x in _line_pieces(row)[digit]]
+
+    def get_destinations(self, index):
+        """
+        Method used to find every empty square a piece could slide to, looking up how far each way is clear.
+        :param index: Square index of the piece to move
+        :return: List of square indices, walking up, down, left, then right
+        """
+        x, y = SQUARE_XY[index]
+        row = self._rows[y]
+        column = self._columns[x]
+        return (list(RAYS["UP"][index][:_PREFIX_RUNS[y][column % _POWERS_OF_3[y]]]) +
+                list(RAYS["DOWN"][index][:_SUFFIX_RUNS[column // _POWERS_OF_3[y + 1]]]) +
+                list(RAYS["LEFT"][index][:_PREFIX_RUNS[x][row % _POWERS_OF_3[x]]]) +
+                list(RAYS["RIGHT"][index][:_SUFFIX_RUNS[row // _POWERS_OF_3[x + 1]]]))
+
+    def is_path_clear(self, origin, destination):
+        """
+        Method used to check that a piece can slide from one square to another.
+        The squares must be different and share a row or column.
+        :param origin: (x, y) coordinate tuple of the square the piece starts on
+        :param destination: (x, y) coordinate tuple of the square the piece ends on
+        :return: True if every square after the origin up to and including the destination is empty
+        """
+        if origin[1] == destination[1]:
+            line, start, end = self._rows[origin[1]], origin[0], destination[0]
+        else:
+            line, start, end = self._columns[origin[0]], origin[1], destination[1]
+        if end < start:
+            return _PREFIX_RUNS[start][line % _POWERS_OF_3[start]] >= start - end
+        return _SUFFIX_RUNS[line // _POWERS_OF_3[start + 1]] >= end - start
+
+    def get_sandwiched(self, origin, direction, player):
+        """
+        Method used to find the pieces sandwiched by a piece in a given direction.
+        :param origin: (x, y) coordinate tuple of a piece immediately after a move.
+        :param direction: Direction that should be checked in, either "UP", "DOWN", "LEFT", or "RIGHT"
+        :param player: The player doing the sandwiching, "BLACK" or "RED"
+        :return: List of (x, y)s for pieces that should be captured
+        """
+        x, y = origin
+        ray = RAYS[direction][y * 9 + x]
+        if not ray:  # Moved piece is on the edge of the board in this direction
+            return []
+
+        digit = _OCCUPANT_CODES[player]
+        neighbors = _CORNER_NEIGHBORS.get(ray[0])
+        if neighbors is not None:  # Corner capturing, both orthogonal neighbors must be the player's
+            rows = self._rows
+            for neighbor_x, neighbor_y in neighbors:
+                if rows[neighbor_y] // _POWERS_OF_3[neighbor_x] % 3 != digit:
+                    return []
+            return [SQUARE_XY[ray[0]]]
+
+        if direction == "LEFT":
+            count = _PREFIX_CAPTURES[digit][x][self._rows[y] % _POWERS_OF_3[x]]
+        elif direction == "RIGHT":
+            count = _SUFFIX_CAPTURES[digit][self._rows[y] // _POWERS_OF_3[x + 1]]
+        elif direction == "UP":
+            count = _PREFIX_CAPTURES[digit][y][self._columns[x] % _POWERS_OF_3[y]]
+        else:
+            count = _SUFFIX_CAPTURES[digit][self._columns[x] // _POWERS_OF_3[y + 1]]
+        if not count:
+            return []
+        return [SQUARE_XY[square] for square in ray[:count]]
+
+
+class MoveRejection(Enum):
+    """The reasons a move can be rejected, in the order make_move checks them.
+    Each value is the message make_move prints after "Unable to make move -- "."""
+    GAME_CONCLUDED = "Game has concluded"
+    INVALID_ORIGIN = "Origin is not in valid algebraic notation format"
+    INVALID_DESTINATION = "Destination is not in valid algebraic notation format"
+    NOT_OWNED = "Piece at the origin square is not owned by the active player"
+    SAME_SQUARE = "Origin and destination are the same squares"
+    NOT_IN_LINE = "Origin and destination are not in a line (Pieces move like rooks)"
+    PATH_BLOCKED = "Movement path is blocked by another piece"
+
+
+class MoveResult:
+    """The MoveResult class describes the outcome of HasamiShogiGame.try_move.
+    This class will contain the following data members:
+    The MoveRejection the move was rejected for, or None if the move was made
+    A list of the algebraic notation squares captured by the move
+    The game state after the move"""
+
+    __slots__ = ("_reason", "_captured", "_game_state")
+
+    def __init__(self, reason, captured, game_state):
+        """The constructor for the MoveResult class.
+        :param reason: MoveRejection, or None if the move was made
+        :param captured: List of algebraic notation strings of the captured squares
+        :param game_state: The game state after the move"""
+        self._reason = reason
+        self._captured = captured
+        self._game_state = game_state
+
+    def is_success(self):
+        """
+        Method that returns whether the move was made.
+        :return: True if the move was made, False if it was rejected
+        """
+        return self._reason is None
+
+    def get_reason(self):
+        """
+        Method that returns why the move was rejected.
+        :return: A MoveRejection, or None if the move was made
+        """
+        return self._reason
+
+    def get_captured(self):
+        """
+        Method that returns the squares captured by the move.
+        :return: List of algebraic notation strings, empty if nothing was captured or the move was rejected
+        """
+        return self._captured
+
+    def get_game_state(self):
+        """
+        Method that returns the game state after the move.
+        :return: "UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW"
+        """
+        return self._game_state
+
+
+class AttackMap:
+    """The AttackMap class describes the captures one move away for a player, see HasamiShogiGame.get_attack_map.
+    This class will contain the following data members:
+    The player the map is for ("BLACK" or "RED")
+    A dict of the player's capturing moves to the squares they capture
+    A frozenset of the opponent's pieces the player can capture with one move
+    A frozenset of the player's pieces the opponent can capture with one move"""
+
+    __slots__ = ("_player", "_capturing_moves", "_attacked", "_threatened")
 
-class InvalidAlgebraicNotation(Exception):
-    pass
+    def __init__(self, player, capturing_moves, attacked, threatened):
+        """The constructor for the AttackMap class.
+        :param player: "BLACK" or "RED"
+        :param capturing_moves: Dict of (origin, destination) square index tuple -> tuple of captured square indices
+        :param attacked: Frozenset of square indices of the opponent's pieces the player can capture
+        :param threatened: Frozenset of square indices of the player's pieces the opponent can capture"""
+        self._player = player
+        self._capturing_moves = capturing_moves
+        self._attacked = attacked
+        self._threatened = threatened
 
+    def get_player(self):
+        """
+        Method that returns the player the map is for.
+        :return: "BLACK" or "RED"
+        """
+        return self._player
 
-class Board:
-    """The Board class is solely used as a container for board states, used in the HasamiShogiGame class.
-        This class will contain the following data members:
-        One outer list (representing rows), filled with 9 inner lists (representing columns),
-            filled with values representing each space ("BLACK", "RED", or "NONE")"""
+    def get_capturing_moves(self):
+        """
+        Method that returns the player's legal moves that capture, see HasamiShogiGame.get_capturing_moves.
+        :return: Dict of (origin, destination) square index tuple -> tuple of captured square indices
+        """
+        return self._capturing_moves
 
-    def __init__(self):
-        """The constructor for the Board class. Takes no parameters.
-        Creates the outer list, fills it with the inner lists representing each row,
-        and fills the inner lists with the pieces or empty spaces
-        Elements are accessed via self._board[Y][X]. [Y][X] made it easier to implement the board's print method"""
-        self._board = [["RED"] * 9,
-                       ["NONE"] * 9,
-                       ["NONE"] * 9,
-                       ["NONE"] * 9,
-                       ["NONE"] * 9,
-                       ["NONE"] * 9,
-                       ["NONE"] * 9,
-                       ["NONE"] * 9,
-                       ["BLACK"] * 9]
+    def get_attacked(self):
+        """
+        Method that returns the opponent's pieces the player can capture with one move.
+        :return: Frozenset of square indices
+        """
+        return self._attacked
 
-    def get_space(self, xy):
+    def get_threatened(self):
         """
-        Method used to get the contents of a space (referenced by (column#, row#)).
-        :param xy: An (x, y) coordinate tuple for a square to pull the contents of.
-        :return: "BLACK", "RED", or "NONE"
+        Method that returns the player's pieces the opponent could capture with one move, whether or not it is the
+        opponent's turn.
+        :return: Frozenset of square indices
         """
-        if xy[0] > 8 or xy[0] < 0 or xy[1] > 8 or xy[1] < 0:
-            return "NONE"
-        return self._board[xy[1]][xy[0]]
+        return self._threatened
 
-    def set_space(self, xy, val):
+
+class PositionFeatures:
+    """The PositionFeatures class keeps evaluation features of a position up to date as squares change, for
+    HasamiShogiGame's feature tracking (see set_feature_tracking).
+    This class will contain the following data members:
+    A list of 18 base 3 ints, the 9 rows then the 9 columns of the board (see LineBoard)
+    Lists of the number of squares, of moves, and of threatened pieces of each occupant, indexed by occupant code
+    A list of 81 bit ints of the threatened squares of each occupant, indexed by occupant code
+    Whether every change is checked against features calculated from scratch"""
+
+    __slots__ = ("_lines", "_pieces", "_moves", "_threats", "_threatened", "_check")
+
+    def __init__(self, squares, check=False):
+        """The constructor for the PositionFeatures class.
+        :param squares: String of 81 "R", "B", or "." characters in square index order
+        :param check: True to check the features after every move, see HasamiShogiGame.set_feature_tracking"""
+        digits = squares.translate(_TERNARY_DIGITS)
+        self._lines = ([int(digits[y * 9:y * 9 + 9][::-1], 3) for y in range(9)] +
+                       [int(digits[x::9][::-1], 3) for x in range(9)])
+        self._pieces = [squares.count("."), squares.count("R"), squares.count("B")]
+        self._moves = [0, 0, 0]
+        for line in self._lines:
+            features = _line_features(line)
+            self._moves[1] += features[0]
+            self._moves[2] += features[1]
+        self._threats = [0, 0, 0]
+        self._threatened = [0, 0, 0]
+        for index in range(81):
+            for code in (1, 2):
+                if self._is_threatened(index, code):
+                    self._threats[code] |= _BITS[index]
+                    self._threatened[code] += 1
+        self._check = check
+
+    def clone(self):
         """
-        Method used to overwrite the contents of a space (referenced by (column#, row#).
-        :param xy: An (x, y) coordinate tuple for a square to set the contents of.
-        :param val: "BLACK", "RED", or "NONE"
-        :return: None
+        Method used to copy the features.
+        :return: A new PositionFeatures with the same lines and counts
         """
-        self._board[xy[1]][xy[0]] = val
+        features = PositionFeatures.__new__(PositionFeatures)
+        features._lines = self._lines[:]
+        features._pieces = self._pieces[:]
+        features._moves = self._moves[:]
+        features._threats = self._threats[:]
+        features._threatened = self._threatened[:]
+        features._check = self._check
+        return features
 
-    def print(self):
+    def is_checking(self):
         """
-        Method used to display the board in a human readable format.
+        Method that returns whether changes are checked against features calculated from scratch.
+        :return: Bool
+        """
+        return self._check
+
+    def set_square(self, xy, code):
+        """
+        Method used to change the occupant of one square, updating its row, its column, and the counts.
+        Only the squares whose threatened bit changed in the row or the column, and the corners next to the square,
+        are checked again for the threatened pieces.
+        :param xy: (x, y) coordinate tuple of the square
+        :param code: Occupant code of the new occupant, 0 for empty, 1 for red, or 2 for black
         :return: None
         """
+        x, y = xy
+        lines = self._lines
+        previous = lines[y] // _POWERS_OF_3[x] % 3
+        if previous == code:
+            return
+        self._pieces[previous] -= 1
+        self._pieces[code] += 1
+        moves = self._moves
+        changed = list(_CORNERS_WATCHING[y * 9 + x])
+        for number, change in ((y, (code - previous) * _POWERS_OF_3[x]),
+                               (9 + x, (code - previous) * _POWERS_OF_3[y])):
+            old = _line_features(lines[number])
+            lines[number] += change
+            new = _line_features(lines[number])
+            moves[1] += new[0] - old[0]
+            moves[2] += new[1] - old[1]
+            positions = (old[2] ^ new[2]) | (old[3] ^ new[3])
+            position = 0
+            while positions:
+                if positions & 1:
+                    changed.append(y * 9 + position if number < 9 else position * 9 + x)
+                positions >>= 1
+                position += 1
 
-        # Create an iterator for row labels
-        row_labels = iter("abcdefghi")
+        threats = self._threats
+        for index in changed:
+            bit = _BITS[index]
+            for occupant in (1, 2):
+                if self._is_threatened(index, occupant) != (threats[occupant] & bit != 0):
+                    threats[occupant] ^= bit
+                    self._threatened[occupant] += 1 if threats[occupant] & bit else -1
 
-        # Draw the top row of column labels
-        print("  1 2 3 4 5 6 7 8 9")
+    def _is_threatened(self, index, code):
+        """
+        Method that checks whether a square holds a threatened piece, see get_threatened.
+        :param index: Square index
+        :param code: Occupant code of the player, 1 for red or 2 for black
+        :return: Bool
+        """
+        y, x = divmod(index, 9)
+        lines = self._lines
+        if _line_features(lines[y])[code + 1] >> x & 1 or _line_features(lines[9 + x])[code + 1] >> y & 1:
+            return True
+        neighbors = _CORNER_NEIGHBORS.get(index)
+        if neighbors is None or lines[y] // _POWERS_OF_3[x] % 3 != code:
+            return False
+        first, second = (lines[neighbor[1]] // _POWERS_OF_3[neighbor[0]] % 3 for neighbor in neighbors)
+        return (first == 3 - code and second == 0) or (first == 0 and second == 3 - code)
 
-        for rows in self._board:
-            # Print a single row
-            print(next(row_labels), end=" ")  # Print row Label
-            for spaces in rows:  # Spaces
-                if spaces == "BLACK":
-                    print("B", end=" ")
-                elif spaces == "RED":
-                    print("R", end=" ")
-                else:
-                    print(".", end=" ")
-            print()  # End of line, since end=" " overwrites default \n with " "
-        print()
+    def get_mobility(self, player):
+        """
+        Method that returns the number of empty squares a player's pieces can slide to.
+        :param player: "RED" or "BLACK"
+        :return: Int
+        """
+        return self._moves[_OCCUPANT_CODES[player]]
 
-    def is_corner(self, xy):
+    def get_threatened(self, player):
         """
-        Method used to check if any given square is in the corner of the board, used for corner capturing.
-        :param xy: An (x, y) coordinate tuple of a square on the board to check
-        :return: True if the square is in the corner of the board, false otherwise
+        Method that returns the pieces of a player an opponent's piece moving onto a single empty square next to
+        them would capture, along a row or column (see _line_features) or in a corner.
+        This is an approximation of the pieces the opponent can capture: whether any opponent's piece can reach the
+        empty square is not checked (HasamiShogiGame.get_attack_map finds the exact pieces, but not incrementally).
+        :param player: "RED" or "BLACK"
+        :return: 81 bit int with a bit set for every threatened square index
         """
-        if ((xy[0] == 0 or xy[0] == 8) and
-                (xy[1] == 0 or xy[1] == 8)):
-            return True
-        return False
+        return self._threats[_OCCUPANT_CODES[player]]
+
+    def get_features(self):
+        """
+        Method that returns the features of the position.
+        :return: Dict of "RED" and "BLACK" -> dict of "pieces" (number on the board), "mobility" (number of legal
+                 moves while the game is unfinished), and "threatened" (number of pieces, see get_threatened)
+        """
+        return {player: {"pieces": self._pieces[code], "mobility": self._moves[code],
+                         "threatened": self._threatened[code]}
+                for player, code in (("RED", 1), ("BLACK", 2))}
+
+    def verify(self, squares):
+        """
+        Method that checks the features against features calculated from scratch.
+        Raises an AssertionError naming the features that differ.
+        :param squares: String of 81 "R", "B", or "." characters of the board the features should describe
+        :return: None
+        """
+        expected = PositionFeatures(squares)
+        if (expected._lines != self._lines or expected._pieces != self._pieces or expected._moves != self._moves or
+                expected._threats != self._threats or expected._threatened != self._threatened):
+            raise AssertionError("Incremental features differ from the board: %s, expected %s" %
+                                 (self.get_features(), expected.get_features()))
 
 
 class HasamiShogiGame:
@@ -140,16 +1333,288 @@ class HasamiShogiGame:
     A data member to track whose turn it is ("BLACK" or "RED") (init'd as "BLACK")
     A data member to track red's remaining pieces
     A data member to track black's remaining pieces
-    A data member tracking the current game state ("UNFINISHED", "RED_WON", or "BLACK_WON") (init'd as "UNFINISHED")"""
+    A data member tracking the current game state ("UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW")
+    (init'd as "UNFINISHED")
+    A data member naming the board backend in use (init'd as "standard")
+    A data member tracking whether make_move prints (init'd as False, printing)
+    Undo and redo stacks of the moves made, used to take moves back without copying the game
+    A PositionFeatures kept up to date by every move, or None when features aren't tracked (init'd as None)
+    The last AttackMap made by get_attack_map and the position it is for, or None (init'd as None)
+    The repetition rule, a (repetitions, result, max plies) tuple, or None for no rule (init'd as None)
+    A dict of how many times every position has been reached while there is a repetition rule, or None
+    (init'd as None)
+    The plies made before the first move of the undo stack, kept by pickling (init'd as 0)
+    The position counts reached before the first move of the undo stack, kept by pickling a game with a
+    repetition rule (init'd as None)"""
 
-    def __init__(self):
-        """The constructor for the HasamiShogiGame class. Takes no parameters.
-        Initializes all private data members, including a board object."""
+    __slots__ = ("_active_player", "_backend", "_board", "_game_state", "_captured_by_black", "_captured_by_red",
+                 "_undo_stack", "_redo_stack", "_quiet", "_features", "_attacks", "_repetition_rule",
+                 "_position_counts", "_earlier_plies", "_earlier_counts")
+
+    def __init__(self, backend="standard", quiet=False):
+        """The constructor for the HasamiShogiGame class.
+        Initializes all private data members, including a board object.
+        :param backend: Name of the board class to use, a key of BOARD_BACKENDS ("standard", "bitboard", or "lines")
+        :param quiet: True to stop make_move from printing, see set_quiet"""
+        if backend not in BOARD_BACKENDS:
+            raise ValueError("Unknown board backend: " + str(backend))
         self._active_player = "BLACK"  # This player gets the first turn
-        self._board = Board()
+        self._backend = backend
+        self._board = BOARD_BACKENDS[backend]()
         self._game_state = "UNFINISHED"
         self._captured_by_black = 0
         self._captured_by_red = 0
+        self._undo_stack = []  # One record of everything a move changed for every move made
+        self._redo_stack = []  # (origin_xy, destination_xy) of every undone move, most recently undone last
+        self._quiet = quiet
+        self._features = None
+        self._attacks = None
+        self._repetition_rule = None
+        self._position_counts = None  # Position hash -> number of times reached
+        self._earlier_plies = 0
+        self._earlier_counts = None
+
+    def clone(self):
+        """
+        Method that copies the game, so moves can be tried on the copy without touching this one.
+        The board is copied with Board.clone, and the undo and redo stacks with one list copy each, since the
+        records on them never change.
+        :return: A new HasamiShogiGame in the same position, with the same backend, history, and quiet setting
+        """
+        game = type(self).__new__(type(self))
+        game._active_player = self._active_player
+        game._backend = self._backend
+        game._board = self._board.clone()
+        game._game_state = self._game_state
+        game._captured_by_black = self._captured_by_black
+        game._captured_by_red = self._captured_by_red
+        game._undo_stack = self._undo_stack[:]
+        game._redo_stack = self._redo_stack[:]
+        game._quiet = self._quiet
+        game._features = None if self._features is None else self._features.clone()
+        game._attacks = self._attacks
+        game._repetition_rule = self._repetition_rule
+        game._position_counts = None if self._position_counts is None else self._position_counts.copy()
+        game._earlier_plies = self._earlier_plies
+        game._earlier_counts = self._earlier_counts  # Never changed, see set_repetition_rule
+        return game
+
+    def __copy__(self):
+        """
+        Method that makes copy.copy use clone.
+        :return: A new HasamiShogiGame, see clone
+        """
+        return self.clone()
+
+    def __deepcopy__(self, memo):
+        """
+        Method that makes copy.deepcopy use clone, which already shares nothing that can change.
+        :param memo: Dict used by copy.deepcopy, unused
+        :return: A new HasamiShogiGame, see clone
+        """
+        return self.clone()
+
+    def __getstate__(self):
+        """
+        Method that gives pickle the state of the game: the backend name, a packed snapshot, the quiet setting,
+        and the feature tracking setting, a few dozen bytes in all for a game without a repetition rule. Like
+        snapshots, the undo and redo stacks are not included, but the number of plies made is, so the unpickled
+        game's get_ply carries on from this one's. A game with a repetition rule also gives the rule and its
+        position counts, so the unpickled game keeps counting repetitions where this one left off. The counts are
+        a dict entry for every position reached, so the state of a long game with a rule grows with the number of
+        plies played.
+        :return: (backend, packed snapshot bytes, quiet, tracking, plies, repetitions) tuple. Tracking is None,
+                 "on", or "check", repetitions is None or a (rule, position counts dict) tuple
+        """
+        if self._features is None:
+            tracking = None
+        else:
+            tracking = "check" if self._features.is_checking() else "on"
+        repetitions = None
+        if self._repetition_rule is not None:
+            repetitions = (self._repetition_rule, self._position_counts)
+        return self._backend, self.to_snapshot(packed=True), self._quiet, tracking, self.get_ply(), repetitions
+
+    def __setstate__(self, state):
+        """
+        Method that restores a game unpickled from the state given by __getstate__.
+        :param state: (backend, packed snapshot bytes, quiet, tracking, plies, repetitions) tuple
+        :return: None
+        """
+        backend, snapshot, quiet, tracking, plies, repetitions = state
+        self.__init__(backend, quiet)
+        self._load_packed_snapshot(snapshot)
+        self._earlier_plies = plies
+        if tracking is not None:
+            self.set_feature_tracking(True, tracking == "check")
+        if repetitions is not None:
+            repetition_rule, self._earlier_counts = repetitions
+            self.set_repetition_rule(*repetition_rule)
+
+    def set_repetition_rule(self, repetitions=None, result="DRAW", max_plies=None):
+        """
+        Method that ends games that repeat a position too often or go on too long, or stops doing so.
+        Positions (the board, active player, and captured pieces counts) are counted by their position hash from
+        the first position of the undo stack (the start of the game, or the snapshot it was loaded from), and the
+        counts are kept up to date by every move and undo. An unpickled game also keeps counting from the
+        positions and plies of the game that was pickled. Only moves made after the rule is set can end the game.
+        Raises a ValueError if the rule isn't valid.
+        :param repetitions: Int, a move reaching a position for the repetitions-th time ends the game. At least
+                            2, or None to allow any number of repetitions
+        :param result: "DRAW" to draw the game when a position is repeated too often, or "LOSS" for the player
+                       whose move repeated it to lose
+        :param max_plies: Int, the game is drawn if it is still unfinished after this many plies (counted by
+                          get_ply), or None for no limit. Turns repetition counting on even without a
+                          repetitions limit
+        :return: None
+        """
+        if result not in REPETITION_RESULTS:
+            raise ValueError("Unknown repetition result: " + str(result))
+        if (repetitions is not None and repetitions < 2) or (max_plies is not None and max_plies < 1):
+            raise ValueError("Repetitions must be at least 2 and max plies at least 1")
+        self._repetition_rule = None
+        self._position_counts = None
+        if repetitions is None and max_plies is None:
+            return
+
+        # Count the positions already reached by taking every move back and playing it again. Only a previous
+        # repetition rule could have ended the game, and there is none while replaying, so the state is restored
+        state = self._game_state
+        moves = []
+        while self._undo_stack:
+            moves.append(self._unmake_move())
+        if self._earlier_counts is None:
+            counts = {self.get_position_hash(): 1}
+        else:
+            counts = self._earlier_counts.copy()
+        for origin_xy, destination_xy in reversed(moves):
+            self._execute_move(origin_xy, destination_xy)
+            key = self.get_position_hash()
+            counts[key] = counts.get(key, 0) + 1
+        self._game_state = state
+        self._repetition_rule = (repetitions, result, max_plies)
+        self._position_counts = counts
+
+    def get_repetition_rule(self):
+        """
+        Method that returns the rule set by set_repetition_rule.
+        :return: (repetitions, result, max plies) tuple, or None if there is no rule
+        """
+        return self._repetition_rule
+
+    def get_repetition_count(self):
+        """
+        Method that returns how many times the current position has been reached, in constant time.
+        :return: Int, 0 if there is no repetition rule (positions are only counted with one)
+        """
+        if self._position_counts is None:
+            return 0
+        return self._position_counts.get(self.get_position_hash(), 0)
+
+    def set_feature_tracking(self, enabled, check=False):
+        """
+        Method that turns tracking of the evaluation features returned by get_features on or off.
+        While tracking is on every move, capture, and undo updates the features of the rows and columns it
+        changes, so get_features doesn't have to look at the whole board.
+        :param enabled: True to track features, False to stop
+        :param check: True to also recalculate the features from scratch after every move and undo, raising an
+                      AssertionError if they differ (slow, for testing)
+        :return: None
+        """
+        self._features = PositionFeatures(self._board.get_squares(), check) if enabled else None
+
+    def is_tracking_features(self):
+        """
+        Method that returns whether features are tracked, see set_feature_tracking.
+        :return: Bool
+        """
+        return self._features is not None
+
+    def get_features(self):
+        """
+        Method that returns evaluation features of the current position. While features are tracked (see
+        set_feature_tracking) every count is kept up to date by the moves, else they are calculated from the board.
+        :return: Dict of "RED" and "BLACK" -> dict of "pieces" (number on the board), "mobility" (number of legal
+                 moves while the game is unfinished), and "threatened" (number of pieces an opponent's piece moving
+                 onto an empty square next to them would capture, whether or not one can reach it, see
+                 PositionFeatures.get_threatened)
+        """
+        if self._features is None:
+            return PositionFeatures(self._board.get_squares()).get_features()
+        return self._features.get_features()
+
+    def get_mobility(self, player):
+        """
+        Method that returns the number of legal moves a player would have if it was their turn in an unfinished
+        game, the "mobility" of get_features. Takes constant time while features are tracked.
+        :param player: "RED" or "BLACK"
+        :return: Int
+        """
+        if self._features is None:
+            return sum(len(self._board.get_destinations(origin)) for origin in self._board.get_pieces(player))
+        return self._features.get_mobility(player)
+
+    def get_capturing_moves(self, player=None):
+        """
+        Method that finds every legal move of a player that would capture, without making the moves.
+        Each candidate move puts the piece on its destination, asks the board for the sandwiched squares in every
+        direction like _check_sandwiched, and puts the piece back. Only destinations next to an opponent's piece
+        or a corner can capture, so no other destination is checked. A corner next to the destination counts as
+        captured whenever both of its neighbors hold the player's pieces, as it does in make_move.
+        :param player: "BLACK" or "RED", defaults to the active player
+        :return: Dict of (origin, destination) square index tuple -> tuple of the square indices the move would
+                 capture, in the order make_move captures them. Empty if the game has ended
+        """
+        if self.get_game_state() != "UNFINISHED":
+            return {}
+        if player is None:
+            player = self.get_active_player()
+        board = self._board
+        red, black = board.get_masks()
+        targets = (black if player == "RED" else red) | _CORNER_MASK
+        capturing_moves = {}
+        for origin in board.get_pieces(player):
+            origin_xy = SQUARE_XY[origin]
+            for destination in board.get_destinations(origin):
+                if not _NEIGHBOR_MASKS[destination] & targets:
+                    continue
+                destination_xy = SQUARE_XY[destination]
+                board.set_space(origin_xy, "NONE")
+                board.set_space(destination_xy, player)
+                captured = []
+                for direction in ("LEFT", "RIGHT", "DOWN", "UP"):
+                    captured += board.get_sandwiched(destination_xy, direction, player)
+                board.set_space(destination_xy, "NONE")
+                board.set_space(origin_xy, player)
+                if captured:
+                    capturing_moves[(origin, destination)] = tuple(y * 9 + x for x, y in captured)
+        return capturing_moves
+
+    def get_attack_map(self, player=None):
+        """
+        Method that finds the captures one move away for a player: their capturing moves, the opponent's pieces
+        those moves capture, and the player's own pieces the opponent could capture with one move.
+        The last map made is kept with the board hash, game state, and player it is for, so asking again before
+        the position changes (or after moves are undone back to it) doesn't search the moves again.
+        :param player: "BLACK" or "RED", defaults to the active player
+        :return: An AttackMap
+        """
+        if player is None:
+            player = self.get_active_player()
+        key = (self._board.get_hash(), self._game_state, player)
+        if self._attacks is not None and self._attacks[0] == key:
+            return self._attacks[1]
+
+        opponent = "RED" if player == "BLACK" else "BLACK"
+        squares = self._board.get_squares()
+        capturing_moves = self.get_capturing_moves(player)
+        attacked = frozenset(square for captured in capturing_moves.values() for square in captured
+                             if squares[square] == opponent[0])
+        threatened = frozenset(square for captured in self.get_capturing_moves(opponent).values()
+                               for square in captured if squares[square] == player[0])
+        attacks = AttackMap(player, capturing_moves, attacked, threatened)
+        self._attacks = (key, attacks)
+        return attacks
 
     def alg_to_xy(self, alg: str):
         """
@@ -158,27 +1623,26 @@ class HasamiShogiGame:
         :param alg: An algebraic notation for some square: "[a-i]|[A-I][1-9]"
         :return: An (x, y) coordinate tuple for the square
         """
-        if len(alg) != 2:
-            raise InvalidAlgebraicNotation
-
-        row_num = "abcdefghi".find(alg[0].lower())
-        if row_num == -1:
+        index = SQUARE_INDICES.get(alg)
+        if index is None:
             raise InvalidAlgebraicNotation
-
-        try:
-            column_num = int(alg[1]) - 1
-        except ValueError:
-            raise InvalidAlgebraicNotation
-
-        return column_num, row_num
+        return SQUARE_XY[index]
 
     def get_game_state(self):
         """
         Method that returns the game state data member.
-        :return: "UNFINISHED", "RED_WON", or "BLACK_WON"
+        :return: "UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW" (only with a repetition rule, see
+                 set_repetition_rule)
         """
         return self._game_state
 
+    def get_backend(self):
+        """
+        Method that returns the name of the board backend the game was created with.
+        :return: A key of BOARD_BACKENDS
+        """
+        return self._backend
+
     def get_active_player(self):
         """
         Method that returns the active player (which player's turn) data member.
@@ -186,6 +1650,20 @@ class HasamiShogiGame:
         """
         return self._active_player
 
+    def get_position_hash(self):
+        """
+        Method that returns a 64 bit Zobrist hash identifying the current position.
+        The board's part of the hash is updated as pieces are moved and captured, the active player and
+        captured pieces counts are mixed in here.
+        :return: A 64 bit int. Equal positions always have equal hashes
+        """
+        key = (self._board.get_hash() ^
+               _ZOBRIST_CAPTURED_KEYS["RED"][self._captured_by_black] ^
+               _ZOBRIST_CAPTURED_KEYS["BLACK"][self._captured_by_red])
+        if self._active_player == "BLACK":
+            key ^= _ZOBRIST_BLACK_TO_MOVE_KEY
+        return key
+
     def get_num_captured_pieces(self, player: str):
         """
         Method that returns the number of pieces captured pieces of a specified color
@@ -199,6 +1677,23 @@ class HasamiShogiGame:
         else:
             return -1
 
+    def get_ply(self):
+        """
+        Method that returns the number of plies made: the moves that haven't been undone, plus the plies a pickled
+        game had made before it was pickled. Snapshots don't record plies, so a game loaded from one (or given a
+        position with _set_position) counts from 0.
+        :return: Int
+        """
+        return self._earlier_plies + len(self._undo_stack)
+
+    def get_move_history(self):
+        """
+        Method that returns the moves made so far (that haven't been undone), oldest first.
+        :return: List of (encoded move int, number of pieces the move captured) tuples
+        """
+        return [((origin_xy[1] * 9 + origin_xy[0]) * 81 + destination_xy[1] * 9 + destination_xy[0], len(captured))
+                for origin_xy, destination_xy, captured, *_ in self._undo_stack]
+
     def make_move(self, origin: str, destination: str):
         """
         Method that handles every aspect of making a move.
@@ -208,89 +1703,266 @@ class HasamiShogiGame:
         Moves the piece:
             Handles capturing pieces
             Ends the game if enough pieces captured
+            Records the move so it can be taken back with undo_move
+        Prints why a move was rejected, and the game state when the game ends, unless the game is quiet.
         :param origin: Algebraic notation string for the square of the piece making a move
         :param destination: Algebraic notation string for the destination of the move
         :return: True if the move was successful, False otherwise
         """
+        return self._report(self.try_move(origin, destination))
 
-        # Lowercase the origin+destination strings to avoid issues when comparing them later
-        origin = origin.lower()
-        destination = destination.lower()
+    def make_move_encoded(self, move: int):
+        """
+        Method that makes a move given as an encoded int, exactly like make_move but without any notation parsing.
+        :param move: Int origin square index * 81 + destination square index
+        :return: True if the move was successful, False otherwise
+        """
+        return self._report(self.try_move_encoded(move))
 
-        if self.get_game_state() != "UNFINISHED":
-            print("Unable to make move -- Game has concluded")
-            return False
+    def try_move(self, origin: str, destination: str):
+        """
+        Method that makes a move exactly like make_move, but never prints anything.
+        :param origin: Algebraic notation string for the square of the piece making a move
+        :param destination: Algebraic notation string for the destination of the move
+        :return: A MoveResult saying whether the move was made, why not, what it captured, and the game state
+        """
+        if self._game_state != "UNFINISHED":
+            return MoveResult(MoveRejection.GAME_CONCLUDED, [], self._game_state)
 
-        try:
-            origin_xy = self.alg_to_xy(origin)
-        except InvalidAlgebraicNotation:
-            print("Unable to make move -- Origin is not in valid algebraic notation format")
-            return False
+        move = self._parse_move(origin, destination)
+        if type(move) is not int:
+            return MoveResult(move, [], self._game_state)
 
-        try:
-            destination_xy = self.alg_to_xy(destination)
-        except InvalidAlgebraicNotation:
-            print("Unable to make move -- Destination is not in valid algebraic notation format")
-            return False
+        return self.try_move_encoded(move)
 
-        if self.get_square_occupant(origin) != self.get_active_player():
-            print("Unable to make move -- Piece at the origin square is not owned by the active player")
-            return False
+    def _parse_move(self, origin, destination):
+        """
+        Converts a move in algebraic notation to an encoded move.
+        :param origin: Algebraic notation string for the square of the piece making a move
+        :param destination: Algebraic notation string for the destination of the move
+        :return: Int origin square index * 81 + destination square index, or MoveRejection.INVALID_ORIGIN or
+                 MoveRejection.INVALID_DESTINATION if that square isn't valid algebraic notation
+        """
+        origin_index = SQUARE_INDICES.get(origin)
+        if origin_index is None:
+            return MoveRejection.INVALID_ORIGIN
 
-        # Check if origin and destination are the same
-        if origin == destination:
-            print("Unable to make move -- Origin and destination are the same squares")
-            return False
+        destination_index = SQUARE_INDICES.get(destination)
+        if destination_index is None:
+            return MoveRejection.INVALID_DESTINATION
+
+        return origin_index * 81 + destination_index
+
+    def try_move_encoded(self, move: int):
+        """
+        Method that makes a move given as an encoded int exactly like make_move, but never prints anything.
+        :param move: Int origin square index * 81 + destination square index
+        :return: A MoveResult saying whether the move was made, why not, what it captured, and the game state.
+                 Ints outside 0-6560 are rejected with MoveRejection.INVALID_ORIGIN
+        """
+        if self._game_state != "UNFINISHED":
+            return MoveResult(MoveRejection.GAME_CONCLUDED, [], self._game_state)
 
-        # Check if origin and destination are within the same row or column, since the pieces moves by rook rules
-        if origin_xy[0] - destination_xy[0] != 0 and origin_xy[1] - destination_xy[1] != 0:
-            print("Unable to make move -- Origin and destination are not in a line (Pieces move like rooks)")
+        if not 0 <= move < 81 * 81:
+            return MoveResult(MoveRejection.INVALID_ORIGIN, [], self._game_state)
+        origin_xy = SQUARE_XY[MOVE_ORIGINS[move]]
+        destination_xy = SQUARE_XY[MOVE_DESTINATIONS[move]]
+
+        if self._board.get_space(origin_xy) != self._active_player:
+            return MoveResult(MoveRejection.NOT_OWNED, [], self._game_state)
+
+        # Check if origin and destination are different squares within the same row or column,
+        # since the pieces moves by rook rules
+        if not _MOVE_IN_LINE[move]:
+            if origin_xy == destination_xy:
+                return MoveResult(MoveRejection.SAME_SQUARE, [], self._game_state)
+            return MoveResult(MoveRejection.NOT_IN_LINE, [], self._game_state)
+
+        # Check every square between the origin and destination (and the destination itself) for blocking pieces
+        if not self._board.is_path_clear(origin_xy, destination_xy):
+            return MoveResult(MoveRejection.PATH_BLOCKED, [], self._game_state)
+
+        # Move the piece, capture pieces, and pass the turn
+        self._redo_stack = []  # A new move replaces any moves that were undone
+        self._execute_move(origin_xy, destination_xy)
+        captured = [SQUARE_NAMES[xy[1] * 9 + xy[0]] for xy, occupant in self._undo_stack[-1][2]]
+        return MoveResult(None, captured, self._game_state)
+
+    def _report(self, result):
+        """
+        Prints the outcome of a move for make_move, unless the game is quiet.
+        :param result: The MoveResult of the move
+        :return: True if the move was made, False otherwise
+        """
+        if self._quiet:
+            return result.is_success()
+
+        if not result.is_success():
+            print("Unable to make move -- " + result.get_reason().value)
             return False
+        if result.get_game_state() != "UNFINISHED":
+            print(result.get_game_state())
 
-        # Determine direction to iterate down while checking for blocking pieces
-        if origin_xy[0] - destination_xy[0] != 0:  # If moving along the X axis
-            if origin_xy[0] > destination_xy[0]:
-                offset = (-1, 0)  # "LEFT"
-            else:
-                offset = (1, 0)  # "RIGHT"
-        else:  # If moving along the Y axis
-            if origin_xy[1] < destination_xy[1]:
-                offset = (0, 1)  # "DOWN"
-            else:
-                offset = (0, -1)  # "UP"
+        # Turn successfully processed
+        return True
 
-        # Iterate along spaces in a line until either the first blocking piece or destination square is reached
-        current_square_xy = (origin_xy[0] + offset[0], origin_xy[1] + offset[1])
-        while (self._board.get_space(current_square_xy) == "NONE" and
-               current_square_xy != destination_xy):
-            current_square_xy = (current_square_xy[0] + offset[0], current_square_xy[1] + offset[1])
-        if self._board.get_space(current_square_xy) != "NONE":
-            print("Unable to make move -- Movement path is blocked by another piece")
+    def set_quiet(self, quiet):
+        """
+        Method that turns printing in make_move off (True) or back on (False).
+        :param quiet: Bool
+        :return: None
+        """
+        self._quiet = quiet
+
+    def undo_move(self):
+        """
+        Method that takes back the last move made, restoring the board, captured pieces, turn, and game state.
+        Undone moves can be played again with redo_move until a new move is made.
+        :return: True if a move was undone, False if there are no moves to undo
+        """
+        if not self._undo_stack:
+            return False
+        origin_xy, destination_xy = self._unmake_move()
+        self._redo_stack.append((origin_xy, destination_xy))
+        return True
+
+    def redo_move(self):
+        """
+        Method that plays the last undone move again.
+        :return: True if a move was redone, False if there are no undone moves
+        """
+        if not self._redo_stack:
             return False
+        origin_xy, destination_xy = self._redo_stack.pop()
+        self._execute_move(origin_xy, destination_xy)
+        return True
+
+    def _execute_move(self, origin_xy, destination_xy):
+        """
+        Makes a move that is already known to be legal and records it on the undo stack. Does not print anything.
+        Moves the piece, processes captures, ends the game if enough pieces are captured, and passes the turn.
+        :param origin_xy: (x, y) coordinate tuple of the piece making a move
+        :param destination_xy: (x, y) coordinate tuple of the destination of the move
+        :return: None
+        """
+        # Record everything needed to take the move back.
+        # Captured squares keep their previous contents so undo restores them exactly.
+        captured = []
+        self._undo_stack.append((origin_xy, destination_xy, captured, self._active_player, self._game_state,
+                                 self._captured_by_black, self._captured_by_red))
 
         # Move the piece
         self._board.set_space(origin_xy, "NONE")
         self._board.set_space(destination_xy, self.get_active_player())
+        features = self._features
+        if features is not None:
+            features.set_square(origin_xy, 0)
+            features.set_square(destination_xy, _OCCUPANT_CODES[self._active_player])
 
         # Check for and process captures.
         # Even though only 3 directions could have a capture, all can be checked without causing issues.
         for directions in ["LEFT", "RIGHT", "DOWN", "UP"]:
-            self._capture(self._check_sandwiched(destination_xy, directions))
+            capturing = self._check_sandwiched(destination_xy, directions)
+            for squares in capturing:
+                captured.append((squares, self._board.get_space(squares)))
+            self._capture(capturing)
+        if features is not None and features.is_checking():
+            features.verify(self._board.get_squares())
+
+        # Check if the game is over, else end the current active player's turn
+        if not self._check_game_over():
+            if self.get_active_player() == "BLACK":
+                self._active_player = "RED"
+            else:
+                self._active_player = "BLACK"
+
+        if self._position_counts is not None:
+            self._count_position()
 
-        # Check if the game is over
+    def _count_position(self):
+        """
+        Counts the position a move just reached, and ends an unfinished game if the repetition rule says so.
+        Repeating a position too often comes before the ply limit.
+        :return: None
+        """
+        key = self.get_position_hash()
+        count = self._position_counts.get(key, 0) + 1
+        self._position_counts[key] = count
+        if self._game_state != "UNFINISHED":
+            return
+        repetitions, result, max_plies = self._repetition_rule
+        if repetitions is not None and count >= repetitions:
+            # The turn has already passed, so the active player didn't repeat the position and wins a "LOSS"
+            self._game_state = "DRAW" if result == "DRAW" else self._active_player + "_WON"
+        elif max_plies is not None and self.get_ply() >= max_plies:
+            self._game_state = "DRAW"
+
+    def _check_game_over(self):
+        """
+        Ends the game, won by the active player, if either player has captured enough pieces.
+        :return: True if the game is over, False otherwise
+        """
         if self._captured_by_red >= 9 or self._captured_by_black >= 9:
             self._game_state = self.get_active_player() + "_WON"
-            print(self.get_game_state())
             return True
+        return False
 
-        # End the current active player's turn
-        if self.get_active_player() == "BLACK":
-            self._active_player = "RED"
-        else:
-            self._active_player = "BLACK"
+    def _unmake_move(self):
+        """
+        Takes back the last move on the undo stack in O(captures) time. Does not touch the redo stack.
+        :return: The (origin_xy, destination_xy) of the move taken back
+        """
+        counts = self._position_counts
+        if counts is not None:
+            key = self.get_position_hash()
+            if counts[key] > 1:
+                counts[key] -= 1
+            else:
+                del counts[key]
+        (origin_xy, destination_xy, captured, self._active_player, self._game_state,
+         self._captured_by_black, self._captured_by_red) = self._undo_stack.pop()
+        for squares, occupant in reversed(captured):
+            self._board.set_space(squares, occupant)
+        self._board.set_space(destination_xy, "NONE")
+        self._board.set_space(origin_xy, self._active_player)
+        features = self._features
+        if features is not None:
+            for squares, occupant in reversed(captured):
+                features.set_square(squares, _OCCUPANT_CODES[occupant])
+            features.set_square(destination_xy, 0)
+            features.set_square(origin_xy, _OCCUPANT_CODES[self._active_player])
+            if features.is_checking():
+                features.verify(self._board.get_squares())
+        return origin_xy, destination_xy
 
-        # Turn successfully processed
-        return True
+    def get_legal_moves(self, player=None):
+        """
+        Generator that yields every legal move for a player, without trying them through make_move.
+        Moves are (origin, destination) tuples of square indices, SQUARE_NAMES converts them to algebraic notation.
+        :param player: "BLACK" or "RED", defaults to the active player
+        :return: A generator of (origin, destination) square index tuples. Nothing is yielded if the game has ended
+        """
+        if self.get_game_state() != "UNFINISHED":
+            return
+        if player is None:
+            player = self.get_active_player()
+        for origin in self._board.get_pieces(player):
+            for destination in self._board.get_destinations(origin):
+                yield origin, destination
+
+    def get_legal_moves_from(self, square: str):
+        """
+        Generator that yields every legal move for the piece on a single square, for either player.
+        :param square: Algebraic notation string for the square of the piece to move
+        :return: A generator of (origin, destination) square index tuples. Nothing is yielded if the square is
+                 empty or the game has ended
+        """
+        origin_xy = self.alg_to_xy(square)
+        if self.get_game_state() != "UNFINISHED" or self._board.get_space(origin_xy) == "NONE":
+            return
+        origin = origin_xy[1] * 9 + origin_xy[0]
+        for destination in self._board.get_destinations(origin):
+            yield origin, destination
 
     def get_square_occupant(self, square: str):
         """
@@ -300,6 +1972,109 @@ class HasamiShogiGame:
         """
         return self._board.get_space(self.alg_to_xy(square))
 
+    def to_snapshot(self, packed=False):
+        """
+        Method that saves the current position as a snapshot (see the description at the top of the file).
+        The undo and redo stacks are not included.
+        :param packed: True for the 23 byte packed form, False for the FEN-like string
+        :return: A snapshot string, or bytes if packed
+        """
+        if packed:
+            red, black = self._board.get_masks()
+            value = red | black << 81 | GAME_STATES.index(self._game_state) << 163
+            if self._active_player == "BLACK":
+                value |= 1 << 162
+            return value.to_bytes(21, "little") + bytes((self._captured_by_black, self._captured_by_red))
+
+        squares = self._board.get_squares()
+        rows = _EMPTY_RUNS.sub(_empty_run_length, "/".join([squares[y * 9:y * 9 + 9] for y in range(9)]))
+        return "%s %s %d %d %s" % (rows, "b" if self._active_player == "BLACK" else "r",
+                                   self._captured_by_black, self._captured_by_red, self._game_state)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, backend="standard", quiet=False):
+        """
+        Method that creates a game from a snapshot made by to_snapshot.
+        Raises an InvalidSnapshot exception if the snapshot can't be read.
+        :param snapshot: A snapshot string, or packed snapshot bytes
+        :param backend: Name of the board class to use, a key of BOARD_BACKENDS
+        :param quiet: True to stop make_move from printing, see set_quiet
+        :return: A new HasamiShogiGame, with empty undo and redo stacks
+        """
+        game = cls(backend, quiet)
+        if isinstance(snapshot, str):
+            fields = snapshot.split()
+            if len(fields) != 5:
+                raise InvalidSnapshot("A snapshot string needs 5 fields")
+            rows = fields[0].translate(_SNAPSHOT_ROW_CHARACTERS).split("/")
+            squares = "".join(rows)
+            if (len(rows) != 9 or len(squares) != 81 or squares.translate(_SQUARE_CHARACTERS) or
+                    any(len(row) != 9 for row in rows)):
+                raise InvalidSnapshot("Invalid snapshot board: " + fields[0])
+            if fields[1] not in ("b", "r") or fields[4] not in GAME_STATES:
+                raise InvalidSnapshot("Invalid snapshot active player or game state")
+            if not (fields[2].isdigit() and fields[3].isdigit() and int(fields[2]) <= 81 and int(fields[3]) <= 81):
+                raise InvalidSnapshot("Invalid snapshot captured pieces counts")
+            game._board.set_squares(squares)
+            game._active_player = "BLACK" if fields[1] == "b" else "RED"
+            game._captured_by_black = int(fields[2])
+            game._captured_by_red = int(fields[3])
+            game._game_state = fields[4]
+            return game
+
+        game._load_packed_snapshot(snapshot)
+        return game
+
+    def _load_packed_snapshot(self, snapshot):
+        """
+        Replaces the current position with a packed snapshot, for from_snapshot and unpickling.
+        Raises an InvalidSnapshot exception if the snapshot can't be read.
+        :param snapshot: Packed snapshot bytes
+        :return: None
+        """
+        if len(snapshot) != _PACKED_SNAPSHOT_BYTES:
+            raise InvalidSnapshot("A packed snapshot is %d bytes" % _PACKED_SNAPSHOT_BYTES)
+        value = int.from_bytes(snapshot[:21], "little")
+        red = value & ((1 << 81) - 1)
+        black = (value >> 81) & ((1 << 81) - 1)
+        state = (value >> 163) & 3
+        if red & black or state >= len(GAME_STATES) or value >> 165 or snapshot[21] > 81 or snapshot[22] > 81:
+            raise InvalidSnapshot("Invalid packed snapshot")
+        self._board.set_masks(red, black)
+        self._active_player = "BLACK" if value >> 162 & 1 else "RED"
+        self._game_state = GAME_STATES[state]
+        self._captured_by_black = snapshot[21]
+        self._captured_by_red = snapshot[22]
+
+    def _get_position(self):
+        """
+        Gets everything needed to recreate the current position, in a form that is small to pickle.
+        The undo and redo stacks, the repetition rule, and the position counts are not included, pickle the game to
+        keep them.
+        :return: (board, active player, game state, captured by black, captured by red) tuple. The board is a
+                 string of 81 "R", "B", or "." characters in square index order
+        """
+        board = self._board.get_squares()
+        return board, self._active_player, self._game_state, self._captured_by_black, self._captured_by_red
+
+    def _set_position(self, position):
+        """
+        Replaces the current position with one from _get_position, and empties the undo and redo stacks.
+        Raises a ValueError if the game has a repetition rule, since the position has no counts to keep it with.
+        :param position: A tuple returned by _get_position
+        :return: None
+        """
+        if self._repetition_rule is not None:
+            raise ValueError("A position can't be set on a game with a repetition rule, pickle the game instead")
+        board, self._active_player, self._game_state, self._captured_by_black, self._captured_by_red = position
+        self._board.set_squares(board)
+        self._undo_stack = []
+        self._redo_stack = []
+        if self._features is not None:
+            self.set_feature_tracking(True, self._features.is_checking())
+        self._earlier_plies = 0
+        self._earlier_counts = None
+
     def _capture(self, xys):
         """
         Takes a list of squares to be captured, overwriting them with "NONE" and adjusting the captured pieces count.
@@ -308,6 +2083,8 @@ class HasamiShogiGame:
         """
         for squares in xys:
             self._board.set_space(squares, "NONE")
+            if self._features is not None:
+                self._features.set_square(squares, 0)
             if self.get_active_player() == "BLACK":
                 self._captured_by_black += 1
             elif self.get_active_player() == "RED":
@@ -320,45 +2097,13 @@ class HasamiShogiGame:
         :param direction: Direction that should be checked in, either "UP", "DOWN", "LEFT", or "RIGHT"
         :return: List of (x, y)s for pieces that should be captured)
         """
-
-        # The board is traversed by adding the current square's (x, y) to an offset.
-        offsets = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-
-        if direction == "UP":
-            offset = offsets[0]
-        elif direction == "DOWN":
-            offset = offsets[1]
-        elif direction == "LEFT":
-            offset = offsets[2]
-        elif direction == "RIGHT":
-            offset = offsets[3]
-        else:
+        if direction not in DIRECTION_OFFSETS:
             return []
+        return self._board.get_sandwiched(origin, direction, self.get_active_player())
 
-        capturing = []
-        current_square_xy = (origin[0] + offset[0], origin[1] + offset[1])
-
-        if self._board.is_corner(current_square_xy) is True:  # Check for corner capturing if corner
-            # Check all spaces around a corner piece (Including spaces off the board, since those return "NONE")
-            # If it has 2 of the active player's pieces next to it, its surrounded
-            sandwichers = 0
-            for offsets in offsets:
-                checking = (current_square_xy[0] + offsets[0], current_square_xy[1] + offsets[1])
-                if self._board.get_space(checking) == self.get_active_player():
-                    sandwichers += 1
-            if sandwichers == 2:
-                capturing.append(current_square_xy)
-        else:  # If not a corner, check for sandwiches in a line
-            # Iterate down a line until the first "NONE" or active player's piece. Add all squares checked to capturing
-            while (self._board.get_space(current_square_xy) != "NONE" and
-                   self._board.get_space(current_square_xy) != self.get_active_player()):
-                capturing.append(current_square_xy)
-                current_square_xy = (current_square_xy[0] + offset[0], current_square_xy[1] + offset[1])
-            # If the line didn't end with a piece of the active player, the piece isn't sandwiched
-            if self._board.get_space(current_square_xy) != self.get_active_player():
-                capturing = []
 
-        return capturing
+# Board classes that can be selected when constructing a HasamiShogiGame
+BOARD_BACKENDS = {"standard": Board, "bitboard": BitBoard, "lines": LineBoard}
 
 
 def main():
@@ -4,10 +4,21 @@
 
 import unittest
 import unittest.mock
+import copy
 import io
+import pickle
 import sys
+import random
+from HasamiShogiGame import Board as Board
+from HasamiShogiGame import BitBoard as BitBoard
 from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import LineBoard as LineBoard
 from HasamiShogiGame import InvalidAlgebraicNotation as InvalidAlgebraicNotation
+from HasamiShogiGame import InvalidSnapshot as InvalidSnapshot
+from HasamiShogiGame import SQUARE_NAMES as SQUARE_NAMES
+from HasamiShogiGame import MoveRejection as MoveRejection
+from HasamiShogiGame import encode_move as encode_move
+from HasamiShogiGame import decode_move as decode_move
 
 
 def setup_board(game, reds, blacks, nones):
@@ -22,48 +33,56 @@ def setup_board(game, reds, blacks, nones):
 class Test_alg_to_xy(unittest.TestCase):
     """Contains unit tests for the HasamiShogiGame.alg_to_xy() method."""
 
+    backend = "standard"
+
     def test1(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         self.assertEqual((0, 0), game.alg_to_xy("a1"))
 
     def test2(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         self.assertEqual((8, 8), game.alg_to_xy("i9"))
 
     def test3(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         self.assertEqual((6, 5), game.alg_to_xy("f7"))
 
     def test4(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         with self.assertRaises(InvalidAlgebraicNotation):
             game.alg_to_xy("")
 
     def test5(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         with self.assertRaises(InvalidAlgebraicNotation):
             game.alg_to_xy("l4")
 
     def test6(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         with self.assertRaises(InvalidAlgebraicNotation):
             game.alg_to_xy("55")
 
     def test7(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
         with self.assertRaises(InvalidAlgebraicNotation):
             game.alg_to_xy("i88")
 
+    def test8(self):
+        game = HasamiShogiGame(self.backend)
+        with self.assertRaises(InvalidAlgebraicNotation):
+            game.alg_to_xy("a0")
+
 
 class Test__check_sandwiched(unittest.TestCase):
     """Contains unit tests for the HasamiShogiGame._check_sandwiched method."""
 
+    backend = "standard"
     directions = ["UP", "DOWN", "LEFT", "RIGHT"]
 
     # Tests 1-6: Straight line captures in every direction, with 1-8 pieces captured
 
     def test1(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["e1", "e3"]  # Squares to fill with a red piece
         blacks = ["e2"]  # Squares to fill with a black piece
@@ -87,7 +106,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test2(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["e1", "e4"]  # Squares to fill with a red piece
         blacks = ["e2", "e3"]  # Squares to fill with a black piece
@@ -111,7 +130,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test3(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["e1", "e9"]  # Squares to fill with a red piece
         blacks = ["e2", "e3", "e4", "e5", "e6", "e7", "e8"]  # Squares to fill with a black piece
@@ -135,7 +154,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test4(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["e1", "e3"]  # Squares to fill with a red piece
         blacks = ["e2"]  # Squares to fill with a black piece
@@ -159,7 +178,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test5(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["f2", "d2"]  # Squares to fill with a red piece
         blacks = ["e2"]  # Squares to fill with a black piece
@@ -183,7 +202,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test6(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["f2", "d2"]  # Squares to fill with a red piece
         blacks = ["e2"]  # Squares to fill with a black piece
@@ -209,7 +228,7 @@ class Test__check_sandwiched(unittest.TestCase):
     # Tests 7-9 : Straight line non-captures
 
     def test7(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["d2"]  # Squares to fill with a red piece
         blacks = ["e2"]  # Squares to fill with a black piece
@@ -233,7 +252,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test8(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["e3"]  # Squares to fill with a red piece
         blacks = ["e2", "e1"]  # Squares to fill with a black piece
@@ -257,7 +276,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test9(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["e4"]  # Squares to fill with a red piece
         blacks = ["e3", "e2"]  # Squares to fill with a black piece
@@ -283,7 +302,7 @@ class Test__check_sandwiched(unittest.TestCase):
     # Tests 10-13: Corner captures
 
     def test10(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = ["a8", "b9"]  # Squares to fill with a black piece
@@ -307,7 +326,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test11(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = ["a8", "b9"]  # Squares to fill with a black piece
@@ -331,7 +350,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test12(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["h1", "i2"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -355,7 +374,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test13(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["h1", "i2"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -381,7 +400,7 @@ class Test__check_sandwiched(unittest.TestCase):
     # Tests 14- : Corner non-captures
 
     def test14(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["h1"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -405,7 +424,7 @@ class Test__check_sandwiched(unittest.TestCase):
         self.assertEqual(captures_xy, returned_captures_xy)
 
     def test15(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["h1"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -432,9 +451,11 @@ class Test__check_sandwiched(unittest.TestCase):
 class Test_make_move(unittest.TestCase):
     """Contains unit tests for the HasamiShogiGame.make_move() method."""
 
+    backend = "standard"
+
     # Making move while the game has concluded
     def test1(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -462,7 +483,7 @@ class Test_make_move(unittest.TestCase):
 
     # Making move with invalid alg notation origin
     def test2(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -488,7 +509,7 @@ class Test_make_move(unittest.TestCase):
 
     # Making move with invalid alg notation destination
     def test3(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -514,7 +535,7 @@ class Test_make_move(unittest.TestCase):
 
     # Making move with wrong player's piece
     def test4(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -539,7 +560,7 @@ class Test_make_move(unittest.TestCase):
 
     # Making move with same origin and destination
     def test5(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -565,7 +586,7 @@ class Test_make_move(unittest.TestCase):
 
     # Making move that violates rook movement rules
     def test6(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -591,7 +612,7 @@ class Test_make_move(unittest.TestCase):
 
     # Test 7-10: Making move that is blocked by piece of same color
     def test7(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["c7"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -616,7 +637,7 @@ class Test_make_move(unittest.TestCase):
         self.assertEqual(expected_console_output, captured_console_output.getvalue().rstrip('\n'))
 
     def test8(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["b7"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -641,7 +662,7 @@ class Test_make_move(unittest.TestCase):
         self.assertEqual(expected_console_output, captured_console_output.getvalue().rstrip('\n'))
 
     def test9(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = ["c7"]  # Squares to fill with a black piece
@@ -666,7 +687,7 @@ class Test_make_move(unittest.TestCase):
         self.assertEqual(expected_console_output, captured_console_output.getvalue().rstrip('\n'))
 
     def test10(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = []  # Squares to fill with a red piece
         blacks = ["c7"]  # Squares to fill with a black piece
@@ -692,7 +713,7 @@ class Test_make_move(unittest.TestCase):
 
     # Test 11-13: Making move that captures pieces
     def test11(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["c8"]  # Squares to fill with a red piece
         blacks = ["c7"]  # Squares to fill with a black piece
@@ -710,7 +731,7 @@ class Test_make_move(unittest.TestCase):
         self.assertEqual(expected_captured_pieces, game.get_num_captured_pieces(game.get_active_player()))
 
     def test12(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["c8", "c3"]  # Squares to fill with a red piece
         blacks = ["c7", "c5", "c4"]  # Squares to fill with a black piece
@@ -728,7 +749,7 @@ class Test_make_move(unittest.TestCase):
         self.assertEqual(expected_captured_pieces, game.get_num_captured_pieces(game.get_active_player()))
 
     def test13(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["i2", "e1", "h5"]  # Squares to fill with a red piece
         blacks = ["g1", "f1"]  # Squares to fill with a black piece
@@ -747,7 +768,7 @@ class Test_make_move(unittest.TestCase):
 
     # Test that the game ends upon reaching 9 pieces captured
     def test14(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         reds = ["i1"]  # Squares to fill with a red piece
         blacks = []  # Squares to fill with a black piece
@@ -767,7 +788,7 @@ class Test_make_move(unittest.TestCase):
 
     # Test that the active player is changed back and forth after a successful move
     def test15(self):
-        game = HasamiShogiGame()
+        game = HasamiShogiGame(self.backend)
 
         self.assertTrue(game.make_move("i5", "h5"))
         self.assertTrue(game.make_move("a9", "h9"))
@@ -777,5 +798,901 @@ class Test_make_move(unittest.TestCase):
         self.assertEqual("BLACK", game.get_active_player())
 
 
+class Test_get_legal_moves(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.get_legal_moves() and get_legal_moves_from() methods."""
+
+    backend = "standard"
+
+    def test1(self):
+        # Every piece in the starting position can move forward 7 squares and nowhere else
+        game = HasamiShogiGame(self.backend)
+        self.assertEqual(63, len(list(game.get_legal_moves())))
+        self.assertEqual(63, len(list(game.get_legal_moves("RED"))))
+
+    def test2(self):
+        game = HasamiShogiGame(self.backend)
+
+        reds = ["e5"]  # Squares to fill with a red piece
+        blacks = ["e7"]  # Squares to fill with a black piece
+        nones = []  # Squares to remove pieces from
+
+        setup_board(game, reds, blacks, nones)
+
+        moves = {(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+                 for origin, destination in game.get_legal_moves_from("e5")}
+        expected_moves = {("e5", square) for square in ["b5", "c5", "d5", "f5", "g5", "h5",
+                                                         "e1", "e2", "e3", "e4", "e6"]}
+        self.assertEqual(expected_moves, moves)
+
+    def test3(self):
+        # No moves from an empty square or once the game has concluded
+        game = HasamiShogiGame(self.backend)
+        self.assertEqual([], list(game.get_legal_moves_from("e5")))
+        game._game_state = "RED_WON"
+        self.assertEqual([], list(game.get_legal_moves()))
+        self.assertEqual([], list(game.get_legal_moves_from("a1")))
+
+    def test4(self):
+        # The generated moves are exactly the moves make_move accepts
+        rng = random.Random(20)
+        game = HasamiShogiGame(self.backend)
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            for moves in range(30):
+                generated = set(game.get_legal_moves())
+                accepted = set()
+                for origin in range(81):
+                    if game.get_square_occupant(SQUARE_NAMES[origin]) != game.get_active_player():
+                        continue  # make_move rejects every move from this square
+                    for destination in range(81):
+                        if game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination]):
+                            accepted.add((origin, destination))
+                            game.undo_move()
+                self.assertEqual(accepted, generated)
+                origin, destination = rng.choice(sorted(generated))
+                game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+
+
+class Test_undo_move(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.undo_move() and redo_move() methods."""
+
+    backend = "standard"
+
+    def board_contents(self, game):
+        return [game.get_square_occupant(square) for square in SQUARE_NAMES]
+
+    def game_contents(self, game):
+        return (self.board_contents(game), game.get_active_player(), game.get_game_state(),
+                game.get_num_captured_pieces("RED"), game.get_num_captured_pieces("BLACK"))
+
+    def test1(self):
+        game = HasamiShogiGame(self.backend)
+        self.assertFalse(game.undo_move())
+        self.assertFalse(game.redo_move())
+
+    def test2(self):
+        # Undoing every move of a random game returns to the start, and redoing them returns to the end
+        rng = random.Random(7)
+        game = HasamiShogiGame(self.backend)
+        history = [self.game_contents(game)]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            while game.get_game_state() == "UNFINISHED" and len(history) < 300:
+                origin, destination = rng.choice(list(game.get_legal_moves()))
+                self.assertTrue(game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination]))
+                history.append(self.game_contents(game))
+        for contents in reversed(history[:-1]):
+            self.assertTrue(game.undo_move())
+            self.assertEqual(contents, self.game_contents(game))
+        self.assertFalse(game.undo_move())
+        for contents in history[1:]:
+            self.assertTrue(game.redo_move())
+            self.assertEqual(contents, self.game_contents(game))
+        self.assertFalse(game.redo_move())
+
+    def test3(self):
+        # Undoing the winning move restores the captured pieces and reopens the game
+        game = HasamiShogiGame(self.backend)
+
+        reds = ["i1"]  # Squares to fill with a red piece
+        blacks = []  # Squares to fill with a black piece
+        nones = ["i9"]  # Squares to remove pieces from
+        game._captured_by_red = 2
+        game._active_player = "RED"
+
+        setup_board(game, reds, blacks, nones)
+        before = self.game_contents(game)
+
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            game.make_move("a9", "i9")
+        self.assertEqual("RED_WON", game.get_game_state())
+        self.assertTrue(game.undo_move())
+        self.assertEqual(before, self.game_contents(game))
+
+    def test4(self):
+        # Making a new move discards the undone moves
+        game = HasamiShogiGame(self.backend)
+        self.assertTrue(game.make_move("i5", "h5"))
+        self.assertTrue(game.undo_move())
+        self.assertTrue(game.make_move("i4", "h4"))
+        self.assertFalse(game.redo_move())
+        self.assertEqual("NONE", game.get_square_occupant("h5"))
+
+
+class Test_get_position_hash(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.get_position_hash() method."""
+
+    backend = "standard"
+
+    def test1(self):
+        # The same position reached through different move orders has the same hash
+        game1 = HasamiShogiGame(self.backend)
+        game2 = HasamiShogiGame(self.backend)
+        for origin, destination in [("i5", "h5"), ("a6", "b6"), ("i4", "h4"), ("a7", "b7")]:
+            game1.make_move(origin, destination)
+        for origin, destination in [("i4", "h4"), ("a7", "b7"), ("i5", "h5"), ("a6", "b6")]:
+            game2.make_move(origin, destination)
+        self.assertEqual(game1.get_position_hash(), game2.get_position_hash())
+        self.assertNotEqual(HasamiShogiGame(self.backend).get_position_hash(), game1.get_position_hash())
+
+    def test2(self):
+        # The side to move is part of the hash
+        game = HasamiShogiGame(self.backend)
+        start_hash = game.get_position_hash()
+        game._active_player = "RED"
+        self.assertNotEqual(start_hash, game.get_position_hash())
+
+    def test3(self):
+        # The incrementally updated hash matches one computed from scratch, and undo restores earlier hashes
+        rng = random.Random(4)
+        game = HasamiShogiGame(self.backend)
+        hashes = [game.get_position_hash()]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            while game.get_game_state() == "UNFINISHED" and len(hashes) < 300:
+                origin, destination = rng.choice(list(game.get_legal_moves()))
+                game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+                self.assertEqual(game._board.compute_hash(), game._board.get_hash())
+                hashes.append(game.get_position_hash())
+        for position_hash in reversed(hashes[:-1]):
+            game.undo_move()
+            self.assertEqual(position_hash, game.get_position_hash())
+
+    def test4(self):
+        # Both board backends hash positions the same way
+        game = HasamiShogiGame(self.backend)
+        other_game = HasamiShogiGame("bitboard" if self.backend == "standard" else "standard")
+        for origin, destination in [("i5", "h5"), ("a9", "b9"), ("i4", "h4")]:
+            game.make_move(origin, destination)
+            other_game.make_move(origin, destination)
+        self.assertEqual(game.get_position_hash(), other_game.get_position_hash())
+
+
+class Test__get_position(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame._get_position() and _set_position() methods."""
+
+    backend = "standard"
+
+    def test1(self):
+        game = HasamiShogiGame(self.backend)
+        game.make_move("i5", "c5")
+        game.make_move("a9", "b9")
+        position = game._get_position()
+
+        other_game = HasamiShogiGame("bitboard" if self.backend == "standard" else "standard")
+        other_game._set_position(position)
+        self.assertEqual(position, other_game._get_position())
+        self.assertEqual(game.get_position_hash(), other_game.get_position_hash())
+        self.assertFalse(other_game.undo_move())
+
+    # A position has no repetition counts, so it can't replace the position of a game with a repetition rule
+    def test2(self):
+        game = HasamiShogiGame(self.backend)
+        game.set_repetition_rule(3)
+        with self.assertRaises(ValueError):
+            game._set_position(HasamiShogiGame(self.backend)._get_position())
+        self.assertEqual(3, game.get_repetition_rule()[0])
+
+
+class Test_try_move(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.try_move() method and quiet games."""
+
+    backend = "standard"
+
+    # Every rejection reason, matching the checks in make_move
+    def test1(self):
+        game = HasamiShogiGame(self.backend)
+        game.make_move("i7", "c7")
+        rejected_moves = [("i22", "h2", MoveRejection.INVALID_ORIGIN),
+                          ("i2", "h22", MoveRejection.INVALID_DESTINATION),
+                          ("i2", "h2", MoveRejection.NOT_OWNED),
+                          ("a7", "a7", MoveRejection.SAME_SQUARE),
+                          ("a7", "b6", MoveRejection.NOT_IN_LINE),
+                          ("a7", "e7", MoveRejection.PATH_BLOCKED)]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            for origin, destination, reason in rejected_moves:
+                result = game.try_move(origin, destination)
+                self.assertFalse(result.is_success())
+                self.assertEqual(reason, result.get_reason())
+                self.assertEqual([], result.get_captured())
+            game._game_state = "BLACK_WON"
+            self.assertEqual(MoveRejection.GAME_CONCLUDED, game.try_move("a1", "b1").get_reason())
+        self.assertEqual("", stdout.getvalue())
+
+    # A successful move reports its captures and the new game state
+    def test2(self):
+        game = HasamiShogiGame(self.backend)
+
+        reds = ["i1"]  # Squares to fill with a red piece
+        blacks = []  # Squares to fill with a black piece
+        nones = ["i9"]  # Squares to remove pieces from
+        game._captured_by_red = 2
+        game._active_player = "RED"
+
+        setup_board(game, reds, blacks, nones)
+
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            result = game.try_move("A9", "I9")
+        self.assertTrue(result.is_success())
+        self.assertIsNone(result.get_reason())
+        self.assertEqual(["i8", "i7", "i6", "i5", "i4", "i3", "i2"], result.get_captured())
+        self.assertEqual("RED_WON", result.get_game_state())
+        self.assertEqual("", stdout.getvalue())
+
+    # A quiet game's make_move never prints
+    def test3(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertFalse(game.make_move("a1", "b1"))
+            self.assertTrue(game.make_move("i1", "b1"))
+            game.set_quiet(False)
+            self.assertFalse(game.make_move("a1", "a1"))
+        self.assertEqual("Unable to make move -- Origin and destination are the same squares\n", stdout.getvalue())
+
+
+class Test_make_move_encoded(unittest.TestCase):
+    """Contains unit tests for encoded moves and the HasamiShogiGame.make_move_encoded() method."""
+
+    backend = "standard"
+
+    def test1(self):
+        self.assertEqual(0, encode_move("a1", "a1"))
+        self.assertEqual(80 * 81 + 8, encode_move("I9", "a9"))
+        self.assertEqual(("i9", "a9"), decode_move(80 * 81 + 8))
+        with self.assertRaises(InvalidAlgebraicNotation):
+            encode_move("a0", "a1")
+        for move in range(81 * 81):
+            self.assertEqual(move, encode_move(*decode_move(move)))
+
+    # Encoded moves are accepted and rejected exactly like the same moves in algebraic notation
+    def test2(self):
+        rng = random.Random(12)
+        game = HasamiShogiGame(self.backend, quiet=True)
+        encoded_game = HasamiShogiGame(self.backend, quiet=True)
+        for moves in range(2000):
+            move = rng.randrange(81 * 81)
+            result = game.try_move(*decode_move(move))
+            encoded_result = encoded_game.try_move_encoded(move)
+            self.assertEqual(result.get_reason(), encoded_result.get_reason())
+            self.assertEqual(result.get_captured(), encoded_result.get_captured())
+        self.assertEqual(game._get_position(), encoded_game._get_position())
+
+    def test3(self):
+        game = HasamiShogiGame(self.backend)
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertTrue(game.make_move_encoded(encode_move("i5", "h5")))
+            self.assertFalse(game.make_move_encoded(81 * 81))
+            self.assertFalse(game.make_move_encoded(-1))
+        self.assertEqual("RED", game.get_active_player())
+        self.assertEqual("Unable to make move -- Origin is not in valid algebraic notation format\n" * 2,
+                         stdout.getvalue())
+
+    # The move history lists the moves made with how many pieces each captured, and forgets undone moves
+    def test4(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        for origin, destination in [("i1", "b1"), ("a3", "c3"), ("i8", "h8"), ("c3", "c1")]:
+            game.try_move(origin, destination)
+        self.assertEqual([(encode_move("i1", "b1"), 0), (encode_move("a3", "c3"), 0),
+                          (encode_move("i8", "h8"), 0), (encode_move("c3", "c1"), 1)], game.get_move_history())
+        game.undo_move()
+        self.assertEqual(3, len(game.get_move_history()))
+
+
+class Test_to_snapshot(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.to_snapshot() and from_snapshot() methods."""
+
+    backend = "standard"
+
+    def test1(self):
+        game = HasamiShogiGame(self.backend)
+        self.assertEqual("RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB b 0 0 UNFINISHED", game.to_snapshot())
+        self.assertEqual(23, len(game.to_snapshot(packed=True)))
+
+    # Both forms restore the same position, hash, and legal moves, over random games
+    def test2(self):
+        rng = random.Random(14)
+        game = HasamiShogiGame(self.backend, quiet=True)
+        for moves in range(600):
+            if game.get_game_state() != "UNFINISHED":
+                game = HasamiShogiGame(self.backend, quiet=True)
+            for snapshot in [game.to_snapshot(), game.to_snapshot(packed=True)]:
+                loaded = HasamiShogiGame.from_snapshot(snapshot, self.backend)
+                self.assertEqual(game._get_position(), loaded._get_position())
+                self.assertEqual(game.get_position_hash(), loaded.get_position_hash())
+                self.assertEqual(loaded._board.compute_hash(), loaded._board.get_hash())
+                self.assertEqual(list(game.get_legal_moves()), list(loaded.get_legal_moves()))
+            move = rng.choice(list(game.get_legal_moves()))
+            game.try_move_encoded(move[0] * 81 + move[1])
+
+    def test3(self):
+        game = HasamiShogiGame.from_snapshot("4R4/9/2BB5/9/9/9/9/9/R7B r 5 8 BLACK_WON", self.backend)
+        self.assertEqual("RED", game.get_square_occupant("a5"))
+        self.assertEqual("BLACK", game.get_square_occupant("c4"))
+        self.assertEqual("RED", game.get_square_occupant("i1"))
+        self.assertEqual("NONE", game.get_square_occupant("i2"))
+        self.assertEqual("RED", game.get_active_player())
+        self.assertEqual(5, game.get_num_captured_pieces("RED"))
+        self.assertEqual(8, game.get_num_captured_pieces("BLACK"))
+        self.assertEqual("BLACK_WON", game.get_game_state())
+        self.assertFalse(game.undo_move())
+
+    # Snapshots that can't be read
+    def test4(self):
+        for snapshot in ["", "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB b 0 0",
+                         "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBB b 0 0 UNFINISHED",
+                         "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBBB b 0 0 UNFINISHED",
+                         "RRRRRRRRR/9/9/9/9/9/9/9/9/BBBBBBBBB b 0 0 UNFINISHED",
+                         "RRRRRRRRX/9/9/9/9/9/9/9/BBBBBBBBB b 0 0 UNFINISHED",
+                         "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB w 0 0 UNFINISHED",
+                         "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB b -1 0 UNFINISHED",
+                         "RRRRRRRRR/9/9/9/9/9/9/9/BBBBBBBBB b 0 0 STALEMATE",
+                         bytes(22), b"\x01" + bytes(9) + b"\x02" + bytes(12), bytes(20) + b"\xff\x00\x00"]:
+            with self.assertRaises(InvalidSnapshot):
+                HasamiShogiGame.from_snapshot(snapshot, self.backend)
+
+
+class Test_clone(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.clone() method and pickling."""
+
+    backend = "standard"
+
+    def played_game(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        for origin, destination in [("i5", "e5"), ("a5", "d5"), ("i4", "d4"), ("a9", "b9"), ("i6", "d6")]:
+            self.assertTrue(game.make_move(origin, destination))
+        return game
+
+    # A clone is in the same position, and moves on it don't touch the original
+    def test1(self):
+        game = self.played_game()
+        clone = game.clone()
+        self.assertEqual(game.to_snapshot(), clone.to_snapshot())
+        self.assertEqual(game.get_position_hash(), clone.get_position_hash())
+        self.assertEqual(game.get_move_history(), clone.get_move_history())
+        self.assertEqual(1, clone.get_num_captured_pieces("RED"))
+        snapshot = game.to_snapshot()
+        self.assertTrue(clone.make_move("a1", "c1"))
+        self.assertTrue(clone.undo_move())
+        self.assertTrue(clone.undo_move())
+        self.assertEqual(snapshot, game.to_snapshot())
+        self.assertEqual(5, len(game.get_move_history()))
+        self.assertEqual(0, clone.get_num_captured_pieces("RED"))
+        self.assertEqual(self.backend, clone.get_backend())
+        self.assertFalse(hasattr(game, "__dict__"))
+        self.assertFalse(hasattr(game._board, "__dict__"))
+
+    def test2(self):
+        game = self.played_game()
+        for copied in (copy.copy(game), copy.deepcopy(game)):
+            self.assertEqual(game.to_snapshot(), copied.to_snapshot())
+            self.assertEqual(game.get_move_history(), copied.get_move_history())
+            copied.make_move("a1", "c1")
+            self.assertEqual("RED", game.get_active_player())
+
+    # Pickling sends the position in a few dozen bytes, without the undo and redo stacks
+    def test3(self):
+        game = self.played_game()
+        data = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+        self.assertLess(len(data), 100)
+        loaded = pickle.loads(data)
+        self.assertEqual(game.to_snapshot(), loaded.to_snapshot())
+        self.assertEqual(game.get_position_hash(), loaded.get_position_hash())
+        self.assertEqual(self.backend, loaded.get_backend())
+        self.assertEqual([], loaded.get_move_history())
+        self.assertEqual(len(game.get_move_history()), loaded.get_ply())
+        self.assertTrue(loaded.make_move("a1", "c1"))
+        self.assertEqual(game.get_ply() + 1, loaded.get_ply())
+        self.assertEqual(game.to_snapshot(), pickle.loads(pickle.dumps(game, protocol=0)).to_snapshot())
+
+
+class Test_get_features(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.get_features() method and feature tracking."""
+
+    backend = "standard"
+
+    def test1(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        expected = {"pieces": 9, "mobility": 63, "threatened": 0}
+        self.assertEqual({"RED": expected, "BLACK": expected}, game.get_features())
+        game.set_feature_tracking(True)
+        self.assertTrue(game.is_tracking_features())
+        self.assertEqual({"RED": expected, "BLACK": expected}, game.get_features())
+
+        # The black piece on e5 blocks red's a5 piece, then red's piece on d5 and black's on e5 each have an
+        # empty square on their other side
+        game.make_move("i5", "e5")
+        self.assertEqual({"pieces": 9, "mobility": 59, "threatened": 0}, game.get_features()["RED"])
+        self.assertEqual(0, game.get_features()["BLACK"]["threatened"])
+        game.make_move("a5", "d5")
+        features = {"RED": {"pieces": 9, "mobility": 69, "threatened": 1},
+                    "BLACK": {"pieces": 9, "mobility": 70, "threatened": 1}}
+        self.assertEqual(features, game.get_features())
+        game.set_feature_tracking(False)
+        self.assertFalse(game.is_tracking_features())
+        self.assertEqual(features, game.get_features())
+
+    # Tracked features match the board through random games with captures and undos
+    def test2(self):
+        rng = random.Random(5)
+        for number in range(3):
+            game = HasamiShogiGame(self.backend, quiet=True)
+            game.set_feature_tracking(True, check=True)
+            while game.get_game_state() == "UNFINISHED" and len(game.get_move_history()) < 150:
+                moves = list(game.get_legal_moves())
+                for player in ("RED", "BLACK"):
+                    self.assertEqual(game.get_mobility(player), game.get_features()[player]["mobility"])
+                self.assertEqual(len(moves), game.get_mobility(game.get_active_player()))
+                origin, destination = rng.choice(moves)
+                game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+                if rng.random() < 0.2:
+                    game.undo_move()
+            while game.undo_move():
+                pass
+            self.assertEqual(HasamiShogiGame(self.backend, quiet=True).get_features(), game.get_features())
+
+    # Check mode catches features that stopped matching the board
+    def test3(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_feature_tracking(True, check=True)
+        game._board.set_space((4, 4), "RED")
+        with self.assertRaises(AssertionError):
+            game.make_move("i1", "h1")
+
+    # Clones and pickles keep tracking
+    def test4(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_feature_tracking(True, check=True)
+        game.make_move("i5", "e5")
+        for copied in (game.clone(), pickle.loads(pickle.dumps(game))):
+            self.assertTrue(copied.is_tracking_features())
+            self.assertTrue(copied._features.is_checking())
+            copied.make_move("a5", "d5")
+            self.assertEqual(59, game.get_mobility("RED"))
+            self.assertEqual(69, copied.get_mobility("RED"))
+            self.assertEqual(1, copied.get_features()["BLACK"]["threatened"])
+
+    # A corner piece is threatened while one neighbor holds an opponent's piece and the other is empty, even when
+    # no opponent's piece can reach the empty square
+    def test5(self):
+        game = HasamiShogiGame.from_snapshot("8B/8R/9/9/9/9/9/9/4B4 r 0 0 UNFINISHED", self.backend, quiet=True)
+        game.set_feature_tracking(True, check=True)
+        self.assertEqual(1, game.get_features()["BLACK"]["threatened"])
+        self.assertEqual(frozenset(), game.get_attack_map("BLACK").get_threatened())
+        game.make_move("b9", "b8")
+        self.assertEqual(0, game.get_features()["BLACK"]["threatened"])
+        game.undo_move()
+        self.assertEqual(1, game.get_features()["BLACK"]["threatened"])
+
+
+class Test_get_attack_map(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.get_capturing_moves() and get_attack_map() methods."""
+
+    backend = "standard"
+
+    # Red captures e5 with a6e6 and the a9 corner with c9b9, black captures a8 with i7a7
+    def test1(self):
+        game = HasamiShogiGame.from_snapshot("5R1RB/9/8R/9/3RB4/9/9/9/6B2 r 0 0 UNFINISHED", self.backend, quiet=True)
+        position_hash = game.get_position_hash()
+        self.assertEqual({(5, 41): (40,), (26, 17): (8,)}, game.get_capturing_moves())
+        self.assertEqual({(78, 6): (7,)}, game.get_capturing_moves("BLACK"))
+        attacks = game.get_attack_map()
+        self.assertEqual("RED", attacks.get_player())
+        self.assertEqual(game.get_capturing_moves(), attacks.get_capturing_moves())
+        self.assertEqual({40, 8}, attacks.get_attacked())
+        self.assertEqual({7}, attacks.get_threatened())
+        self.assertIs(attacks, game.get_attack_map("RED"))
+        self.assertEqual({8, 40}, game.get_attack_map("BLACK").get_threatened())
+        self.assertEqual(position_hash, game.get_position_hash())
+
+        # The map is found again once the position changes
+        game.make_move("a6", "e6")
+        self.assertEqual({8}, game.get_attack_map("BLACK").get_threatened())
+        game.undo_move()
+        self.assertEqual({7}, game.get_attack_map("RED").get_threatened())
+
+    # An empty corner counts as captured, like in make_move, but isn't anyone's piece
+    def test2(self):
+        game = HasamiShogiGame.from_snapshot("1R7/9/R8/9/9/9/9/9/B8 r 0 0 UNFINISHED", self.backend, quiet=True)
+        self.assertEqual({(18, 9): (0,)}, game.get_capturing_moves())
+        self.assertEqual(["a1"], game.try_move("c1", "b1").get_captured())
+        game.undo_move()
+        self.assertEqual(set(), game.get_attack_map().get_attacked())
+        game = HasamiShogiGame.from_snapshot("1R7/B8/9/9/9/9/9/9/9 b 8 0 BLACK_WON", self.backend, quiet=True)
+        self.assertEqual({}, game.get_capturing_moves())
+
+    # The capturing moves are the moves that capture when they are made, through random games
+    def test3(self):
+        rng = random.Random(11)
+        for number in range(3):
+            game = HasamiShogiGame(self.backend, quiet=True)
+            while game.get_game_state() == "UNFINISHED" and len(game.get_move_history()) < 150:
+                moves = list(game.get_legal_moves())
+                expected = {}
+                for origin, destination in moves:
+                    captured = game.try_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination]).get_captured()
+                    if captured:
+                        expected[(origin, destination)] = tuple(SQUARE_NAMES.index(square) for square in captured)
+                    game.undo_move()
+                self.assertEqual(expected, game.get_capturing_moves())
+                origin, destination = rng.choice(moves)
+                game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+
+
+class Test_set_repetition_rule(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiGame.set_repetition_rule() method."""
+
+    backend = "standard"
+
+    # Moves that lead back to the starting position
+    shuffle = [("i2", "h2"), ("a2", "b2"), ("h2", "i2"), ("b2", "a2")]
+
+    def play(self, game, moves):
+        for origin, destination in moves:
+            self.assertTrue(game.make_move(origin, destination))
+
+    # The third time the starting position is reached is a draw, until the move is undone
+    def test1(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_repetition_rule(3)
+        self.assertEqual((3, "DRAW", None), game.get_repetition_rule())
+        self.assertEqual(1, game.get_repetition_count())
+        self.play(game, self.shuffle)
+        self.assertEqual(2, game.get_repetition_count())
+        self.assertEqual("UNFINISHED", game.get_game_state())
+        self.play(game, self.shuffle)
+        self.assertEqual(3, game.get_repetition_count())
+        self.assertEqual("DRAW", game.get_game_state())
+        self.assertEqual(MoveRejection.GAME_CONCLUDED, game.try_move("i2", "h2").get_reason())
+        self.assertEqual([], list(game.get_legal_moves()))
+        self.assertTrue(game.undo_move())
+        self.assertEqual("UNFINISHED", game.get_game_state())
+        self.assertEqual(2, game.get_repetition_count())
+        self.assertTrue(game.redo_move())
+        self.assertEqual("DRAW", game.get_game_state())
+
+    # The player who repeats the position loses, and the turn passes to the winner
+    def test2(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_repetition_rule(2, "LOSS")
+        self.play(game, self.shuffle[:3])
+        self.assertEqual("BLACK_WON", game.try_move("b2", "a2").get_game_state())
+        self.assertEqual("BLACK", game.get_active_player())
+
+        # Black moving back to the position after black's first move
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_repetition_rule(2, "LOSS")
+        self.play(game, [("i2", "h2"), ("a2", "b2"), ("h2", "g2"), ("b2", "a2"), ("g2", "h2")])
+        self.assertEqual("RED_WON", game.get_game_state())
+        self.assertEqual("RED", game.get_active_player())
+
+    # Ply limits, and moves made before the rule was set
+    def test3(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_repetition_rule(max_plies=3)
+        self.play(game, self.shuffle[:2])
+        self.assertEqual("UNFINISHED", game.get_game_state())
+        self.play(game, self.shuffle[2:3])
+        self.assertEqual("DRAW", game.get_game_state())
+
+        game = HasamiShogiGame(self.backend, quiet=True)
+        self.play(game, self.shuffle * 2)
+        self.assertEqual(0, game.get_repetition_count())
+        game.set_repetition_rule(4)
+        self.assertEqual(3, game.get_repetition_count())
+        self.assertEqual("UNFINISHED", game.get_game_state())
+        self.assertEqual(8, len(game.get_move_history()))
+        self.play(game, self.shuffle)
+        self.assertEqual("DRAW", game.get_game_state())
+        game.set_repetition_rule()
+        self.assertIsNone(game.get_repetition_rule())
+        self.assertEqual("DRAW", game.get_game_state())
+
+        for rule in [(1,), (3, "WIN"), (None, "DRAW", 0)]:
+            with self.assertRaises(ValueError):
+                game.set_repetition_rule(*rule)
+
+    # Clones, pickles, and snapshots keep the rule and the draw
+    def test4(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_repetition_rule(3, "DRAW", 200)
+        self.play(game, self.shuffle)
+        clone = game.clone()
+        self.play(clone, self.shuffle)
+        self.assertEqual("DRAW", clone.get_game_state())
+        self.assertEqual(2, game.get_repetition_count())
+        loaded = pickle.loads(pickle.dumps(game))
+        self.assertEqual((3, "DRAW", 200), loaded.get_repetition_rule())
+        self.assertEqual(2, loaded.get_repetition_count())
+        self.play(loaded, self.shuffle)
+        self.assertEqual("DRAW", loaded.get_game_state())
+        for snapshot in (clone.to_snapshot(), clone.to_snapshot(packed=True)):
+            self.assertEqual("DRAW", HasamiShogiGame.from_snapshot(snapshot, self.backend).get_game_state())
+
+    # Pickled games keep counting plies, even through undos and a new rule
+    def test5(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.set_repetition_rule(max_plies=6)
+        self.play(game, self.shuffle[:3])
+        loaded = pickle.loads(pickle.dumps(game))
+        self.assertEqual([], loaded.get_move_history())
+        self.play(loaded, self.shuffle[3:] + self.shuffle[:1])
+        self.assertEqual("UNFINISHED", loaded.get_game_state())
+        self.play(loaded, self.shuffle[1:2])
+        self.assertEqual("DRAW", loaded.get_game_state())
+        self.assertTrue(loaded.undo_move())
+        loaded.set_repetition_rule(2, max_plies=6)
+        self.assertEqual("UNFINISHED", loaded.get_game_state())
+        self.assertEqual(2, loaded.get_repetition_count())
+        self.play(loaded, self.shuffle[1:2])
+        self.assertEqual("DRAW", loaded.get_game_state())
+
+
+class Test__check_sandwiched_bitboard(Test__check_sandwiched):
+    """Runs the HasamiShogiGame._check_sandwiched() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_make_move_bitboard(Test_make_move):
+    """Runs the HasamiShogiGame.make_move() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_get_legal_moves_bitboard(Test_get_legal_moves):
+    """Runs the HasamiShogiGame.get_legal_moves() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_undo_move_bitboard(Test_undo_move):
+    """Runs the HasamiShogiGame.undo_move() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_get_position_hash_bitboard(Test_get_position_hash):
+    """Runs the HasamiShogiGame.get_position_hash() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test__get_position_bitboard(Test__get_position):
+    """Runs the HasamiShogiGame._get_position() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_try_move_bitboard(Test_try_move):
+    """Runs the HasamiShogiGame.try_move() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_make_move_encoded_bitboard(Test_make_move_encoded):
+    """Runs the HasamiShogiGame.make_move_encoded() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_to_snapshot_bitboard(Test_to_snapshot):
+    """Runs the HasamiShogiGame.to_snapshot() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test__check_sandwiched_lines(Test__check_sandwiched):
+    """Runs the HasamiShogiGame._check_sandwiched() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_make_move_lines(Test_make_move):
+    """Runs the HasamiShogiGame.make_move() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_get_legal_moves_lines(Test_get_legal_moves):
+    """Runs the HasamiShogiGame.get_legal_moves() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_undo_move_lines(Test_undo_move):
+    """Runs the HasamiShogiGame.undo_move() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_get_position_hash_lines(Test_get_position_hash):
+    """Runs the HasamiShogiGame.get_position_hash() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test__get_position_lines(Test__get_position):
+    """Runs the HasamiShogiGame._get_position() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_try_move_lines(Test_try_move):
+    """Runs the HasamiShogiGame.try_move() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_make_move_encoded_lines(Test_make_move_encoded):
+    """Runs the HasamiShogiGame.make_move_encoded() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_to_snapshot_lines(Test_to_snapshot):
+    """Runs the HasamiShogiGame.to_snapshot() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_LineBoard(unittest.TestCase):
+    """Contains unit tests comparing the LineBoard class against the Board class."""
+
+    def test1(self):
+        # Random boards give the same answers on both classes
+        rng = random.Random(21)
+        for attempt in range(200):
+            squares = "".join(rng.choice("RB....") for index in range(81))
+            board = Board()
+            lines = LineBoard()
+            board.set_squares(squares)
+            lines.set_squares(squares)
+            self.assertEqual(squares, lines.get_squares())
+            self.assertEqual(board.get_masks(), lines.get_masks())
+            self.assertEqual(board.get_hash(), lines.get_hash())
+            for player in ["RED", "BLACK"]:
+                self.assertEqual(board.get_pieces(player), lines.get_pieces(player))
+            for index in range(81):
+                xy = (index % 9, index // 9)
+                self.assertEqual(board.get_destinations(index), lines.get_destinations(index))
+                for direction in ["UP", "DOWN", "LEFT", "RIGHT"]:
+                    for player in ["RED", "BLACK"]:
+                        self.assertEqual(board.get_sandwiched(xy, direction, player),
+                                         lines.get_sandwiched(xy, direction, player))
+                destination = rng.randrange(81)
+                if destination != index and (destination // 9 == index // 9 or destination % 9 == index % 9):
+                    destination_xy = (destination % 9, destination // 9)
+                    self.assertEqual(board.is_path_clear(xy, destination_xy),
+                                     lines.is_path_clear(xy, destination_xy))
+
+    def test2(self):
+        # Setting spaces keeps the rows, columns, and hash in step
+        lines = LineBoard()
+        lines.set_space((4, 0), "NONE")
+        lines.set_space((4, 4), "RED")
+        lines.set_space((0, 8), "RED")
+        self.assertEqual("RED", lines.get_space((4, 4)))
+        self.assertEqual("NONE", lines.get_space((4, 9)))
+        self.assertEqual(lines.compute_hash(), lines.get_hash())
+        copy = LineBoard()
+        copy.set_squares(lines.get_squares())
+        self.assertEqual(copy._rows, lines._rows)
+        self.assertEqual(copy._columns, lines._columns)
+        self.assertEqual([31, 22, 13, 4, 49, 58, 67], lines.get_destinations(40)[:7])
+        self.assertTrue(lines.is_path_clear((4, 4), (4, 0)))
+        self.assertFalse(lines.is_path_clear((4, 4), (4, 8)))
+
+
+class Test_clone_bitboard(Test_clone):
+    """Runs the HasamiShogiGame.clone() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_clone_lines(Test_clone):
+    """Runs the HasamiShogiGame.clone() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_get_features_bitboard(Test_get_features):
+    """Runs the HasamiShogiGame.get_features() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_get_features_lines(Test_get_features):
+    """Runs the HasamiShogiGame.get_features() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_get_attack_map_bitboard(Test_get_attack_map):
+    """Runs the HasamiShogiGame.get_attack_map() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_get_attack_map_lines(Test_get_attack_map):
+    """Runs the HasamiShogiGame.get_attack_map() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_set_repetition_rule_bitboard(Test_set_repetition_rule):
+    """Runs the HasamiShogiGame.set_repetition_rule() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+class Test_set_repetition_rule_lines(Test_set_repetition_rule):
+    """Runs the HasamiShogiGame.set_repetition_rule() unit tests against the LineBoard backend."""
+
+    backend = "lines"
+
+
+class Test_BitBoard(unittest.TestCase):
+    """Contains unit tests comparing the BitBoard class against the Board class."""
+
+    def test1(self):
+        # Both boards start with the same pieces
+        board = Board()
+        bitboard = BitBoard()
+        for y in range(9):
+            for x in range(9):
+                self.assertEqual(board.get_space((x, y)), bitboard.get_space((x, y)))
+
+    def test2(self):
+        # Playing the same random games on both backends keeps them in step
+        rng = random.Random(162)
+        squares = [row + column for row in "abcdefghi" for column in "123456789"]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+            for games_played in range(20):
+                games = [HasamiShogiGame("standard"), HasamiShogiGame("bitboard")]
+                for moves in range(400):
+                    pieces = [square for square in squares
+                              if games[0].get_square_occupant(square) == games[0].get_active_player()]
+                    origin = rng.choice(pieces)
+                    destination = rng.choice([square for square in squares
+                                              if square[0] == origin[0] or square[1] == origin[1]])
+                    self.assertEqual(games[0].make_move(origin, destination),
+                                     games[1].make_move(origin, destination))
+                    if games[0].get_game_state() != "UNFINISHED":
+                        break
+                for square in squares:
+                    self.assertEqual(games[0].get_square_occupant(square), games[1].get_square_occupant(square))
+                for player in ["RED", "BLACK"]:
+                    self.assertEqual(games[0].get_num_captured_pieces(player),
+                                     games[1].get_num_captured_pieces(player))
+                self.assertEqual(games[0].get_game_state(), games[1].get_game_state())
+
+    def test3(self):
+        game = HasamiShogiGame("bitboard")
+        self.assertTrue(game._board.is_corner((8, 8)))
+        self.assertFalse(game._board.is_corner((8, 9)))
+        self.assertFalse(game._board.is_corner((4, 8)))
+
+    def test4(self):
+        with self.assertRaises(ValueError):
+            HasamiShogiGame("lists")
+
+
 if __name__ == "__main__":
     unittest.main()
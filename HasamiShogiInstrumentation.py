@@ -0,0 +1,206 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Optional call counting and per-phase timing of the HasamiShogiGame hot paths
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE INSTRUMENTATION WORKS ===============
+# 1) Switching it on and off
+#       enable() replaces each instrumented method on its class with a wrapper that counts calls and adds up
+#       the time spent in the method. disable() puts the original methods back. Every game, including games
+#       created before enable() was called, uses the class's current methods, so instrumentation can be
+#       switched while a program is running. While it is disabled the original methods are in place and
+#       nothing is counted, so it costs nothing.
+#       toggle_on_signal() lets a running process be switched from outside, for example with kill -USR1.
+#
+# 2) Phases
+#       make_move, try_move, try_move_encoded: the whole move, with and without notation parsing
+#       parse: HasamiShogiGame._parse_move, algebraic notation to an encoded move
+#       path_check: is_path_clear of every board backend
+#       execute: HasamiShogiGame._execute_move, moving the piece, captures, and passing the turn
+#       check_sandwiched: HasamiShogiGame._check_sandwiched, capture detection in one direction
+#       capture: HasamiShogiGame._capture, removing captured pieces
+#       game_over: HasamiShogiGame._check_game_over
+#       Times include the phases called from inside a phase, so make_move's time includes parse's.
+#       Every MoveResult is also counted as either a move made or a rejection with its MoveRejection.
+#
+# 3) Reading the statistics
+#       get_stats() returns a dict, export_json() the same as JSON, and export_prometheus() the Prometheus
+#       text exposition format. reset() sets every count back to zero.
+#
+
+import functools
+import json
+import signal
+import time
+
+from HasamiShogiGame import HasamiShogiGame, BOARD_BACKENDS, MoveRejection, MoveResult
+
+# (phase name, class, method name) of every instrumented method
+PHASES = [("make_move", HasamiShogiGame, "make_move"),
+          ("try_move", HasamiShogiGame, "try_move"),
+          ("try_move_encoded", HasamiShogiGame, "try_move_encoded"),
+          ("parse", HasamiShogiGame, "_parse_move"),
+          ("execute", HasamiShogiGame, "_execute_move"),
+          ("check_sandwiched", HasamiShogiGame, "_check_sandwiched"),
+          ("capture", HasamiShogiGame, "_capture"),
+          ("game_over", HasamiShogiGame, "_check_game_over")]
+PHASES += [("path_check", board, "is_path_clear") for board in BOARD_BACKENDS.values()
+           if "is_path_clear" in vars(board)]
+
+_PHASE_NAMES = list(dict.fromkeys(phase for phase, cls, name in PHASES))
+_calls = dict.fromkeys(_PHASE_NAMES, 0)
+_seconds = dict.fromkeys(_PHASE_NAMES, 0.0)
+_rejections = dict.fromkeys((reason.name for reason in MoveRejection), 0)
+_moves_made = 0
+_originals = {}  # (class, method name) -> original function, while enabled
+
+
+def _timed(phase, method):
+    """
+    Wraps a method so its calls are counted and timed.
+    :param phase: Phase name to add the calls and time to
+    :param method: Function to wrap
+    :return: The wrapping function
+    """
+    perf_counter = time.perf_counter
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _seconds[phase] += perf_counter() - start
+            _calls[phase] += 1
+    return wrapper
+
+
+def _counted_result(method):
+    """
+    Wraps MoveResult.__init__ so every move made and every rejection is counted.
+    :param method: The original MoveResult.__init__
+    :return: The wrapping function
+    """
+    @functools.wraps(method)
+    def wrapper(self, reason, captured, game_state):
+        global _moves_made
+        if reason is None:
+            _moves_made += 1
+        else:
+            _rejections[reason.name] += 1
+        method(self, reason, captured, game_state)
+    return wrapper
+
+
+def enable():
+    """
+    Function that starts counting and timing the instrumented methods. Does nothing if already enabled.
+    :return: None
+    """
+    if _originals:
+        return
+    for phase, cls, name in PHASES:
+        _originals[(cls, name)] = vars(cls)[name]
+        setattr(cls, name, _timed(phase, vars(cls)[name]))
+    _originals[(MoveResult, "__init__")] = MoveResult.__init__
+    MoveResult.__init__ = _counted_result(MoveResult.__init__)
+
+
+def disable():
+    """
+    Function that puts the original methods back. The statistics are kept until reset is called.
+    :return: None
+    """
+    while _originals:
+        (cls, name), method = _originals.popitem()
+        setattr(cls, name, method)
+
+
+def is_enabled():
+    """
+    Function that returns whether the instrumentation is enabled.
+    :return: Bool
+    """
+    return bool(_originals)
+
+
+def toggle_on_signal(signum=None):
+    """
+    Function that makes a signal switch the instrumentation on and off.
+    :param signum: Signal number, defaults to SIGUSR1 (not available on Windows)
+    :return: None
+    """
+    if signum is None:
+        signum = signal.SIGUSR1
+
+    def toggle(received, frame):
+        if is_enabled():
+            disable()
+        else:
+            enable()
+    signal.signal(signum, toggle)
+
+
+def reset():
+    """
+    Function that sets every count and time back to zero.
+    :return: None
+    """
+    global _moves_made
+    for phase in _PHASE_NAMES:
+        _calls[phase] = 0
+        _seconds[phase] = 0.0
+    for reason in _rejections:
+        _rejections[reason] = 0
+    _moves_made = 0
+
+
+def get_stats():
+    """
+    Function that returns the statistics gathered so far.
+    :return: Dict of "enabled" (bool), "phases" (phase name -> dict of calls, seconds, and mean_seconds),
+             "moves_made" (int), and "rejections" (MoveRejection name -> int)
+    """
+    return {"enabled": is_enabled(),
+            "phases": {phase: {"calls": _calls[phase],
+                               "seconds": _seconds[phase],
+                               "mean_seconds": _seconds[phase] / _calls[phase] if _calls[phase] else 0.0}
+                       for phase in _PHASE_NAMES},
+            "moves_made": _moves_made,
+            "rejections": dict(_rejections)}
+
+
+def export_json():
+    """
+    Function that returns the statistics as JSON.
+    :return: String
+    """
+    return json.dumps(get_stats(), sort_keys=True)
+
+
+def export_prometheus(prefix="hasami_shogi"):
+    """
+    Function that returns the statistics in the Prometheus text exposition format.
+    :param prefix: String put in front of every metric name
+    :return: String, ending with a newline
+    """
+    stats = get_stats()
+    lines = ["# HELP %s_instrumentation_enabled Whether instrumentation is enabled" % prefix,
+             "# TYPE %s_instrumentation_enabled gauge" % prefix,
+             "%s_instrumentation_enabled %d" % (prefix, stats["enabled"]),
+             "# HELP %s_phase_calls_total Calls of each instrumented phase" % prefix,
+             "# TYPE %s_phase_calls_total counter" % prefix]
+    lines += ['%s_phase_calls_total{phase="%s"} %d' % (prefix, phase, values["calls"])
+              for phase, values in stats["phases"].items()]
+    lines += ["# HELP %s_phase_seconds_total Seconds spent in each instrumented phase" % prefix,
+              "# TYPE %s_phase_seconds_total counter" % prefix]
+    lines += ['%s_phase_seconds_total{phase="%s"} %r' % (prefix, phase, values["seconds"])
+              for phase, values in stats["phases"].items()]
+    lines += ["# HELP %s_moves_made_total Moves made" % prefix,
+              "# TYPE %s_moves_made_total counter" % prefix,
+              "%s_moves_made_total %d" % (prefix, stats["moves_made"]),
+              "# HELP %s_move_rejections_total Moves rejected, by reason" % prefix,
+              "# TYPE %s_move_rejections_total counter" % prefix]
+    lines += ['%s_move_rejections_total{reason="%s"} %d' % (prefix, reason, count)
+              for reason, count in stats["rejections"].items()]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,110 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiInstrumentation module
+
+import unittest
+import json
+import os
+import signal
+import HasamiShogiInstrumentation as instrumentation
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import Board as Board
+from HasamiShogiGame import MoveResult as MoveResult
+
+
+class Test_enable(unittest.TestCase):
+    """Contains unit tests for switching the instrumentation on and off."""
+
+    backend = "standard"
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    # Disabling puts back the exact original methods
+    def test1(self):
+        make_move = HasamiShogiGame.make_move
+        init = MoveResult.__init__
+        is_path_clear = Board.is_path_clear
+        instrumentation.enable()
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIsNot(make_move, HasamiShogiGame.make_move)
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIs(make_move, HasamiShogiGame.make_move)
+        self.assertIs(init, MoveResult.__init__)
+        self.assertIs(is_path_clear, Board.is_path_clear)
+
+    # Calls and rejections are counted only while enabled, including for games created earlier
+    def test2(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.make_move("i1", "h1")
+        instrumentation.enable()
+        game.make_move("i9", "h9")
+        game.make_move("a1", "a1")
+        game.make_move("z1", "b1")
+        game.make_move("a9", "a5")
+        game.make_move("a1", "c1")
+        instrumentation.disable()
+        game.make_move("i9", "h9")
+
+        stats = instrumentation.get_stats()
+        self.assertFalse(stats["enabled"])
+        self.assertEqual(5, stats["phases"]["make_move"]["calls"])
+        self.assertEqual(5, stats["phases"]["parse"]["calls"])
+        self.assertEqual(4, stats["phases"]["try_move_encoded"]["calls"])
+        self.assertEqual(1, stats["phases"]["execute"]["calls"])
+        self.assertEqual(4, stats["phases"]["check_sandwiched"]["calls"])
+        self.assertEqual(4, stats["phases"]["capture"]["calls"])
+        self.assertEqual(1, stats["phases"]["game_over"]["calls"])
+        self.assertEqual(2, stats["phases"]["path_check"]["calls"])
+        self.assertEqual(1, stats["moves_made"])
+        self.assertEqual(1, stats["rejections"]["NOT_OWNED"])
+        self.assertEqual(1, stats["rejections"]["SAME_SQUARE"])
+        self.assertEqual(1, stats["rejections"]["INVALID_ORIGIN"])
+        self.assertEqual(1, stats["rejections"]["PATH_BLOCKED"])
+        self.assertEqual(0, stats["rejections"]["NOT_IN_LINE"])
+        self.assertGreater(stats["phases"]["make_move"]["seconds"], 0.0)
+
+        instrumentation.reset()
+        self.assertEqual(0, instrumentation.get_stats()["phases"]["make_move"]["calls"])
+
+    def test3(self):
+        instrumentation.enable()
+        game = HasamiShogiGame(self.backend, quiet=True)
+        game.make_move("i1", "a2")
+        self.assertEqual({"rejections", "phases", "moves_made", "enabled"},
+                         set(json.loads(instrumentation.export_json())))
+        text = instrumentation.export_prometheus()
+        self.assertIn('hasami_shogi_move_rejections_total{reason="NOT_IN_LINE"} 1\n', text)
+        self.assertIn('hasami_shogi_phase_calls_total{phase="make_move"} 1\n', text)
+        self.assertIn("hasami_shogi_instrumentation_enabled 1\n", text)
+        self.assertIn("# TYPE hasami_shogi_phase_seconds_total counter\n", text)
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "needs SIGUSR1")
+    def test4(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            instrumentation.toggle_on_signal()
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.assertTrue(instrumentation.is_enabled())
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.assertFalse(instrumentation.is_enabled())
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+
+
+class Test_enable_bitboard(Test_enable):
+    backend = "bitboard"
+
+
+class Test_enable_lines(Test_enable):
+    backend = "lines"
+
+
+if __name__ == "__main__":
+    unittest.main()
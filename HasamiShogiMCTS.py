@@ -0,0 +1,535 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Monte Carlo tree search player for the HasamiShogiGame class
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE TREE SEARCH WORKS ===============
+# 1) The tree
+#       Every node is a position, reached by playing the node's move from its parent's position.
+#       Nodes track how many playouts went through them and how many of those were won by the player who made
+#       the node's move (draws count as half a win).
+#
+# 2) One iteration
+#       Selection: starting at the root, the child with the highest UCT score is followed until a node that
+#           still has untried moves (or has ended the game) is reached.
+#           UCT = wins / visits + exploration * sqrt(ln(parent visits) / visits)
+#       Expansion: one untried move of that node is added as a new child.
+#       Simulation: a batch of playouts is played from the new child's position. Each playout picks moves
+#           with the playout policy until the game ends or max_playout_plies is reached (a draw).
+#       Backpropagation: the batch's results are added to every node from the new child up to the root.
+#
+# 3) Fast move application
+#       Moves are made with HasamiShogiGame._execute_move and taken back with HasamiShogiGame._unmake_move,
+#       so nothing is printed and no algebraic notation is parsed. Selection and playouts work on one game
+#       object that is returned to the root position after every iteration.
+#
+# 4) Batched playouts
+#       Playing a batch of playouts per iteration spreads the cost of selection and expansion over the batch.
+#       With workers, every round selects workers * leaves_per_task leaves and sends each worker one task with
+#       leaves_per_task of them, as pickled games (a packed snapshot, plus the repetition rule and position
+#       counts of a game with a rule), so pickling and messages are paid once per leaves_per_task batches
+#       rather than once per batch. Selected leaves get a virtual loss, their batch counted as lost playouts for
+#       the player who made the leaf's move, until the results come back, so the selections of one round
+#       spread out over the tree.
+#
+# 5) Playout policies
+#       random_policy picks any legal move. capture_policy calls HasamiShogiGame.get_capturing_moves on every
+#       playout ply, which tries every destination next to an opponent's piece or a corner. Measured from the
+#       starting position, that is about 100 microseconds a ply against 2 for random_policy, making a capture
+#       ply about 3.5 times as slow as a random one. Capturing ends playouts sooner (about 22 plies against the
+#       200 ply limit), so capture playouts still finish about 1.7 times as fast. Skipping the call when the
+#       incremental threatened counts (HasamiShogiGame.set_feature_tracking) show no capture halves the policy
+#       time, but tracking slows every move, so it gained only about 15% a ply and isn't used.
+#
+
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from HasamiShogiGame import HasamiShogiGame, SQUARE_NAMES, SQUARE_XY
+
+DEFAULT_PLAYOUTS = 2000  # Playouts played when neither a playout count nor a time limit is given
+DEFAULT_EXPLORATION = 1.4  # UCT exploration constant
+DEFAULT_BATCH_SIZE = 8  # Playouts played from each new leaf
+DEFAULT_MAX_PLAYOUT_PLIES = 200  # Playouts that haven't ended by this many plies count as draws
+DEFAULT_LEAVES_PER_TASK = 4  # Leaves whose batches are sent to a worker in one task
+
+
+def random_policy(game, moves, rng):
+    """
+    Playout policy that picks any legal move.
+    :param game: The HasamiShogiGame being played out
+    :param moves: List of legal (origin, destination) moves for the active player
+    :param rng: random.Random to pick with
+    :return: One of the moves
+    """
+    return moves[rng.randrange(len(moves))]
+
+
+def capture_policy(game, moves, rng):
+    """
+    Playout policy that plays one of the capturing moves (see HasamiShogiGame.get_capturing_moves) when there are
+    any, corner captures included, else a random move. Finding the capturing moves is most of a playout ply's
+    time, see the notes at the top of this module.
+    :param game: The HasamiShogiGame being played out
+    :param moves: List of legal (origin, destination) moves for the active player
+    :param rng: random.Random to pick with
+    :return: One of the moves
+    """
+    capturing_moves = list(game.get_capturing_moves())
+    if capturing_moves:
+        return capturing_moves[rng.randrange(len(capturing_moves))]
+    return moves[rng.randrange(len(moves))]
+
+
+# Playout policies that can be picked by name
+PLAYOUT_POLICIES = {"random": random_policy, "capture": capture_policy}
+
+
+def play_out(game, policy, rng, max_plies):
+    """
+    Plays a game to the end with a playout policy, then takes every playout move back.
+    :param game: The HasamiShogiGame to play out, left in the position it started in
+    :param policy: Playout policy function
+    :param rng: random.Random passed to the policy
+    :param max_plies: Int number of plies after which the playout is a draw
+    :return: "RED" or "BLACK" for the winner, or None for a draw
+    """
+    plies = 0
+    winner = None
+    while plies < max_plies:
+        state = game.get_game_state()
+        if state != "UNFINISHED":
+            if state != "DRAW":
+                winner = game.get_active_player()  # The winner, usually the player who made the winning move
+            break
+        moves = list(game.get_legal_moves())
+        if not moves:
+            break
+        move = policy(game, moves, rng)
+        game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+        plies += 1
+    for move in range(plies):
+        game._unmake_move()
+    return winner
+
+
+def _play_out_leaves(games, policy, seed, playouts, max_plies):
+    """
+    Plays a batch of playouts from each of several leaf positions, used by worker processes.
+    :param games: List of the unpickled HasamiShogiGames at the leaf positions, with the repetition rule and counts
+                  of the searched game
+    :param policy: Playout policy function
+    :param seed: Int seed for the task's random.Random
+    :param playouts: Int number of playouts to play from every leaf
+    :param max_plies: Int number of plies after which a playout is a draw
+    :return: List of (red wins, black wins, draws) tuples, one per leaf
+    """
+    rng = random.Random(seed)
+    leaf_results = []
+    for game in games:
+        results = {"RED": 0, "BLACK": 0, None: 0}
+        for playout in range(playouts):
+            results[play_out(game, policy, rng, max_plies)] += 1
+        leaf_results.append((results["RED"], results["BLACK"], results[None]))
+    return leaf_results
+
+
+class MCTSNode:
+    """The MCTSNode class is one position in the search tree.
+    This class will contain the following data members:
+    The (origin, destination) move that led to this node (None for the root)
+    The player who made that move
+    The parent node (None for the root)
+    A list of child nodes
+    A list of legal moves that don't have a child node yet
+    The number of playouts through this node
+    The number of those playouts won by the player who made this node's move (draws count as half)"""
+
+    __slots__ = ("_move", "_player", "_parent", "_children", "_untried", "_visits", "_wins")
+
+    def __init__(self, move, player, parent, untried):
+        """The constructor for the MCTSNode class.
+        :param move: (origin, destination) move that led to this node, or None
+        :param player: "RED" or "BLACK", the player who made the move
+        :param parent: Parent MCTSNode, or None
+        :param untried: List of legal moves from this node's position"""
+        self._move = move
+        self._player = player
+        self._parent = parent
+        self._children = []
+        self._untried = untried
+        self._visits = 0
+        self._wins = 0.0
+
+    def get_move(self):
+        """
+        Method that returns the move that led to this node.
+        :return: (origin, destination) tuple of square indices, or None for the root
+        """
+        return self._move
+
+    def get_visits(self):
+        """
+        Method that returns the number of playouts through this node.
+        :return: Int
+        """
+        return self._visits
+
+    def get_wins(self):
+        """
+        Method that returns the number of playouts through this node won by the player who made its move.
+        :return: Float, draws count as half a win
+        """
+        return self._wins
+
+    def get_children(self):
+        """
+        Method that returns the node's children.
+        :return: List of MCTSNode
+        """
+        return self._children
+
+    def select_child(self, exploration):
+        """
+        Method that picks the child with the highest UCT score.
+        :param exploration: Float UCT exploration constant
+        :return: An MCTSNode
+        """
+        log_visits = math.log(self._visits)
+        best_child = None
+        best_score = -1.0
+        for child in self._children:
+            score = child._wins / child._visits + exploration * math.sqrt(log_visits / child._visits)
+            if score > best_score:
+                best_child = child
+                best_score = score
+        return best_child
+
+    def count_nodes(self):
+        """
+        Method that counts the nodes in the tree below (and including) this node.
+        :return: Int
+        """
+        nodes = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            stack.extend(node._children)
+        return nodes
+
+    def get_memory_usage(self):
+        """
+        Method that adds up the memory used by the tree below (and including) this node.
+        :return: Int number of bytes used by the nodes and their lists of children and untried moves
+        """
+        total = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            total += sys.getsizeof(node) + sys.getsizeof(node._children) + sys.getsizeof(node._untried)
+            stack.extend(node._children)
+        return total
+
+
+class MCTSResult:
+    """The MCTSResult class holds the outcome of a Monte Carlo tree search.
+    This class will contain the following data members:
+    The best move found (the root child with the most visits), or None if there are no legal moves
+    The fraction of playouts through that move won by the active player
+    The number of playouts played
+    The number of seconds the search took
+    The number of nodes in the tree
+    The number of bytes used by the tree"""
+
+    def __init__(self, move, win_rate, playouts, seconds, nodes, tree_bytes):
+        """The constructor for the MCTSResult class.
+        :param move: (origin, destination) tuple of square indices, or None
+        :param win_rate: Float fraction of the move's playouts won
+        :param playouts: Int number of playouts played
+        :param seconds: Float number of seconds the search took
+        :param nodes: Int number of nodes in the tree
+        :param tree_bytes: Int number of bytes used by the tree"""
+        self._move = move
+        self._win_rate = win_rate
+        self._playouts = playouts
+        self._seconds = seconds
+        self._nodes = nodes
+        self._tree_bytes = tree_bytes
+
+    def get_move(self):
+        """
+        Method that returns the best move found.
+        :return: (origin, destination) tuple of square indices, or None if there were no legal moves
+        """
+        return self._move
+
+    def get_win_rate(self):
+        """
+        Method that returns the fraction of the best move's playouts that the active player won.
+        :return: Float from 0 to 1
+        """
+        return self._win_rate
+
+    def get_playouts(self):
+        """
+        Method that returns the number of playouts played.
+        :return: Int
+        """
+        return self._playouts
+
+    def get_seconds(self):
+        """
+        Method that returns how long the search took.
+        :return: Float number of seconds
+        """
+        return self._seconds
+
+    def get_playouts_per_second(self):
+        """
+        Method that returns the playout speed.
+        :return: Float number of playouts per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self._playouts / self._seconds
+
+    def get_nodes(self):
+        """
+        Method that returns the size of the tree.
+        :return: Int number of nodes
+        """
+        return self._nodes
+
+    def get_tree_bytes(self):
+        """
+        Method that returns the memory used by the tree.
+        :return: Int number of bytes
+        """
+        return self._tree_bytes
+
+
+class MCTSPlayer:
+    """The MCTSPlayer class picks moves for a HasamiShogiGame with Monte Carlo tree search.
+    This class will contain the following data members:
+    The UCT exploration constant
+    The playout policy function
+    The number of playouts played from every new leaf
+    The number of plies after which a playout is a draw
+    The number of worker processes to play playouts in (0 to play them in this process)
+    The number of leaves whose batches are sent to a worker in one task
+    A random.Random used for playouts and to seed the workers"""
+
+    def __init__(self, exploration=DEFAULT_EXPLORATION, policy=random_policy, batch_size=DEFAULT_BATCH_SIZE,
+                 max_playout_plies=DEFAULT_MAX_PLAYOUT_PLIES, workers=0, seed=None,
+                 leaves_per_task=DEFAULT_LEAVES_PER_TASK):
+        """The constructor for the MCTSPlayer class.
+        :param exploration: Float UCT exploration constant
+        :param policy: Playout policy function, or the name of one in PLAYOUT_POLICIES
+        :param batch_size: Int number of playouts played from every new leaf
+        :param max_playout_plies: Int number of plies after which a playout is a draw
+        :param workers: Int number of worker processes to play the batches in, 0 to play them in this process
+        :param seed: Seed for the random.Random, or None
+        :param leaves_per_task: Int number of leaves whose batches are sent to a worker in one task, so pickling
+                                and messages are shared by leaves_per_task * batch_size playouts"""
+        if isinstance(policy, str):
+            policy = PLAYOUT_POLICIES[policy]
+        self._exploration = exploration
+        self._policy = policy
+        self._batch_size = batch_size
+        self._max_playout_plies = max_playout_plies
+        self._workers = workers
+        self._leaves_per_task = leaves_per_task
+        self._rng = random.Random(seed)
+
+    def search(self, game, playouts=None, time_limit=None):
+        """
+        Method that searches the game's current position and picks the active player's move.
+        The game is left in the same position it started in.
+        :param game: The HasamiShogiGame to search
+        :param playouts: Int number of playouts to play. Defaults to DEFAULT_PLAYOUTS without a time limit
+        :param time_limit: Float number of seconds the search may take, or None for no limit
+        :return: An MCTSResult
+        """
+        start = time.perf_counter()
+        if playouts is None and time_limit is None:
+            playouts = DEFAULT_PLAYOUTS
+        deadline = None if time_limit is None else start + time_limit
+
+        root = MCTSNode(None, None, None, list(game.get_legal_moves()))
+        if not root._untried:
+            return MCTSResult(None, 0.0, 0, 0.0, 1, root.get_memory_usage())
+
+        executor = None
+        if self._workers > 0:
+            executor = ProcessPoolExecutor(self._workers)
+        played = 0
+        try:
+            while ((playouts is None or played < playouts) and
+                   (deadline is None or time.perf_counter() < deadline)):
+                if executor is None:
+                    played += self._iterate(game, root)
+                else:
+                    played += self._iterate_in_workers(game, root, executor,
+                                                       None if playouts is None else playouts - played)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        best_child = max(root._children, key=MCTSNode.get_visits)
+        return MCTSResult(best_child._move, best_child._wins / best_child._visits, played,
+                          time.perf_counter() - start, root.count_nodes(), root.get_memory_usage())
+
+    def _iterate(self, game, root):
+        """
+        Runs one selection, expansion, simulation, and backpropagation step, playing the batch in this process.
+        :param game: The HasamiShogiGame at the root position, returned to it afterwards
+        :param root: The root MCTSNode
+        :return: Int number of playouts played
+        """
+        node, made = self._select(game, root)
+
+        # Simulation
+        if game.get_game_state() != "UNFINISHED":  # No need to play out a finished game
+            results = self._finished_results(game)
+        else:
+            results = {"RED": 0, "BLACK": 0, None: 0}
+            for playout in range(self._batch_size):
+                results[play_out(game, self._policy, self._rng, self._max_playout_plies)] += 1
+        for move in range(made):
+            game._unmake_move()
+
+        self._backpropagate(node, results)
+        return self._batch_size
+
+    def _iterate_in_workers(self, game, root, executor, remaining):
+        """
+        Runs one round of selections for the workers: a leaf is selected and expanded for each batch of the round,
+        and the batches are played in the worker processes, leaves_per_task leaves to a task, so the cost of
+        pickling and messages is shared by many playouts. Every selected leaf gets a virtual loss (its batch is
+        counted as lost by the player who made its move) until its results come back, so the next selections of
+        the round spread out over the tree instead of picking the same leaf.
+        :param game: The HasamiShogiGame at the root position, returned to it afterwards
+        :param root: The root MCTSNode
+        :param executor: ProcessPoolExecutor to play the batches in
+        :param remaining: Int number of playouts left to play, or None for no limit
+        :return: Int number of playouts played
+        """
+        leaves = self._workers * self._leaves_per_task
+        if remaining is not None:
+            leaves = min(leaves, -(-remaining // self._batch_size))
+        pending = []  # (node, game at the node) of the leaves played out in the workers
+        for leaf in range(leaves):
+            node, made = self._select(game, root)
+            if game.get_game_state() != "UNFINISHED":  # No need to play out a finished game
+                self._backpropagate(node, self._finished_results(game))
+            else:
+                pending.append((node, game.clone()))
+                self._add_visits(node, self._batch_size)
+            for move in range(made):
+                game._unmake_move()
+
+        # Spread the leaves evenly over the workers
+        per_task = -(-len(pending) // self._workers) if pending else 1
+        futures = [executor.submit(_play_out_leaves, [leaf_game for node, leaf_game in pending[first:first + per_task]],
+                                   self._policy, self._rng.getrandbits(64), self._batch_size,
+                                   self._max_playout_plies)
+                   for first in range(0, len(pending), per_task)]
+        leaf_results = [results for future in futures for results in future.result()]
+        for (node, leaf_game), (red_wins, black_wins, draws) in zip(pending, leaf_results):
+            self._add_visits(node, -self._batch_size)
+            self._backpropagate(node, {"RED": red_wins, "BLACK": black_wins, None: draws})
+        return leaves * self._batch_size
+
+    def _select(self, game, root):
+        """
+        Runs selection and expansion, making the moves to the new leaf on the game.
+        :param game: The HasamiShogiGame at the root position
+        :param root: The root MCTSNode
+        :return: (leaf MCTSNode, int number of moves made to reach it) tuple
+        """
+        node = root
+        made = 0
+
+        # Selection
+        while not node._untried and node._children:
+            node = node.select_child(self._exploration)
+            game._execute_move(SQUARE_XY[node._move[0]], SQUARE_XY[node._move[1]])
+            made += 1
+
+        # Expansion
+        if node._untried:
+            move = node._untried.pop(self._rng.randrange(len(node._untried)))
+            player = game.get_active_player()
+            game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+            made += 1
+            child = MCTSNode(move, player, node, list(game.get_legal_moves()))
+            node._children.append(child)
+            node = child
+        return node, made
+
+    def _finished_results(self, game):
+        """
+        Scores a batch from a leaf where the game has ended without playing it out.
+        :param game: The finished HasamiShogiGame
+        :return: Dict of "RED"/"BLACK"/None -> number of playouts won (None for draws)
+        """
+        winner = None if game.get_game_state() == "DRAW" else game.get_active_player()
+        results = {"RED": 0, "BLACK": 0, None: 0}
+        results[winner] = self._batch_size
+        return results
+
+    def _backpropagate(self, node, results):
+        """
+        Adds a batch's results to a leaf and every node above it.
+        :param node: The leaf MCTSNode
+        :param results: Dict of "RED"/"BLACK"/None -> number of playouts won (None for draws)
+        :return: None
+        """
+        playouts = self._batch_size
+        while node is not None:
+            node._visits += playouts
+            if node._player is not None:
+                node._wins += results[node._player] + results[None] / 2
+            node = node._parent
+
+    @staticmethod
+    def _add_visits(node, playouts):
+        """
+        Adds visits without wins to a leaf and every node above it, the virtual loss of _iterate_in_workers.
+        :param node: The leaf MCTSNode
+        :param playouts: Int number of visits to add, negative to take them back
+        :return: None
+        """
+        while node is not None:
+            node._visits += playouts
+            node = node._parent
+
+
+def find_best_move_mcts(game, playouts=None, time_limit=None, **options):
+    """
+    Function that picks the active player's move with Monte Carlo tree search.
+    :param game: The HasamiShogiGame to search, left in the same position it started in
+    :param playouts: Int number of playouts to play. Defaults to DEFAULT_PLAYOUTS without a time limit
+    :param time_limit: Float number of seconds the search may take, or None for no limit
+    :param options: Keyword arguments passed to the MCTSPlayer constructor
+    :return: An MCTSResult
+    """
+    return MCTSPlayer(**options).search(game, playouts, time_limit)
+
+
+def main():
+    game = HasamiShogiGame()
+    player = MCTSPlayer(seed=1)
+    result = player.search(game, time_limit=5.0)
+    origin, destination = result.get_move()
+    print(SQUARE_NAMES[origin], SQUARE_NAMES[destination], "win rate", round(result.get_win_rate(), 3),
+          "playouts", result.get_playouts(), "playouts/s", round(result.get_playouts_per_second()),
+          "nodes", result.get_nodes(), "tree bytes", result.get_tree_bytes())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiMCTS module
+
+import unittest
+import random
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import SQUARE_NAMES as SQUARE_NAMES
+from HasamiShogiMCTS import MCTSPlayer as MCTSPlayer
+from HasamiShogiMCTS import capture_policy as capture_policy
+from HasamiShogiMCTS import find_best_move_mcts as find_best_move_mcts
+
+
+def setup_board(game, reds, blacks, nones):
+    for squares in reds:
+        game._board.set_space(game.alg_to_xy(squares), "RED")
+    for squares in blacks:
+        game._board.set_space(game.alg_to_xy(squares), "BLACK")
+    for squares in nones:
+        game._board.set_space(game.alg_to_xy(squares), "NONE")
+
+
+class Test_MCTSPlayer(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiMCTS.MCTSPlayer class."""
+
+    # Finds the move that wins the game
+    def test1(self):
+        game = HasamiShogiGame()
+
+        reds = ["i1"]  # Squares to fill with a red piece
+        blacks = []  # Squares to fill with a black piece
+        nones = ["i9"]  # Squares to remove pieces from
+        game._captured_by_red = 2
+        game._active_player = "RED"
+
+        setup_board(game, reds, blacks, nones)
+
+        result = find_best_move_mcts(game, playouts=800, max_playout_plies=10, seed=3)
+        self.assertEqual(("a9", "i9"), (SQUARE_NAMES[result.get_move()[0]], SQUARE_NAMES[result.get_move()[1]]))
+        self.assertEqual(1.0, result.get_win_rate())
+
+    # The searched game is left unchanged and the search reports its work
+    def test2(self):
+        game = HasamiShogiGame()
+        game.make_move("i5", "c5")
+        position_hash = game.get_position_hash()
+        result = MCTSPlayer(max_playout_plies=20, batch_size=4, seed=1).search(game, playouts=80)
+        self.assertEqual(position_hash, game.get_position_hash())
+        self.assertEqual(80, result.get_playouts())
+        self.assertIn(result.get_move(), list(game.get_legal_moves()))
+        self.assertEqual(21, result.get_nodes())  # The root and one new node per batch
+        self.assertGreater(result.get_tree_bytes(), 0)
+        self.assertGreater(result.get_playouts_per_second(), 0)
+
+    # The same seed gives the same search
+    def test3(self):
+        game = HasamiShogiGame()
+        results = [MCTSPlayer(policy="capture", max_playout_plies=30, seed=9).search(game, playouts=64)
+                   for search in range(2)]
+        self.assertEqual(results[0].get_move(), results[1].get_move())
+        self.assertEqual(results[0].get_win_rate(), results[1].get_win_rate())
+
+    # Playouts can be played in worker processes
+    def test4(self):
+        game = HasamiShogiGame()
+        result = MCTSPlayer(max_playout_plies=20, batch_size=4, workers=2, seed=1).search(game, playouts=16)
+        self.assertEqual(16, result.get_playouts())
+        self.assertIn(result.get_move(), list(game.get_legal_moves()))
+
+    # No move once the game has ended
+    def test5(self):
+        game = HasamiShogiGame()
+        game._game_state = "BLACK_WON"
+        self.assertIsNone(MCTSPlayer().search(game, playouts=10).get_move())
+
+    # Workers are sent several leaves per task, and the last round only selects the leaves still needed
+    def test6(self):
+        game = HasamiShogiGame()
+        position_hash = game.get_position_hash()
+        player = MCTSPlayer(max_playout_plies=20, batch_size=2, workers=2, seed=1, leaves_per_task=3)
+        result = player.search(game, playouts=30)
+        self.assertEqual(30, result.get_playouts())
+        self.assertEqual(16, result.get_nodes())  # The root and one new node per batch
+        self.assertEqual(position_hash, game.get_position_hash())
+
+
+class Test_capture_policy(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiMCTS.capture_policy function."""
+
+    # Plays the only capturing move, which captures the black piece in the a9 corner
+    def test1(self):
+        game = HasamiShogiGame.from_snapshot("5R1RB/9/8R/9/9/9/9/9/6B2 r 0 0 UNFINISHED", quiet=True)
+        moves = list(game.get_legal_moves())
+        for seed in range(10):
+            move = capture_policy(game, moves, random.Random(seed))
+            self.assertEqual(("c9", "b9"), (SQUARE_NAMES[move[0]], SQUARE_NAMES[move[1]]))
+
+    # Plays a random legal move when no move captures
+    def test2(self):
+        game = HasamiShogiGame()
+        moves = list(game.get_legal_moves())
+        self.assertIn(capture_policy(game, moves, random.Random(0)), moves)
+
+
+if __name__ == "__main__":
+    unittest.main()
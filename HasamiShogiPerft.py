@@ -0,0 +1,289 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Perft move tree enumeration of HasamiShogiGame positions, for checking move generation and
+#              captures against known counts, comparing board backends, and measuring raw speed
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW PERFT WORKS ===============
+# 1) Counting
+#       perft(game, depth) makes every legal move, then every legal reply, and so on to depth plies, with
+#       HasamiShogiGame._execute_move and _unmake_move. It counts the leaves (move sequences of exactly depth
+#       plies) and, of the moves that reach the leaves:
+#           captures: moves that captured at least one square
+#           corner captures: moves that captured a corner square (these count even when the corner is empty
+#                            or holds the mover's own piece, see Board.get_sandwiched)
+#           game ends: moves that ended the game
+#       A game that ends before depth plies has no more moves, so the sequences leading to it aren't leaves.
+#       Depth 0 counts the position itself as the only leaf.
+#
+# 2) Deduplication
+#       With dedup, the counts below every (position hash, depth left) pair are stored in a dict, so a position
+#       reached through different move orders is only counted once and its counts are reused. The totals are
+#       the same as without dedup, which also checks that equal positions get equal hashes.
+#
+# 3) Divide
+#       divide lists the counts below every root move separately, so two backends (or a known good list) that
+#       disagree can be narrowed down to one move, then the move after it, and so on.
+#
+# 4) Comparing backends
+#       compare_backends runs divide on every board backend and returns every root move where a backend's counts
+#       differ from the first backend's.
+#
+
+import sys
+import time
+
+from HasamiShogiGame import HasamiShogiGame, BOARD_BACKENDS, InvalidSnapshot, SQUARE_NAMES, SQUARE_XY
+
+_CORNER_XYS = {(0, 0), (8, 0), (0, 8), (8, 8)}
+
+
+class PerftResult:
+    """The PerftResult class is used to hold the counts of a perft run.
+    This class will contain the following data members:
+    The number of plies enumerated
+    The number of leaves
+    The numbers of moves reaching the leaves that captured, that captured a corner square, and that ended the game
+    The number of seconds the run took"""
+
+    def __init__(self, depth, nodes, captures, corner_captures, game_ends, seconds=0.0):
+        """The constructor for the PerftResult class.
+        :param depth: Int number of plies enumerated
+        :param nodes: Int number of leaves
+        :param captures: Int number of leaf moves that captured
+        :param corner_captures: Int number of leaf moves that captured a corner square
+        :param game_ends: Int number of leaf moves that ended the game
+        :param seconds: Float number of seconds the run took"""
+        self._depth = depth
+        self._nodes = nodes
+        self._captures = captures
+        self._corner_captures = corner_captures
+        self._game_ends = game_ends
+        self._seconds = seconds
+
+    def get_depth(self):
+        """
+        Method that returns the number of plies enumerated.
+        :return: Int
+        """
+        return self._depth
+
+    def get_nodes(self):
+        """
+        Method that returns the number of leaves.
+        :return: Int
+        """
+        return self._nodes
+
+    def get_captures(self):
+        """
+        Method that returns the number of leaf moves that captured at least one square.
+        :return: Int
+        """
+        return self._captures
+
+    def get_corner_captures(self):
+        """
+        Method that returns the number of leaf moves that captured a corner square.
+        :return: Int
+        """
+        return self._corner_captures
+
+    def get_game_ends(self):
+        """
+        Method that returns the number of leaf moves that ended the game.
+        :return: Int
+        """
+        return self._game_ends
+
+    def get_seconds(self):
+        """
+        Method that returns how long the run took.
+        :return: Float number of seconds
+        """
+        return self._seconds
+
+    def get_nodes_per_second(self):
+        """
+        Method that returns the enumeration speed.
+        :return: Float number of leaves per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self._nodes / self._seconds
+
+    def get_counts(self):
+        """
+        Method that returns the counts, without the time, so results can be compared.
+        :return: (nodes, captures, corner captures, game ends) tuple of ints
+        """
+        return self._nodes, self._captures, self._corner_captures, self._game_ends
+
+    def to_dict(self):
+        """
+        Method that returns the result as a dict, for printing as JSON.
+        :return: Dict of depth, nodes, captures, corner_captures, game_ends, seconds, and nodes_per_second
+        """
+        return {"depth": self._depth, "nodes": self._nodes, "captures": self._captures,
+                "corner_captures": self._corner_captures, "game_ends": self._game_ends,
+                "seconds": self._seconds, "nodes_per_second": self.get_nodes_per_second()}
+
+
+def _leaf_counts(game):
+    """
+    Counts the move just made as a leaf.
+    :param game: HasamiShogiGame right after _execute_move
+    :return: (1, captured, captured a corner, ended the game) tuple of ints
+    """
+    captured = game._undo_stack[-1][2]
+    corner = 0
+    for xy, occupant in captured:
+        if xy in _CORNER_XYS:
+            corner = 1
+            break
+    return 1, 1 if captured else 0, corner, 0 if game.get_game_state() == "UNFINISHED" else 1
+
+
+def _count(game, depth, table):
+    """
+    Counts the leaves below a position.
+    :param game: HasamiShogiGame, left in the same position it started in
+    :param depth: Int plies left, at least 1
+    :param table: Dict of (position hash, depth) -> counts tuple to deduplicate with, or None
+    :return: (nodes, captures, corner captures, game ends) tuple of ints
+    """
+    if table is not None:
+        key = (game.get_position_hash(), depth)
+        counts = table.get(key)
+        if counts is not None:
+            return counts
+
+    nodes = captures = corner_captures = game_ends = 0
+    for origin, destination in list(game.get_legal_moves()):
+        game._execute_move(SQUARE_XY[origin], SQUARE_XY[destination])
+        try:
+            below = _leaf_counts(game) if depth == 1 else _count(game, depth - 1, table)
+        finally:
+            game._unmake_move()
+        nodes += below[0]
+        captures += below[1]
+        corner_captures += below[2]
+        game_ends += below[3]
+
+    counts = (nodes, captures, corner_captures, game_ends)
+    if table is not None:
+        table[key] = counts
+    return counts
+
+
+def perft(game, depth, dedup=False):
+    """
+    Function that counts every move sequence of a number of plies from a game's current position.
+    :param game: HasamiShogiGame, left in the same position it started in
+    :param depth: Int number of plies, 0 or more
+    :param dedup: True to count positions reached through different move orders only once (same totals)
+    :return: PerftResult
+    """
+    start = time.perf_counter()
+    if depth <= 0:
+        counts = (1, 0, 0, 0)
+    else:
+        counts = _count(game, depth, {} if dedup else None)
+    return PerftResult(depth, *counts, seconds=time.perf_counter() - start)
+
+
+def divide(game, depth, dedup=False):
+    """
+    Function that runs perft below every root move separately.
+    :param game: HasamiShogiGame, left in the same position it started in
+    :param depth: Int number of plies including the root move, 1 or more
+    :param dedup: True to share one deduplication table between the root moves
+    :return: Dict of move in algebraic notation (like "i5h5") -> PerftResult of depth - 1 plies below it.
+             The root move itself is counted in the results of depth 1
+    """
+    table = {} if dedup else None
+    results = {}
+    for origin, destination in list(game.get_legal_moves()):
+        start = time.perf_counter()
+        game._execute_move(SQUARE_XY[origin], SQUARE_XY[destination])
+        try:
+            counts = _leaf_counts(game) if depth == 1 else _count(game, depth - 1, table)
+        finally:
+            game._unmake_move()
+        results[SQUARE_NAMES[origin] + SQUARE_NAMES[destination]] = PerftResult(
+            depth - 1, *counts, seconds=time.perf_counter() - start)
+    return results
+
+
+def compare_backends(depth, snapshot=None, backends=None):
+    """
+    Function that checks that every board backend gives the same perft counts.
+    :param depth: Int number of plies, 1 or more
+    :param snapshot: Snapshot string or bytes of the position to start from (see HasamiShogiGame.to_snapshot),
+                     or None for the starting position
+    :param backends: List of backend names to compare, defaults to every key of BOARD_BACKENDS
+    :return: List of (backend, root move, expected counts, counts) tuples for every root move where a backend
+             differs from the first backend. Counts are get_counts tuples, None for a move a backend doesn't have.
+             Empty if every backend agrees
+    """
+    if backends is None:
+        backends = list(BOARD_BACKENDS)
+    divides = {}
+    for backend in backends:
+        game = HasamiShogiGame(backend, quiet=True) if snapshot is None else \
+            HasamiShogiGame.from_snapshot(snapshot, backend, quiet=True)
+        divides[backend] = {move: result.get_counts() for move, result in divide(game, depth).items()}
+
+    expected = divides[backends[0]]
+    differences = []
+    for backend in backends[1:]:
+        for move in sorted(set(expected) | set(divides[backend])):
+            if expected.get(move) != divides[backend].get(move):
+                differences.append((backend, move, expected.get(move), divides[backend].get(move)))
+    return differences
+
+
+def add_arguments(parser):
+    """
+    Adds the perft command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("depth", type=int, help="number of plies to enumerate")
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="standard",
+                        help="board backend to enumerate with")
+    parser.add_argument("--snapshot", default=None, help="snapshot string of the position to start from")
+    parser.add_argument("--dedup", action="store_true", help="count positions reached more than once only once")
+    parser.add_argument("--divide", action="store_true", help="print the counts below every root move")
+    parser.add_argument("--compare", action="store_true", help="check that every board backend agrees")
+
+
+def run_command(args):
+    """
+    Runs perft from parsed command line arguments, printing the counts to stdout.
+    :param args: argparse.Namespace from a parser set up with add_arguments
+    :return: Int exit code, 1 if --compare found a difference and 2 for an invalid snapshot
+    """
+    try:
+        game = HasamiShogiGame(args.backend, quiet=True) if args.snapshot is None else \
+            HasamiShogiGame.from_snapshot(args.snapshot, args.backend, quiet=True)
+    except InvalidSnapshot as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    if args.compare:
+        differences = compare_backends(args.depth, args.snapshot)
+        for backend, move, expected, counts in differences:
+            print("%s %s: expected %s, got %s" % (backend, move, expected, counts))
+        print("%d differences between %s" % (len(differences), ", ".join(BOARD_BACKENDS)))
+        return 1 if differences else 0
+
+    if args.divide and args.depth > 0:
+        for move, result in divide(game, args.depth, args.dedup).items():
+            print("%s: %d" % (move, result.get_nodes()))
+    result = perft(game, args.depth, args.dedup)
+    print("depth: %d  nodes: %d  captures: %d  corner captures: %d  game ends: %d" %
+          (result.get_depth(), result.get_nodes(), result.get_captures(), result.get_corner_captures(),
+           result.get_game_ends()))
+    print("seconds: %.3f  nodes/sec: %.0f" % (result.get_seconds(), result.get_nodes_per_second()))
+    return 0
@@ -0,0 +1,90 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiPerft module
+
+import unittest
+import unittest.mock
+import io
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiPerft import compare_backends as compare_backends
+from HasamiShogiPerft import divide as divide
+from HasamiShogiPerft import perft as perft
+from HasamiShogiTools import main as tools_main
+
+MIDDLE_GAME = "R1R1RR1R1/1R7/5B3/9/4R4/9/2B6/3B5/B1BB1B1BB r 1 2 UNFINISHED"
+
+
+class Test_perft(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiPerft.perft() function."""
+
+    backend = "standard"
+
+    # Known counts from the starting position. The corner captures are i1h1 and i9h9 (and a1b1, a9b9 for red),
+    # which take the empty corners behind them
+    def test1(self):
+        game = HasamiShogiGame(self.backend, quiet=True)
+        snapshot = game.to_snapshot()
+        self.assertEqual((1, 0, 0, 0), perft(game, 0).get_counts())
+        self.assertEqual((63, 2, 2, 0), perft(game, 1).get_counts())
+        self.assertEqual((3717, 124, 124, 0), perft(game, 2).get_counts())
+        self.assertEqual(snapshot, game.to_snapshot())
+
+    # Deduplication gives the same totals
+    def test2(self):
+        game = HasamiShogiGame.from_snapshot(MIDDLE_GAME, self.backend, quiet=True)
+        self.assertEqual(perft(game, 2).get_counts(), perft(game, 2, dedup=True).get_counts())
+
+    # Game ending moves are counted, and the game has no moves after them
+    def test3(self):
+        game = HasamiShogiGame.from_snapshot("1R7/BB7/8R/9/9/9/9/9/9 r 0 8 UNFINISHED", self.backend, quiet=True)
+        result = perft(game, 1)
+        self.assertEqual(1, result.get_game_ends())
+        self.assertEqual(1, result.get_captures())
+        self.assertEqual(0, result.get_corner_captures())
+        self.assertLess(perft(game, 2).get_nodes(), result.get_nodes() * perft(game, 1).get_nodes())
+        self.assertEqual(result.get_nodes(), result.to_dict()["nodes"])
+
+    # Divide adds up to perft
+    def test4(self):
+        game = HasamiShogiGame.from_snapshot(MIDDLE_GAME, self.backend, quiet=True)
+        results = divide(game, 2)
+        total = perft(game, 2).get_counts()
+        self.assertEqual(perft(game, 1).get_nodes(), len(results))
+        for index in range(4):
+            self.assertEqual(total[index], sum(result.get_counts()[index] for result in results.values()))
+        self.assertEqual((1, 0, 0, 0), divide(HasamiShogiGame(self.backend, quiet=True), 1)["i5h5"].get_counts())
+
+
+class Test_perft_bitboard(Test_perft):
+    """Runs the perft unit tests on the bitboard backend."""
+
+    backend = "bitboard"
+
+
+class Test_perft_lines(Test_perft):
+    """Runs the perft unit tests on the lines backend."""
+
+    backend = "lines"
+
+
+class Test_compare_backends(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiPerft.compare_backends() function and the perft command."""
+
+    def test1(self):
+        self.assertEqual([], compare_backends(2))
+        self.assertEqual([], compare_backends(2, MIDDLE_GAME))
+
+    def test2(self):
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(0, tools_main(["perft", "2", "--divide", "--dedup"]))
+        self.assertIn("i5h5: 62", stdout.getvalue())
+        self.assertIn("nodes: 3717", stdout.getvalue())
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(0, tools_main(["perft", "1", "--compare", "--snapshot", MIDDLE_GAME]))
+        self.assertIn("0 differences", stdout.getvalue())
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO):
+            self.assertEqual(2, tools_main(["perft", "1", "--snapshot", "bad"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,383 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Compact binary format for saving large numbers of HasamiShogiGame games, with a streaming writer,
+#              an mmap based reader, and a replayer
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF THE GAME RECORD FORMAT ===============
+# 1) File layout
+#       Every number is little endian.
+#       The file starts with an 8 byte header:
+#           4 bytes  magic b"HSGR"
+#           1 byte   format version (2, version 1 files are read the same way and never have a repetition rule)
+#           3 bytes  reserved, always 0
+#       followed by any number of games, one after another, with no index.
+#
+# 2) Game layout
+#       Every game starts with an 8 byte header:
+#           4 bytes  number of plies
+#           1 byte   flags, bit 0 set means the plies carry capture annotations, bit 1 set means the game was
+#                    played with a repetition rule (see HasamiShogiGame.set_repetition_rule)
+#           1 byte   result, 0 "UNFINISHED", 1 "RED_WON", 2 "BLACK_WON", 3 "DRAW"
+#           1 byte   number of red pieces captured at the end of the game
+#           1 byte   number of black pieces captured at the end of the game
+#       then, only with a repetition rule, 6 bytes:
+#           1 byte   repetitions, 0 for no limit
+#           1 byte   repetition result, 0 "DRAW" or 1 "LOSS"
+#           4 bytes  max plies, 0 for no limit
+#       followed by 2 bytes per ply:
+#           bits 0-12   encoded move, origin square index * 81 + destination square index (see encode_move)
+#           bits 13-15  number of pieces the move captured (7 means 7 or more), 0 when not annotated
+#       Games always start from the starting position with black to move.
+#
+# 3) Reading
+#       read_records maps the file with mmap and yields one GameRecord at a time, so files much larger than
+#       memory can be read. Only the plies of the game being yielded are copied out of the map.
+#
+# 4) Replaying
+#       replay plays a record's moves on a new quiet HasamiShogiGame with the record's repetition rule, checking
+#       that every move is legal and (optionally) that the annotations, result, and captured pieces counts match
+#       the record.
+#
+
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+from HasamiShogiGame import HasamiShogiGame, BOARD_BACKENDS, REPETITION_RESULTS, SQUARE_INDICES
+
+MAGIC = b"HSGR"
+VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+_FILE_HEADER = struct.Struct("<4sB3x")
+_GAME_HEADER = struct.Struct("<IBBBB")
+_REPETITION_RULE = struct.Struct("<BBI")
+_CAPTURES_FLAG = 1
+_REPETITION_RULE_FLAG = 2
+_MOVE_MASK = 0x1FFF
+_CAPTURES_SHIFT = 13
+_MAX_CAPTURES = 7
+RESULTS = ("UNFINISHED", "RED_WON", "BLACK_WON", "DRAW")
+_RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+
+
+class InvalidGameRecord(ValueError):
+    pass
+
+
+class GameRecord:
+    """The GameRecord class is used to represent one saved game, its moves and how it ended.
+    This class will contain the following data members:
+    An array of the encoded move ints, see encode_move
+    An array of the number of pieces each move captured (7 means 7 or more), or None if not annotated
+    The result ("UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW")
+    The number of red pieces captured at the end of the game
+    The number of black pieces captured at the end of the game
+    The (repetitions, result, max plies) repetition rule the game was played with, or None"""
+
+    def __init__(self, moves, result="UNFINISHED", captured_red=0, captured_black=0, captures=None,
+                 repetition_rule=None):
+        """The constructor for the GameRecord class.
+        :param moves: Iterable of encoded move ints
+        :param result: "UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW"
+        :param captured_red: Int number of red pieces captured at the end of the game
+        :param captured_black: Int number of black pieces captured at the end of the game
+        :param captures: Iterable of the number of pieces each move captured, or None
+        :param repetition_rule: (repetitions, result, max plies) tuple of HasamiShogiGame.set_repetition_rule the
+                                game was played with, or None"""
+        if result not in _RESULT_CODES:
+            raise InvalidGameRecord("Unknown game result: " + str(result))
+        self._moves = array("H", moves)
+        if self._moves and max(self._moves) >= 81 * 81:
+            raise InvalidGameRecord("Encoded move out of range: " + str(max(self._moves)))
+        self._captures = None
+        if captures is not None:
+            self._captures = array("B", (min(count, _MAX_CAPTURES) for count in captures))
+            if len(self._captures) != len(self._moves):
+                raise InvalidGameRecord("Capture annotations don't match the number of moves")
+        self._result = result
+        self._captured_red = captured_red
+        self._captured_black = captured_black
+        self._repetition_rule = None
+        if repetition_rule is not None:
+            repetitions, repetition_result, max_plies = repetition_rule
+            # A repetitions count of 1 would make HasamiShogiGame.set_repetition_rule raise a ValueError on replay
+            if (repetition_result not in REPETITION_RESULTS or repetitions == 1 or
+                    not 0 <= (repetitions or 0) <= 255 or not 0 <= (max_plies or 0) < 1 << 32):
+                raise InvalidGameRecord("Invalid repetition rule: " + str(repetition_rule))
+            self._repetition_rule = (repetitions or None, repetition_result, max_plies or None)
+
+    @classmethod
+    def from_game(cls, game, annotate=True):
+        """
+        Creates a record of every move made so far in a game that started from the starting position.
+        :param game: HasamiShogiGame
+        :param annotate: Bool, True to save how many pieces each move captured
+        :return: GameRecord
+        """
+        history = game.get_move_history()
+        return cls([move for move, count in history], game.get_game_state(),
+                   game.get_num_captured_pieces("RED"), game.get_num_captured_pieces("BLACK"),
+                   [count for move, count in history] if annotate else None, game.get_repetition_rule())
+
+    @classmethod
+    def from_selfplay(cls, game):
+        """
+        Creates an unannotated record from a self-play game record (see HasamiShogiSelfPlay.py).
+        :param game: Dict with "moves" in algebraic notation, "result", "captured_red", "captured_black", and
+                     "repetition_rule" if the game had one
+        :return: GameRecord
+        """
+        rule = game.get("repetition_rule")
+        return cls([SQUARE_INDICES[move[:2]] * 81 + SQUARE_INDICES[move[2:]] for move in game["moves"]],
+                   game["result"], game["captured_red"], game["captured_black"],
+                   repetition_rule=None if rule is None else tuple(rule))
+
+    def get_moves(self):
+        """
+        Method that returns the record's moves.
+        :return: array of encoded move ints
+        """
+        return self._moves
+
+    def get_captures(self):
+        """
+        Method that returns the number of pieces each move captured.
+        :return: array of ints (7 means 7 or more), or None if the record isn't annotated
+        """
+        return self._captures
+
+    def get_result(self):
+        """
+        Method that returns the game state at the end of the game.
+        :return: "UNFINISHED", "RED_WON", "BLACK_WON", or "DRAW"
+        """
+        return self._result
+
+    def get_num_captured_pieces(self, player):
+        """
+        Method that returns the number of pieces of a color captured at the end of the game.
+        :param player: "BLACK" or "RED"
+        :return: Int, 0-9
+        """
+        return self._captured_red if player == "RED" else self._captured_black
+
+    def get_repetition_rule(self):
+        """
+        Method that returns the repetition rule the game was played with.
+        :return: (repetitions, result, max plies) tuple, see HasamiShogiGame.set_repetition_rule, or None
+        """
+        return self._repetition_rule
+
+    def to_bytes(self):
+        """
+        Method that packs the record in the game layout described at the top of the file.
+        :return: bytes
+        """
+        plies = array("H", self._moves)
+        flags = 0
+        if self._captures is not None:
+            flags |= _CAPTURES_FLAG
+            for ply, count in enumerate(self._captures):
+                plies[ply] |= count << _CAPTURES_SHIFT
+        rule = b""
+        if self._repetition_rule is not None:
+            flags |= _REPETITION_RULE_FLAG
+            repetitions, result, max_plies = self._repetition_rule
+            rule = _REPETITION_RULE.pack(repetitions or 0, REPETITION_RESULTS.index(result), max_plies or 0)
+        if sys.byteorder == "big":
+            plies.byteswap()
+        return _GAME_HEADER.pack(len(plies), flags, _RESULT_CODES[self._result], self._captured_red,
+                                 self._captured_black) + rule + plies.tobytes()
+
+
+class GameRecordWriter:
+    """The GameRecordWriter class is used to stream game records to a binary file.
+    This class will contain the following data members:
+    The writable binary file the records are written to
+    The number of records written so far"""
+
+    def __init__(self, output):
+        """The constructor for the GameRecordWriter class.
+        Writes the file header.
+        :param output: Writable binary file, positioned at its start"""
+        self._output = output
+        self._games_written = 0
+        output.write(_FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record):
+        """
+        Method that appends a record to the file.
+        :param record: GameRecord
+        :return: None
+        """
+        self._output.write(record.to_bytes())
+        self._games_written += 1
+
+    def write_game(self, game, annotate=True):
+        """
+        Method that appends a record of a game's moves to the file.
+        :param game: HasamiShogiGame that started from the starting position
+        :param annotate: Bool, True to save how many pieces each move captured
+        :return: None
+        """
+        self.write(GameRecord.from_game(game, annotate))
+
+    def get_games_written(self):
+        """
+        Method that returns how many records have been written.
+        :return: Int
+        """
+        return self._games_written
+
+
+def iter_records(buffer):
+    """
+    Generator that reads game records from a buffer holding a whole record file.
+    :param buffer: bytes, bytearray, memoryview, or mmap of the file
+    :return: Generator of GameRecord
+    """
+    if len(buffer) < _FILE_HEADER.size:
+        raise InvalidGameRecord("File is too short to be a game record file")
+    magic, version = _FILE_HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise InvalidGameRecord("Not a game record file")
+    if version not in _READABLE_VERSIONS:
+        raise InvalidGameRecord("Unsupported game record version: " + str(version))
+
+    position = _FILE_HEADER.size
+    end = len(buffer)
+    while position < end:
+        if position + _GAME_HEADER.size > end:
+            raise InvalidGameRecord("Truncated game header at byte " + str(position))
+        plies, flags, result, captured_red, captured_black = _GAME_HEADER.unpack_from(buffer, position)
+        position += _GAME_HEADER.size
+        rule = None
+        if flags & _REPETITION_RULE_FLAG:
+            if position + _REPETITION_RULE.size > end:
+                raise InvalidGameRecord("Truncated repetition rule at byte " + str(position))
+            repetitions, rule_result, max_plies = _REPETITION_RULE.unpack_from(buffer, position)
+            position += _REPETITION_RULE.size
+            if rule_result >= len(REPETITION_RESULTS):
+                raise InvalidGameRecord("Unknown repetition result code: " + str(rule_result))
+            rule = (repetitions, REPETITION_RESULTS[rule_result], max_plies)
+        if position + plies * 2 > end:
+            raise InvalidGameRecord("Truncated game at byte " + str(position))
+        if result >= len(RESULTS):
+            raise InvalidGameRecord("Unknown game result code: " + str(result))
+
+        moves = array("H")
+        moves.frombytes(buffer[position:position + plies * 2])
+        position += plies * 2
+        if sys.byteorder == "big":
+            moves.byteswap()
+
+        captures = None
+        if flags & _CAPTURES_FLAG:
+            captures = [move >> _CAPTURES_SHIFT for move in moves]
+            moves = array("H", [move & _MOVE_MASK for move in moves])
+        yield GameRecord(moves, RESULTS[result], captured_red, captured_black, captures, rule)
+
+
+def read_records(path):
+    """
+    Generator that reads game records from a file without loading the whole file into memory.
+    :param path: Path of a file written by GameRecordWriter
+    :return: Generator of GameRecord
+    """
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:
+            raise InvalidGameRecord("File is too short to be a game record file")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from iter_records(buffer)
+
+
+def replay(record, backend="standard", verify=True):
+    """
+    Function that plays a record's moves on a new game, with the repetition rule the record was played with.
+    :param record: GameRecord
+    :param backend: Board backend name to play with
+    :param verify: Bool, True to check the capture annotations, result, and captured pieces counts
+    :return: The quiet HasamiShogiGame after the last move
+    """
+    game = HasamiShogiGame(backend, quiet=True)
+    if record.get_repetition_rule() is not None:
+        game.set_repetition_rule(*record.get_repetition_rule())
+    captures = record.get_captures() if verify else None
+    for ply, move in enumerate(record.get_moves()):
+        result = game.try_move_encoded(move)
+        if not result.is_success():
+            raise InvalidGameRecord("Illegal move at ply %d: %s" % (ply, result.get_reason().value))
+        if captures is not None and min(len(result.get_captured()), _MAX_CAPTURES) != captures[ply]:
+            raise InvalidGameRecord("Capture annotation doesn't match the move at ply %d" % ply)
+
+    if verify and (game.get_game_state() != record.get_result() or
+                   game.get_num_captured_pieces("RED") != record.get_num_captured_pieces("RED") or
+                   game.get_num_captured_pieces("BLACK") != record.get_num_captured_pieces("BLACK")):
+        raise InvalidGameRecord("Replayed game doesn't match the record's result")
+    return game
+
+
+def convert_jsonl(input_file, output):
+    """
+    Function that converts a self-play JSON lines file (see HasamiShogiSelfPlay.py) to the binary format.
+    :param input_file: Readable text file of JSON lines
+    :param output: Writable binary file
+    :return: Int number of games converted
+    """
+    writer = GameRecordWriter(output)
+    for line in input_file:
+        if line.strip():
+            writer.write(GameRecord.from_selfplay(json.loads(line)))
+    return writer.get_games_written()
+
+
+def add_arguments(parser):
+    """
+    Adds the game record command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("action", choices=("convert", "check"),
+                        help="convert a self-play JSON lines file, or read and replay every game of a record file")
+    parser.add_argument("input", help="file to read")
+    parser.add_argument("output", nargs="?", help="record file to write when converting")
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="standard",
+                        help="board backend to replay with")
+
+
+def run_command(args):
+    """
+    Runs a game record command from parsed command line arguments and prints the results to stderr.
+    :param args: argparse.Namespace from a parser set up with add_arguments
+    :return: Int exit code
+    """
+    if args.action == "convert":
+        if args.output is None:
+            print("convert needs an output file", file=sys.stderr)
+            return 2
+        with open(args.input) as input_file, open(args.output, "wb") as output:
+            games = convert_jsonl(input_file, output)
+        print("games: %d" % games, file=sys.stderr)
+        return 0
+
+    start = time.perf_counter()
+    games = plies = 0
+    for record in read_records(args.input):
+        games += 1
+        plies += len(record.get_moves())
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in read_records(args.input):
+        replay(record, args.backend)
+    replay_seconds = time.perf_counter() - start
+
+    print("games: %d  plies: %d" % (games, plies), file=sys.stderr)
+    print("read games/sec: %.1f  replay plies/sec: %.1f" %
+          (games / read_seconds if read_seconds > 0 else 0.0, plies / replay_seconds if replay_seconds > 0 else 0.0),
+          file=sys.stderr)
+    return 0
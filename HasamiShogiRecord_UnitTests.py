@@ -0,0 +1,194 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiRecord module
+
+import unittest
+import unittest.mock
+import io
+import os
+import random
+import tempfile
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import encode_move as encode_move
+from HasamiShogiRecord import GameRecord as GameRecord
+from HasamiShogiRecord import GameRecordWriter as GameRecordWriter
+from HasamiShogiRecord import InvalidGameRecord as InvalidGameRecord
+from HasamiShogiRecord import iter_records as iter_records
+from HasamiShogiRecord import read_records as read_records
+from HasamiShogiRecord import replay as replay
+from HasamiShogiSelfPlay import run_selfplay as run_selfplay
+from HasamiShogiTools import main as tools_main
+
+
+class FirstMoveRandom(random.Random):
+    """A random.Random that always picks the first choice."""
+
+    def randrange(self, *args):
+        return 0
+
+
+def play_random_game(seed, max_plies=200):
+    """Plays random legal moves and returns the game."""
+    rng = random.Random(seed)
+    game = HasamiShogiGame(quiet=True)
+    while game.get_game_state() == "UNFINISHED" and len(game.get_move_history()) < max_plies:
+        move = rng.choice(list(game.get_legal_moves()))
+        game.try_move_encoded(move[0] * 81 + move[1])
+    return game
+
+
+class Test_GameRecordWriter(unittest.TestCase):
+    """Contains unit tests for writing and reading back game records."""
+
+    # Records read back exactly as they were written
+    def test1(self):
+        games = [play_random_game(seed) for seed in range(5)]
+        output = io.BytesIO()
+        writer = GameRecordWriter(output)
+        for number, game in enumerate(games):
+            writer.write_game(game, annotate=number % 2 == 0)
+        self.assertEqual(5, writer.get_games_written())
+
+        records = list(iter_records(output.getvalue()))
+        self.assertEqual(5, len(records))
+        for number, (game, record) in enumerate(zip(games, records)):
+            history = game.get_move_history()
+            self.assertEqual([move for move, count in history], list(record.get_moves()))
+            if number % 2 == 0:
+                self.assertEqual([min(count, 7) for move, count in history], list(record.get_captures()))
+            else:
+                self.assertIsNone(record.get_captures())
+            self.assertEqual(game.get_game_state(), record.get_result())
+            self.assertEqual(game.get_num_captured_pieces("RED"), record.get_num_captured_pieces("RED"))
+
+    # Two bytes per ply plus the headers
+    def test2(self):
+        output = io.BytesIO()
+        GameRecordWriter(output).write(GameRecord([encode_move("i5", "h5"), encode_move("a9", "b9")]))
+        self.assertEqual(8 + 8 + 2 * 2, len(output.getvalue()))
+
+    # Bad files and records are rejected
+    def test3(self):
+        with self.assertRaises(InvalidGameRecord):
+            list(iter_records(b"NOPE\x01\x00\x00\x00"))
+        output = io.BytesIO()
+        GameRecordWriter(output).write(GameRecord([encode_move("i5", "h5")]))
+        with self.assertRaises(InvalidGameRecord):
+            list(iter_records(output.getvalue()[:-1]))
+        with self.assertRaises(InvalidGameRecord):
+            GameRecord([81 * 81])
+        with self.assertRaises(InvalidGameRecord):
+            GameRecord([], result="STALEMATE")
+        with self.assertRaises(InvalidGameRecord):
+            GameRecord([], repetition_rule=(1, "DRAW", None))
+        output = io.BytesIO()
+        GameRecordWriter(output).write(GameRecord([], repetition_rule=(3, "DRAW", None)))
+        corrupted = bytearray(output.getvalue())
+        corrupted[16] = 1  # The repetitions count, after the file and game headers
+        with self.assertRaises(InvalidGameRecord):
+            list(iter_records(bytes(corrupted)))
+
+
+class Test_read_records(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiRecord.read_records() function."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".hsgr")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    # Reading a file through mmap
+    def test1(self):
+        games = [play_random_game(seed) for seed in range(3)]
+        with open(self.path, "wb") as output:
+            writer = GameRecordWriter(output)
+            for game in games:
+                writer.write_game(game)
+        records = list(read_records(self.path))
+        self.assertEqual([[move for move, count in game.get_move_history()] for game in games],
+                         [list(record.get_moves()) for record in records])
+
+    # A file with no games, and an empty file
+    def test2(self):
+        with open(self.path, "wb") as output:
+            GameRecordWriter(output)
+        self.assertEqual([], list(read_records(self.path)))
+        open(self.path, "wb").close()
+        with self.assertRaises(InvalidGameRecord):
+            list(read_records(self.path))
+
+    # Binary self-play files and the command line check
+    def test3(self):
+        with open(self.path, "wb") as output:
+            run_selfplay(4, output, seed=3, max_plies=150, record_format="binary")
+        self.assertEqual(4, len(list(read_records(self.path))))
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(0, tools_main(["record", "check", self.path]))
+        self.assertIn("replay plies/sec", stderr.getvalue())
+
+    # Games ended by a repetition rule keep the rule, so they replay to the same result. Always playing the first
+    # legal move repeats positions
+    def test4(self):
+        with unittest.mock.patch("HasamiShogiSelfPlay.random.Random", FirstMoveRandom):
+            with unittest.mock.patch("sys.stderr", new_callable=io.StringIO):
+                self.assertEqual(0, tools_main(["selfplay", "--games", "2", "--repetitions", "3", "--format",
+                                                "binary", "--output", self.path]))
+        records = list(read_records(self.path))
+        self.assertEqual(["DRAW", "DRAW"], [record.get_result() for record in records])
+        for record in records:
+            self.assertEqual((3, "DRAW", None), record.get_repetition_rule())
+            self.assertEqual("DRAW", replay(record).get_game_state())
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO):
+            self.assertEqual(0, tools_main(["record", "check", self.path]))
+
+        # A repetition loss and a ply limit, through from_game
+        game = HasamiShogiGame(quiet=True)
+        game.set_repetition_rule(2, "LOSS", 1000)
+        for move in ["i2h2", "a2b2", "h2i2", "b2a2"]:
+            game.make_move(move[:2], move[2:])
+        output = io.BytesIO()
+        GameRecordWriter(output).write_game(game)
+        record = next(iter_records(output.getvalue()))
+        self.assertEqual((2, "LOSS", 1000), record.get_repetition_rule())
+        self.assertEqual("BLACK_WON", replay(record).get_game_state())
+
+
+class Test_replay(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiRecord.replay() function."""
+    backend = "standard"
+
+    # Replaying gives the same final position
+    def test1(self):
+        for seed in range(5):
+            game = play_random_game(seed, max_plies=400)
+            record = next(iter_records(self.write(GameRecord.from_game(game))))
+            replayed = replay(record, self.backend)
+            self.assertEqual(game.get_position_hash(), replayed.get_position_hash())
+            self.assertEqual(game.get_game_state(), replayed.get_game_state())
+
+    # Illegal moves and records that don't match their moves
+    def test2(self):
+        with self.assertRaises(InvalidGameRecord):
+            replay(GameRecord([encode_move("a1", "b1")]), self.backend)
+        with self.assertRaises(InvalidGameRecord):
+            replay(GameRecord([encode_move("i5", "h5")], result="BLACK_WON"), self.backend)
+        with self.assertRaises(InvalidGameRecord):
+            replay(GameRecord([encode_move("i5", "h5")], captures=[1]), self.backend)
+        game = replay(GameRecord([encode_move("i5", "h5")], captures=[1]), self.backend, verify=False)
+        self.assertEqual("RED", game.get_active_player())
+
+    @staticmethod
+    def write(record):
+        output = io.BytesIO()
+        GameRecordWriter(output).write(record)
+        return output.getvalue()
+
+
+class Test_replay_bitboard(Test_replay):
+    backend = "bitboard"
+
+
+if __name__ == "__main__":
+    unittest.main()
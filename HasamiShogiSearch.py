@@ -0,0 +1,712 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Alpha-beta search engine that plays the HasamiShogiGame class
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE SEARCH WORKS ===============
+# 1) Searching
+#       The search is negamax with alpha-beta pruning. Scores are always from the point of view of the player
+#       whose turn it is, so a child's score is negated when it is returned to its parent.
+#       Moves are made and taken back on the game that is being searched (HasamiShogiGame._execute_move and
+#       HasamiShogiGame._unmake_move), so the game is never copied.
+#
+# 2) Iterative deepening
+#       The root is searched to depth 1, then 2, and so on until the requested depth or the time limit is
+#       reached. The best move of each finished depth is searched first on the next depth.
+#       If the time limit runs out part way through a depth, the result of the last finished depth is used.
+#
+# 3) Move ordering
+#       Moves that capture pieces (HasamiShogiGame.get_capturing_moves) are searched first, most captures first,
+#       followed by the killer moves for the current ply (moves that caused a cutoff in a sibling position), then
+#       every other move sorted by its history score (how often and how deeply the move has caused a cutoff
+#       anywhere in the search).
+#
+# 4) Evaluation
+#       Positions at the end of the search are scored by an evaluation function that takes a HasamiShogiGame
+#       and returns a score for the active player. The default one scores captured pieces and mobility.
+#       The game tracks its evaluation features while it is searched (HasamiShogiGame.set_feature_tracking), so
+#       mobility is read from counters kept up to date by every move instead of generating both players' moves.
+#       Games that have been won are scored as WIN_SCORE minus the number of plies it took, so faster wins
+#       are preferred. A player with no legal moves scores 0, and so does a game drawn by a repetition rule
+#       (HasamiShogiGame.set_repetition_rule). Repetitions depend on the moves that reached a position, so with
+#       a rule, stored scores of positions that can repeat are only as good as the history they were found in.
+#
+# 5) Transposition table
+#       Positions are stored by their Zobrist hash (HasamiShogiGame.get_position_hash) in a TranspositionTable,
+#       so a position reached through a different move order isn't searched again.
+#       The table is two preallocated arrays of 64 bit ints, one for keys and one for packed entries:
+#           bits 0-13: best move as origin * 81 + destination + 1 (0 for no move)
+#           bits 14-15: bound type (EXACT, LOWER, or UPPER, 0 for an empty slot)
+#           bits 16-22: depth searched
+#           bits 23-45: score + SCORE_OFFSET
+#       Every bucket has two slots. The first keeps the deepest search of any position in the bucket, the
+#       second is always replaced. A new entry that is at least as deep as the first slot's entry moves that
+#       entry into the second slot.
+#       Win scores are stored relative to the stored position rather than the root, so they stay correct
+#       when the position is reached at a different ply.
+#
+# 6) Ties and parallel search
+#       When several root moves have the best score, the lowest (origin, destination) move is chosen, so the
+#       result doesn't depend on the order the root moves were searched in.
+#       find_best_move_parallel splits the root moves between worker processes. Each worker gets the pickled
+#       game (a packed snapshot, plus the repetition rule and position counts of a game with a rule, so
+#       repetitions are scored like find_best_move scores them), searches the moves it is given with a full
+#       window, and keeps its own transposition table between moves. The best score (lowest move on ties) is
+#       picked from every worker's scores, so it matches find_best_move at the same depth.
+#       With baseline=True find_best_move is first timed at the same depth, and the result reports the speedup
+#       (one core time / parallel time) next to the utilization (worker time / parallel time), which only says
+#       how busy the workers were.
+#
+# 7) Endgame tablebase
+#       An AlphaBetaSearch can be given a HasamiShogiTablebase.Tablebase. Every position the search reaches that
+#       has a table is scored from the table instead of being searched, using the same scores as a search that
+#       sees the end of the game: WIN_SCORE minus the plies to the end for wins, and 0 for draws.
+#       The tables are made without repetition rules, and a rule can draw or end a line the table says is won,
+#       so games with a repetition rule (HasamiShogiGame.set_repetition_rule) are searched without probing.
+#
+
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from HasamiShogiGame import HasamiShogiGame, SQUARE_NAMES, SQUARE_XY
+
+WIN_SCORE = 100000  # Score of a won position, any score within MAX_DEPTH of it is a forced win
+MAX_DEPTH = 64  # Deepest search iterative deepening will start
+DEFAULT_DEPTH = 3  # Depth searched when neither a depth nor a time limit is given
+PIECE_VALUE = 100  # Evaluation score of one captured piece
+MOBILITY_VALUE = 1  # Evaluation score of one legal move
+_TIME_CHECK_INTERVAL = 1024  # Number of nodes searched between checks of the clock
+DEFAULT_TABLE_MEGABYTES = 16  # Size of the transposition table find_best_move uses when none is given
+
+# Transposition table bound types
+EXACT = 1  # The score is the exact score of the position
+LOWER = 2  # The position scores at least the score (the search failed high)
+UPPER = 3  # The position scores at most the score (the search failed low)
+_ENTRY_BYTES = 16  # An 8 byte key and 8 bytes of packed data
+_SCORE_OFFSET = 1 << 22
+
+
+def evaluate(game):
+    """
+    Default evaluation function. Scores the difference in captured pieces and the difference in legal moves.
+    :param game: An unfinished HasamiShogiGame
+    :return: Int score of the position for the active player
+    """
+    player = game.get_active_player()
+    opponent = "RED" if player == "BLACK" else "BLACK"
+    material = game.get_num_captured_pieces(opponent) - game.get_num_captured_pieces(player)
+    mobility = game.get_mobility(player) - game.get_mobility(opponent)
+    return material * PIECE_VALUE + mobility * MOBILITY_VALUE
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit has run out."""
+    pass
+
+
+class TranspositionTable:
+    """The TranspositionTable class stores search results by position hash in a fixed amount of memory.
+    This class will contain the following data members:
+    An array of position hash keys, two slots for every bucket
+    An array of packed entries (move, bound, depth, score), matching the keys array
+    A mask used to turn a position hash into a bucket number
+    Counters for probes, hits, misses, collisions, stores, and replacements"""
+
+    def __init__(self, megabytes=DEFAULT_TABLE_MEGABYTES):
+        """The constructor for the TranspositionTable class.
+        :param megabytes: Maximum size of the table in MB. The number of buckets is rounded down to a power of 2"""
+        buckets = 1
+        while buckets * 2 * 2 * _ENTRY_BYTES <= megabytes * 1024 * 1024:
+            buckets *= 2
+        self._mask = buckets - 1
+        self._keys = array("Q", bytes(buckets * 2 * 8))
+        self._entries = array("Q", bytes(buckets * 2 * 8))
+        self._probes = 0
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
+        self._replacements = 0
+
+    def clear(self):
+        """
+        Method that empties the table and resets its counters.
+        :return: None
+        """
+        self._keys = array("Q", bytes(len(self._keys) * 8))
+        self._entries = array("Q", bytes(len(self._entries) * 8))
+        self._probes = 0
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
+        self._replacements = 0
+
+    def probe(self, key, ply):
+        """
+        Method that looks up a position.
+        :param key: 64 bit position hash
+        :param ply: Int number of plies from the root of the search, used to adjust win scores
+        :return: (depth, score, bound, move) tuple, move is an (origin, destination) tuple or None.
+                 None if the position isn't in the table
+        """
+        self._probes += 1
+        depth_slot = (key & self._mask) * 2
+        for slot in (depth_slot, depth_slot + 1):
+            entry = self._entries[slot]
+            if self._keys[slot] == key and entry:
+                self._hits += 1
+                move_code = entry & 0x3FFF
+                move = None if move_code == 0 else divmod(move_code - 1, 81)
+                score = ((entry >> 23) & 0x7FFFFF) - _SCORE_OFFSET
+                if score >= WIN_SCORE - MAX_DEPTH:
+                    score -= ply
+                elif score <= -WIN_SCORE + MAX_DEPTH:
+                    score += ply
+                return (entry >> 16) & 0x7F, score, (entry >> 14) & 0x3, move
+        self._misses += 1
+        if self._entries[depth_slot] or self._entries[depth_slot + 1]:
+            self._collisions += 1  # The bucket is holding other positions
+        return None
+
+    def store(self, key, ply, depth, score, bound, move):
+        """
+        Method that saves the result of searching a position.
+        :param key: 64 bit position hash
+        :param ply: Int number of plies from the root of the search, used to adjust win scores
+        :param depth: Int depth the position was searched to
+        :param score: Int score of the position for the active player
+        :param bound: EXACT, LOWER, or UPPER
+        :param move: Best (origin, destination) move found, or None
+        :return: None
+        """
+        self._stores += 1
+        if score >= WIN_SCORE - MAX_DEPTH:
+            score += ply
+        elif score <= -WIN_SCORE + MAX_DEPTH:
+            score -= ply
+        move_code = 0 if move is None else move[0] * 81 + move[1] + 1
+        entry = (((score + _SCORE_OFFSET) << 23) | (min(depth, 0x7F) << 16) | (bound << 14) | move_code)
+
+        depth_slot = (key & self._mask) * 2
+        keys = self._keys
+        entries = self._entries
+        if keys[depth_slot] == key or depth >= (entries[depth_slot] >> 16) & 0x7F:
+            # Keep the entry being pushed out of the depth preferred slot in the always replace slot
+            if entries[depth_slot] and keys[depth_slot] != key:
+                self._replacements += 1
+                keys[depth_slot + 1] = keys[depth_slot]
+                entries[depth_slot + 1] = entries[depth_slot]
+            keys[depth_slot] = key
+            entries[depth_slot] = entry
+        else:
+            if entries[depth_slot + 1] and keys[depth_slot + 1] != key:
+                self._replacements += 1
+            keys[depth_slot + 1] = key
+            entries[depth_slot + 1] = entry
+
+    def get_stats(self):
+        """
+        Method that returns the table's counters, used to pick a table size.
+        :return: Dict of counter name -> value. "occupied" is the fraction of slots in use
+        """
+        slots = len(self._entries)
+        used = slots - self._entries.count(0)
+        return {"megabytes": slots * _ENTRY_BYTES / (1024 * 1024),
+                "slots": slots,
+                "occupied": used / slots,
+                "probes": self._probes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "collisions": self._collisions,
+                "stores": self._stores,
+                "replacements": self._replacements}
+
+
+class SearchResult:
+    """The SearchResult class holds the outcome of a search.
+    This class will contain the following data members:
+    The best move found, an (origin, destination) tuple of square indices, or None if there are no legal moves
+    The score of the best move for the player that was searched for
+    The depth that was completely searched
+    The number of nodes searched
+    The number of seconds the search took"""
+
+    def __init__(self, move, score, depth, nodes, seconds):
+        """The constructor for the SearchResult class.
+        :param move: (origin, destination) tuple of square indices, or None
+        :param score: Int score of the move
+        :param depth: Int depth that was completely searched
+        :param nodes: Int number of nodes searched
+        :param seconds: Float number of seconds the search took"""
+        self._move = move
+        self._score = score
+        self._depth = depth
+        self._nodes = nodes
+        self._seconds = seconds
+
+    def get_move(self):
+        """
+        Method that returns the best move found.
+        :return: (origin, destination) tuple of square indices, or None if there were no legal moves
+        """
+        return self._move
+
+    def get_score(self):
+        """
+        Method that returns the score of the best move.
+        :return: Int score, WIN_SCORE - N means the player can force a win in N plies
+        """
+        return self._score
+
+    def get_depth(self):
+        """
+        Method that returns the depth that was completely searched.
+        :return: Int depth
+        """
+        return self._depth
+
+    def get_nodes(self):
+        """
+        Method that returns the number of positions searched.
+        :return: Int number of nodes
+        """
+        return self._nodes
+
+    def get_seconds(self):
+        """
+        Method that returns how long the search took.
+        :return: Float number of seconds
+        """
+        return self._seconds
+
+    def get_nodes_per_second(self):
+        """
+        Method that returns the search speed.
+        :return: Float number of nodes searched per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self._nodes / self._seconds
+
+
+class AlphaBetaSearch:
+    """The AlphaBetaSearch class searches a HasamiShogiGame for the best move.
+    This class will contain the following data members:
+    The evaluation function used at the end of the search
+    Killer moves for each ply
+    History scores for each (origin, destination) move
+    A TranspositionTable (or None)
+    An endgame Tablebase (or None)
+    The number of nodes searched
+    The time the search has to stop by (or None)
+    Whether the searched game tracks its evaluation features during the search"""
+
+    def __init__(self, evaluation=evaluate, transposition_table=None, tablebase=None, track_features=True):
+        """The constructor for the AlphaBetaSearch class.
+        :param evaluation: Function taking an unfinished HasamiShogiGame and returning a score for the active
+                           player
+        :param transposition_table: TranspositionTable to store positions in, or None to search without one
+        :param tablebase: HasamiShogiTablebase.Tablebase to score positions with few pieces from, or None. Not
+                          probed for games with a repetition rule
+        :param track_features: True to turn on the game's feature tracking while searching, so evaluations using
+                               HasamiShogiGame.get_mobility or get_features take constant time"""
+        self._evaluation = evaluation
+        self._table = transposition_table
+        self._tablebase = tablebase
+        self._track_features = track_features
+        self._killers = [[None, None] for ply in range(MAX_DEPTH + 1)]
+        self._history = [0] * (81 * 81)
+        self._nodes = 0
+        self._deadline = None
+
+    def search(self, game, depth=None, time_limit=None, info=None):
+        """
+        Method that searches the game's current position using iterative deepening.
+        The game is left in the same position it started in.
+        :param game: The HasamiShogiGame to search
+        :param depth: Int depth to search to. Defaults to MAX_DEPTH with a time limit, else DEFAULT_DEPTH
+        :param time_limit: Float number of seconds the search may take, or None for no limit
+        :param info: Function called with a SearchResult after every finished depth, or None
+        :return: A SearchResult for the deepest finished depth
+        """
+        if depth is None:
+            depth = MAX_DEPTH if time_limit is not None else DEFAULT_DEPTH
+        depth = min(depth, MAX_DEPTH)
+        start = time.perf_counter()
+        self._deadline = None if time_limit is None else start + time_limit
+        self._nodes = 0
+
+        moves = self._order_moves(game, list(game.get_legal_moves()), 0)
+        result = SearchResult(moves[0] if moves else None, 0, 0, 0, 0.0)
+        if not moves:
+            return result
+
+        tracking = game.is_tracking_features()
+        if self._track_features and not tracking:
+            game.set_feature_tracking(True)
+        try:
+            result = self._deepen(game, moves, depth, start, info, result)
+        finally:
+            if not tracking:
+                game.set_feature_tracking(False)
+        return SearchResult(result.get_move(), result.get_score(), result.get_depth(), self._nodes,
+                            time.perf_counter() - start)
+
+    def _deepen(self, game, moves, depth, start, info, result):
+        """
+        Searches the root moves to depth 1, 2, and so on, for search.
+        :param game: The HasamiShogiGame to search
+        :param moves: List of legal (origin, destination) moves, reordered as each depth finishes
+        :param depth: Int deepest depth to search
+        :param start: Float time.perf_counter() the search started at
+        :param info: Function called with a SearchResult after every finished depth, or None
+        :param result: SearchResult to return if no depth finishes
+        :return: SearchResult of the deepest finished depth
+        """
+        for current_depth in range(1, depth + 1):
+            try:
+                move, score = self._search_root(game, moves, current_depth)
+            except SearchTimeout:
+                break
+            result = SearchResult(move, score, current_depth, self._nodes, time.perf_counter() - start)
+            if info is not None:
+                info(result)
+
+            # Search the best move first on the next depth, and stop early once a forced result is found
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN_SCORE - MAX_DEPTH:
+                break
+        return result
+
+    def _search_root(self, game, moves, depth):
+        """
+        Searches every root move to a fixed depth.
+        :param game: The HasamiShogiGame to search
+        :param moves: List of legal (origin, destination) moves, searched in order
+        :param depth: Int depth to search to
+        :return: (best move, score) tuple. Of the moves with the best score, the lowest move is returned
+        """
+        alpha = -WIN_SCORE - 1
+        best_move = None
+        for move in moves:
+            game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+            try:
+                # The window starts one below alpha so moves tying the best move get exact scores
+                score = -self._negamax(game, depth - 1, -WIN_SCORE - 1, -alpha + 1, 1)
+            finally:
+                game._unmake_move()
+            if score > alpha or (score == alpha and move < best_move):
+                alpha = score
+                best_move = move
+        return best_move, alpha
+
+    def _negamax(self, game, depth, alpha, beta, ply):
+        """
+        Searches a position with alpha-beta pruning.
+        :param game: The HasamiShogiGame to search, left in the same position it started in
+        :param depth: Int number of plies left to search
+        :param alpha: Int score the active player is already guaranteed
+        :param beta: Int score the opponent is already guaranteed (as a score for the active player)
+        :param ply: Int number of plies from the root
+        :return: Int score of the position for the active player
+        """
+        self._nodes += 1
+        if self._deadline is not None and self._nodes % _TIME_CHECK_INTERVAL == 0:
+            if time.perf_counter() > self._deadline:
+                raise SearchTimeout
+
+        # The player who just moved usually won, so the player to move here has lost. A repetition rule can
+        # also draw the game, or make the player who just moved lose, which passes the turn to the winner
+        state = game.get_game_state()
+        if state != "UNFINISHED":
+            if state == "DRAW":
+                return 0
+            if game.get_active_player() == game._undo_stack[-1][3]:
+                return -WIN_SCORE + ply
+            return WIN_SCORE - ply
+        # Tables know nothing of repetitions, so they aren't used for games with a repetition rule
+        if self._tablebase is not None and game.get_repetition_rule() is None:
+            entry = self._tablebase.probe(game)
+            if entry is not None:
+                return tablebase_score(entry, ply)
+        if depth <= 0 or ply >= MAX_DEPTH:
+            return self._evaluation(game)
+
+        # Use a stored result if it was searched deep enough, else search its best move first
+        table = self._table
+        table_move = None
+        if table is not None:
+            key = game.get_position_hash()
+            entry = table.probe(key, ply)
+            if entry is not None:
+                entry_depth, entry_score, bound, table_move = entry
+                if entry_depth >= depth:
+                    if bound == EXACT:
+                        return entry_score
+                    if bound == LOWER and entry_score >= beta:
+                        return beta
+                    if bound == UPPER and entry_score <= alpha:
+                        return alpha
+
+        moves = self._order_moves(game, list(game.get_legal_moves()), ply)
+        if not moves:
+            return 0
+        if table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+
+        best_move = None
+        bound = UPPER
+        for move in moves:
+            game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+            try:
+                score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game._unmake_move()
+            if score >= beta:
+                self._store_cutoff(move, depth, ply)
+                if table is not None:
+                    table.store(key, ply, depth, beta, LOWER, move)
+                return beta
+            if score > alpha:
+                alpha = score
+                best_move = move
+                bound = EXACT
+        if table is not None:
+            table.store(key, ply, depth, alpha, bound, best_move)
+        return alpha
+
+    def _order_moves(self, game, moves, ply):
+        """
+        Sorts moves so the ones most likely to be best are searched first.
+        :param game: The HasamiShogiGame the moves are for
+        :param moves: List of (origin, destination) moves
+        :param ply: Int number of plies from the root, used to look up killer moves
+        :return: The sorted list of moves
+        """
+        capturing_moves = game.get_capturing_moves()
+        killers = self._killers[ply]
+        history = self._history
+        scores = {}
+        for move in moves:
+            captured = capturing_moves.get(move)
+            if captured:
+                scores[move] = (2, len(captured))
+            elif move == killers[0] or move == killers[1]:
+                scores[move] = (1, 0)
+            else:
+                scores[move] = (0, history[move[0] * 81 + move[1]])
+        moves.sort(key=scores.__getitem__, reverse=True)
+        return moves
+
+    def _store_cutoff(self, move, depth, ply):
+        """
+        Records a move that caused a beta cutoff in the killer and history tables.
+        :param move: The (origin, destination) move
+        :param depth: Int depth the move was searched at
+        :param ply: Int number of plies from the root
+        :return: None
+        """
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[move[0] * 81 + move[1]] += depth * depth
+
+
+def tablebase_score(entry, ply):
+    """
+    Function that converts a tablebase result to a search score.
+    :param entry: (result, distance) tuple from Tablebase.probe
+    :param ply: Int number of plies from the root
+    :return: Int score for the active player
+    """
+    result, distance = entry
+    if result == "WIN":
+        return WIN_SCORE - ply - distance
+    if result == "LOSS":
+        return -WIN_SCORE + ply + distance
+    return 0
+
+
+def find_best_move(game, depth=None, time_limit=None, evaluation=evaluate, info=None, transposition_table=None,
+                   tablebase=None):
+    """
+    Function that searches a game for the active player's best move.
+    :param game: The HasamiShogiGame to search, left in the same position it started in
+    :param depth: Int depth to search to. Defaults to MAX_DEPTH with a time limit, else DEFAULT_DEPTH
+    :param time_limit: Float number of seconds the search may take, or None for no limit
+    :param evaluation: Function taking an unfinished HasamiShogiGame and returning a score for the active player
+    :param info: Function called with a SearchResult after every finished depth, or None
+    :param transposition_table: TranspositionTable to use (and keep using between searches), or None for a new
+                                DEFAULT_TABLE_MEGABYTES table
+    :param tablebase: HasamiShogiTablebase.Tablebase to score positions with few pieces from, or None. Not probed
+                      for games with a repetition rule
+    :return: A SearchResult holding the best move, its score, and the number of nodes searched
+    """
+    if transposition_table is None:
+        transposition_table = TranspositionTable()
+    return AlphaBetaSearch(evaluation, transposition_table, tablebase).search(game, depth, time_limit, info)
+
+
+class ParallelSearchResult(SearchResult):
+    """The ParallelSearchResult class holds the outcome of a search split between processes.
+    On top of the SearchResult data members, this class will contain the following data members:
+    A dict of worker process id -> nodes searched by that worker
+    The total number of seconds the workers spent searching
+    The number of seconds find_best_move took to search the same position to the same depth on one core, or None
+    if it wasn't timed"""
+
+    def __init__(self, move, score, depth, nodes, seconds, worker_nodes, worker_seconds, serial_seconds=None):
+        """The constructor for the ParallelSearchResult class.
+        :param move: (origin, destination) tuple of square indices, or None
+        :param score: Int score of the move
+        :param depth: Int depth that was completely searched
+        :param nodes: Int number of nodes searched by every worker
+        :param seconds: Float number of seconds the search took
+        :param worker_nodes: Dict of worker process id -> int nodes searched
+        :param worker_seconds: Float total number of seconds the workers spent searching
+        :param serial_seconds: Float number of seconds a one core search of the same position and depth took, or
+                               None"""
+        super().__init__(move, score, depth, nodes, seconds)
+        self._worker_nodes = worker_nodes
+        self._worker_seconds = worker_seconds
+        self._serial_seconds = serial_seconds
+
+    def get_worker_nodes(self):
+        """
+        Method that returns how many nodes each worker process searched.
+        :return: Dict of process id -> int nodes
+        """
+        return self._worker_nodes
+
+    def get_utilization(self):
+        """
+        Method that returns how many workers were busy searching on average while the search ran. This is not the
+        speedup over one core (see get_speedup): find_best_move usually searches fewer nodes to the same depth,
+        since the workers search every root move with a full window.
+        :return: Float, the workers' total search time divided by the time the search took
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self._worker_seconds / self._seconds
+
+    def get_serial_seconds(self):
+        """
+        Method that returns how long the one core search the speedup is measured against took.
+        :return: Float number of seconds, or None if no one core search was timed
+        """
+        return self._serial_seconds
+
+    def get_speedup(self):
+        """
+        Method that returns how much faster the parallel search was than one core, see find_best_move_parallel's
+        baseline.
+        :return: Float, the one core search time divided by the time the parallel search took, or None if no one
+                 core search was timed
+        """
+        if self._serial_seconds is None:
+            return None
+        if self._seconds <= 0:
+            return 0.0
+        return self._serial_seconds / self._seconds
+
+
+# Search state kept by each worker process between the root moves it is given
+_worker_search = None
+
+
+def _start_worker(evaluation, table_megabytes):
+    """
+    Sets up a worker process for find_best_move_parallel.
+    :param evaluation: Evaluation function to search with
+    :param table_megabytes: Size of the worker's transposition table in MB
+    :return: None
+    """
+    global _worker_search
+    _worker_search = AlphaBetaSearch(evaluation, TranspositionTable(table_megabytes))
+
+
+def _search_root_move(game, move, depth):
+    """
+    Searches a single root move in a worker process with a full window.
+    :param game: The unpickled HasamiShogiGame to search, with the repetition rule and counts of the searched game
+    :param move: The (origin, destination) root move to search
+    :param depth: Int depth to search the root to
+    :return: (move, score, nodes, seconds, process id) tuple
+    """
+    start = time.perf_counter()
+    _worker_search._nodes = 0
+    game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+    # Shallower searches first fill the worker's transposition table and history for move ordering
+    for current_depth in range(1, depth + 1):
+        score = -_worker_search._negamax(game, current_depth - 1, -WIN_SCORE - 1, WIN_SCORE + 1, 1)
+    return move, score, _worker_search._nodes, time.perf_counter() - start, os.getpid()
+
+
+def find_best_move_parallel(game, depth=DEFAULT_DEPTH, workers=None, evaluation=evaluate,
+                            table_megabytes=DEFAULT_TABLE_MEGABYTES, baseline=False):
+    """
+    Function that searches a game for the active player's best move, splitting the root moves between processes.
+    Returns the same move and score as find_best_move at the same depth.
+    :param game: The HasamiShogiGame to search, it is not changed
+    :param depth: Int depth to search to
+    :param workers: Int number of worker processes, defaults to the number of CPUs
+    :param evaluation: Function taking an unfinished HasamiShogiGame and returning a score for the active player.
+                       Must be defined at the top level of a module so it can be sent to the workers
+    :param table_megabytes: Size of each worker's transposition table in MB
+    :param baseline: True to first time find_best_move searching the same depth on one core, with a new
+                     table_megabytes table, so the result can report the speedup. The baseline's time isn't part of
+                     the parallel search's time
+    :return: A ParallelSearchResult holding the best move, its score, and the nodes searched by each worker
+    """
+    depth = min(depth, MAX_DEPTH)
+    serial_seconds = None
+    if baseline:
+        serial_seconds = find_best_move(game, depth, evaluation=evaluation,
+                                        transposition_table=TranspositionTable(table_megabytes)).get_seconds()
+    start = time.perf_counter()
+    moves = list(game.get_legal_moves())
+    if not moves:
+        return ParallelSearchResult(None, 0, 0, 0, 0.0, {}, 0.0, serial_seconds)
+
+    best_move = None
+    best_score = -WIN_SCORE - 1
+    worker_nodes = {}
+    worker_seconds = 0.0
+    with ProcessPoolExecutor(workers, initializer=_start_worker,
+                             initargs=(evaluation, table_megabytes)) as executor:
+        results = executor.map(_search_root_move, [game] * len(moves), moves, [depth] * len(moves))
+        for move, score, nodes, seconds, process_id in results:
+            worker_nodes[process_id] = worker_nodes.get(process_id, 0) + nodes
+            worker_seconds += seconds
+            if score > best_score or (score == best_score and move < best_move):
+                best_move = move
+                best_score = score
+
+    return ParallelSearchResult(best_move, best_score, depth, sum(worker_nodes.values()),
+                                time.perf_counter() - start, worker_nodes, worker_seconds, serial_seconds)
+
+
+def main():
+    game = HasamiShogiGame()
+    game._board.print()
+    while game.get_game_state() == "UNFINISHED":
+        result = find_best_move(game, time_limit=1.0)
+        if result.get_move() is None:
+            break
+        origin, destination = result.get_move()
+        print(game.get_active_player(), SQUARE_NAMES[origin], SQUARE_NAMES[destination],
+              "depth", result.get_depth(), "score", result.get_score(),
+              "nodes", result.get_nodes(), "nps", round(result.get_nodes_per_second()))
+        game.make_move(SQUARE_NAMES[origin], SQUARE_NAMES[destination])
+        game._board.print()
+    print(game.get_game_state())
+
+
+if __name__ == "__main__":
+    main()
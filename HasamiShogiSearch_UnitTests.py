@@ -0,0 +1,226 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiSearch module
+
+import unittest
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import SQUARE_NAMES as SQUARE_NAMES
+from HasamiShogiSearch import find_best_move as find_best_move
+from HasamiShogiSearch import WIN_SCORE as WIN_SCORE
+from HasamiShogiSearch import AlphaBetaSearch as AlphaBetaSearch
+from HasamiShogiSearch import find_best_move_parallel as find_best_move_parallel
+from HasamiShogiSearch import TranspositionTable as TranspositionTable
+from HasamiShogiSearch import EXACT as EXACT
+from HasamiShogiSearch import LOWER as LOWER
+from HasamiShogiSearch import UPPER as UPPER
+
+
+def setup_board(game, reds, blacks, nones):
+    for squares in reds:
+        game._board.set_space(game.alg_to_xy(squares), "RED")
+    for squares in blacks:
+        game._board.set_space(game.alg_to_xy(squares), "BLACK")
+    for squares in nones:
+        game._board.set_space(game.alg_to_xy(squares), "NONE")
+
+
+def alg_move(move):
+    return SQUARE_NAMES[move[0]], SQUARE_NAMES[move[1]]
+
+
+class Test_find_best_move(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiSearch.find_best_move() function."""
+
+    backend = "standard"
+
+    # Finds a move that captures a piece
+    def test1(self):
+        game = HasamiShogiGame(self.backend)
+
+        reds = ["c8"]  # Squares to fill with a red piece
+        blacks = ["c7"]  # Squares to fill with a black piece
+        nones = []  # Squares to remove pieces from
+        game._active_player = "RED"
+
+        setup_board(game, reds, blacks, nones)
+
+        result = find_best_move(game, depth=1)
+        self.assertEqual(("a6", "c6"), alg_move(result.get_move()))
+        self.assertEqual(1, result.get_depth())
+
+    # Finds the move that wins the game
+    def test2(self):
+        game = HasamiShogiGame(self.backend)
+
+        reds = ["i1"]  # Squares to fill with a red piece
+        blacks = []  # Squares to fill with a black piece
+        nones = ["i9"]  # Squares to remove pieces from
+        game._captured_by_red = 2
+        game._active_player = "RED"
+
+        setup_board(game, reds, blacks, nones)
+
+        result = find_best_move(game, depth=3)
+        self.assertEqual(("a9", "i9"), alg_move(result.get_move()))
+        self.assertEqual(WIN_SCORE - 1, result.get_score())
+
+    # The searched game is left unchanged
+    def test3(self):
+        game = HasamiShogiGame(self.backend)
+        game.make_move("i5", "c5")
+        position_hash = game.get_position_hash()
+        result = find_best_move(game, depth=2)
+        self.assertEqual(position_hash, game.get_position_hash())
+        self.assertTrue(game.undo_move())  # Only the move made before the search is on the undo stack
+        self.assertFalse(game.undo_move())
+        self.assertGreater(result.get_nodes(), 0)
+
+    # A time limit stops the search
+    def test4(self):
+        game = HasamiShogiGame(self.backend)
+        depths = []
+        result = find_best_move(game, time_limit=0.2, info=lambda result: depths.append(result.get_depth()))
+        self.assertLess(result.get_seconds(), 2.0)
+        self.assertEqual(depths[-1], result.get_depth())
+        self.assertIn(result.get_move(), list(game.get_legal_moves()))
+
+    # No legal moves once the game has ended
+    def test5(self):
+        game = HasamiShogiGame(self.backend)
+        game._game_state = "BLACK_WON"
+        self.assertIsNone(find_best_move(game, depth=2).get_move())
+
+    # A repetition rule ends the game like a capture would
+    def test6(self):
+        for result, score in (("LOSS", WIN_SCORE - 1), ("DRAW", 0)):
+            game = HasamiShogiGame(self.backend, quiet=True)
+            game.set_repetition_rule(2, result)
+            for origin, destination in [("i2", "h2"), ("a2", "b2"), ("h2", "i2"), ("b2", "a2")]:
+                game.make_move(origin, destination)
+            self.assertEqual(score, AlphaBetaSearch()._negamax(game, 2, -2 * WIN_SCORE, 2 * WIN_SCORE, 1))
+
+
+class Test_TranspositionTable(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiSearch.TranspositionTable class."""
+
+    def test1(self):
+        table = TranspositionTable(1)
+        self.assertIsNone(table.probe(12345, 0))
+        table.store(12345, 0, 4, -37, LOWER, (72, 63))
+        self.assertEqual((4, -37, LOWER, (72, 63)), table.probe(12345, 0))
+        table.store(54321, 0, 2, 15, EXACT, None)
+        self.assertEqual((2, 15, EXACT, None), table.probe(54321, 0))
+
+    def test2(self):
+        # Win scores are stored relative to the position and read back relative to the new root
+        table = TranspositionTable(1)
+        table.store(99, 3, 2, WIN_SCORE - 5, EXACT, None)
+        self.assertEqual(WIN_SCORE - 6, table.probe(99, 4)[1])
+        table.store(98, 3, 2, -WIN_SCORE + 5, UPPER, None)
+        self.assertEqual(-WIN_SCORE + 4, table.probe(98, 2)[1])
+
+    def test3(self):
+        # A deep entry stays in its bucket while shallow entries replace each other
+        table = TranspositionTable(1)
+        buckets = table.get_stats()["slots"] // 2
+        deep, shallow1, shallow2 = 7, 7 + buckets, 7 + 2 * buckets  # Keys sharing one bucket
+        table.store(deep, 0, 6, 1, EXACT, None)
+        table.store(shallow1, 0, 2, 2, EXACT, None)
+        table.store(shallow2, 0, 1, 3, EXACT, None)
+        self.assertEqual(6, table.probe(deep, 0)[0])
+        self.assertIsNone(table.probe(shallow1, 0))
+        self.assertEqual(1, table.probe(shallow2, 0)[0])
+        # An entry at least as deep takes the first slot and moves the old entry to the second
+        table.store(shallow1, 0, 6, 2, EXACT, None)
+        self.assertEqual(6, table.probe(shallow1, 0)[0])
+        self.assertEqual(6, table.probe(deep, 0)[0])
+        self.assertIsNone(table.probe(shallow2, 0))
+        stats = table.get_stats()
+        self.assertEqual(2, stats["collisions"])
+        self.assertEqual(2, stats["replacements"])
+
+    def test4(self):
+        # The table never uses more than the memory it is given
+        for megabytes in [1, 3, 16]:
+            self.assertLessEqual(TranspositionTable(megabytes).get_stats()["megabytes"], megabytes)
+        table = TranspositionTable(1)
+        table.store(1, 0, 1, 1, EXACT, None)
+        table.clear()
+        self.assertIsNone(table.probe(1, 0))
+        self.assertEqual(0, table.get_stats()["stores"])
+
+    def test5(self):
+        # Searching with a table finds the same score as searching without one
+        game = HasamiShogiGame()
+        game.make_move("i5", "c5")
+        without_table = AlphaBetaSearch().search(game, depth=3)
+        table = TranspositionTable(1)
+        with_table = AlphaBetaSearch(transposition_table=table).search(game, depth=3)
+        self.assertEqual(without_table.get_score(), with_table.get_score())
+        self.assertGreater(table.get_stats()["hits"], 0)
+
+
+class Test_find_best_move_parallel(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiSearch.find_best_move_parallel() function."""
+
+    backend = "standard"
+
+    def test1(self):
+        # Splitting the root moves between processes finds the same move and score as the serial search
+        game = HasamiShogiGame(self.backend)
+        game.make_move("i5", "c5")
+        for depth in [1, 2]:
+            serial = find_best_move(game, depth=depth)
+            parallel = find_best_move_parallel(game, depth=depth, workers=2)
+            self.assertEqual(serial.get_move(), parallel.get_move())
+            self.assertEqual(serial.get_score(), parallel.get_score())
+            self.assertEqual(parallel.get_nodes(), sum(parallel.get_worker_nodes().values()))
+            self.assertTrue(0.0 <= parallel.get_utilization() <= 2.0)
+            self.assertIsNone(parallel.get_speedup())
+
+    def test2(self):
+        # The winning move is found from the worker's scores
+        game = HasamiShogiGame(self.backend)
+
+        reds = ["i1"]  # Squares to fill with a red piece
+        blacks = []  # Squares to fill with a black piece
+        nones = ["i9"]  # Squares to remove pieces from
+        game._captured_by_red = 2
+        game._active_player = "RED"
+
+        setup_board(game, reds, blacks, nones)
+
+        result = find_best_move_parallel(game, depth=1, workers=2)
+        self.assertEqual(("a9", "i9"), alg_move(result.get_move()))
+        self.assertEqual(WIN_SCORE - 1, result.get_score())
+
+    def test3(self):
+        # The baseline times a one core search, and the speedup is measured against it
+        game = HasamiShogiGame(self.backend)
+        result = find_best_move_parallel(game, depth=2, workers=2, baseline=True)
+        self.assertGreater(result.get_serial_seconds(), 0.0)
+        self.assertAlmostEqual(result.get_serial_seconds() / result.get_seconds(), result.get_speedup())
+
+    def test4(self):
+        # Workers score repetitions with the game's repetition rule and counts, like the serial search. Repeating a
+        # position draws here, which is the losing black player's best result
+        game = HasamiShogiGame(self.backend, quiet=True)
+        moves = ["i3", "e3", "a6", "b6", "i8", "e8", "b6", "e6", "e3", "d3", "e6", "b6", "i1", "h1", "a9", "b9", "i9",
+                 "h9", "b9", "g9", "h9", "i9", "a4", "g4", "d3", "h3", "g4", "a4"]
+        for number in range(0, len(moves), 2):
+            game.make_move(moves[number], moves[number + 1])
+        game.set_repetition_rule(2)
+        serial = find_best_move(game, depth=2)
+        parallel = find_best_move_parallel(game, depth=2, workers=2)
+        self.assertEqual(0, serial.get_score())
+        self.assertEqual((serial.get_move(), serial.get_score()), (parallel.get_move(), parallel.get_score()))
+
+
+class Test_find_best_move_bitboard(Test_find_best_move):
+    """Runs the HasamiShogiSearch.find_best_move() unit tests against the BitBoard backend."""
+
+    backend = "bitboard"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Plays large numbers of HasamiShogiGame games against itself and saves them as a dataset
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW SELF-PLAY WORKS ===============
+# 1) Playing a game
+#       Every game is played by one policy for both players:
+#           "random" picks any legal move.
+#           "engine" plays random moves for the first random_plies plies so games differ, then plays
+#           HasamiShogiSearch.find_best_move at a fixed depth.
+#       With an opening book (see HasamiShogiBook.py), book moves are played while the position is in the
+#       book, picked at random weighted by how often they were played, before the policy takes over. Book
+#       moves are made with HasamiShogiGame.try_move_encoded, so an illegal book move is rejected and the policy
+#       takes over from that position. The policy's moves are made with HasamiShogiGame._execute_move, and
+#       nothing is printed.
+#       A game that hasn't ended after max_plies plies (or where the active player has no moves) is
+#       saved with the game state "UNFINISHED".
+#       With repetitions, a game is drawn as soon as a position is reached for the repetitions-th time (see
+#       HasamiShogiGame.set_repetition_rule), so games where both players shuffle the same pieces back and forth
+#       end early instead of running to max_plies. Such games are saved with the game state "DRAW", and their
+#       records have "repetition_rule", the [repetitions, result, max plies] list of the rule, so they replay.
+#
+# 2) Reproducibility
+#       Game number N uses random.Random(seed * 1000003 + N), so the same seed always plays the same
+#       games no matter how many workers play them.
+#
+# 3) Output
+#       Every game is written as one line of JSON as soon as it (and every game before it) is finished:
+#           {"game": N, "result": "RED_WON", "plies": 57, "captured_red": 9, "captured_black": 4,
+#            "moves": ["i5h5", "a9b9", ...]}
+#       Moves are the origin and destination squares in algebraic notation. Games played with an opening book
+#       also have "book_plies", the number of book moves played.
+#       With record_format "binary" the games are written in the compact format of HasamiShogiRecord.py instead.
+#
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from HasamiShogiBook import OpeningBook
+from HasamiShogiGame import HasamiShogiGame, BOARD_BACKENDS, SQUARE_NAMES, SQUARE_XY
+from HasamiShogiRecord import GameRecord, GameRecordWriter
+from HasamiShogiSearch import AlphaBetaSearch, TranspositionTable
+
+POLICIES = ("random", "engine")
+FORMATS = ("jsonl", "binary")
+DEFAULT_MAX_PLIES = 400  # Games still going after this many plies are saved unfinished
+DEFAULT_RANDOM_PLIES = 4  # Random opening plies played by the "engine" policy
+DEFAULT_ENGINE_DEPTH = 1  # Search depth of the "engine" policy
+_ENGINE_TABLE_MEGABYTES = 4  # Size of the "engine" policy's transposition table
+_books = {}  # Path -> OpeningBook opened by this process
+
+
+def _open_book(path):
+    """
+    Opens an opening book once per process, so every game played by a worker shares it.
+    :param path: Path of the book file
+    :return: OpeningBook
+    """
+    book = _books.get(path)
+    if book is None:
+        book = _books[path] = OpeningBook(path)
+    return book
+
+
+def play_game(number, seed=0, policy="random", max_plies=DEFAULT_MAX_PLIES, random_plies=DEFAULT_RANDOM_PLIES,
+              depth=DEFAULT_ENGINE_DEPTH, backend="standard", book=None, repetitions=None):
+    """
+    Function that plays one self-play game.
+    :param number: Int game number, used with the seed to seed the game's random.Random
+    :param seed: Int seed of the whole run
+    :param policy: "random" or "engine"
+    :param max_plies: Int number of plies after which the game is stopped
+    :param random_plies: Int number of random opening plies played by the "engine" policy
+    :param depth: Int search depth of the "engine" policy
+    :param backend: Board backend name to play with
+    :param book: Path of an opening book file to play from, or None
+    :param repetitions: Int number of times a position can be reached before the game is drawn, or None
+    :return: Dict record of the game (see the description at the top of the file)
+    """
+    if policy not in POLICIES:
+        raise ValueError("Unknown self-play policy: " + str(policy))
+    rng = random.Random(seed * 1000003 + number)
+    game = HasamiShogiGame(backend)
+    if repetitions is not None:
+        game.set_repetition_rule(repetitions)
+    search = None
+    if policy == "engine":
+        search = AlphaBetaSearch(transposition_table=TranspositionTable(_ENGINE_TABLE_MEGABYTES))
+    opening_book = _open_book(book) if book is not None else None
+    book_plies = 0
+
+    moves = []
+    while game.get_game_state() == "UNFINISHED" and len(moves) < max_plies:
+        # Book moves are played until the first position that isn't in the book
+        move = None
+        if opening_book is not None and book_plies == len(moves):
+            move = opening_book.choose_move(game, rng)
+            # A stale book, a hash collision, or a book built with another backend can give an illegal move,
+            # which ends the book moves and leaves the position to the policy
+            if move is not None and not game.try_move_encoded(move[0] * 81 + move[1]).is_success():
+                move = None
+        if move is not None:
+            book_plies += 1
+        else:
+            if search is None or len(moves) < random_plies:
+                legal_moves = list(game.get_legal_moves())
+                if not legal_moves:
+                    break
+                move = legal_moves[rng.randrange(len(legal_moves))]
+            else:
+                move = search.search(game, depth).get_move()
+                if move is None:
+                    break
+            game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+        moves.append(SQUARE_NAMES[move[0]] + SQUARE_NAMES[move[1]])
+
+    record = {"game": number,
+              "result": game.get_game_state(),
+              "plies": len(moves),
+              "captured_red": game.get_num_captured_pieces("RED"),
+              "captured_black": game.get_num_captured_pieces("BLACK"),
+              "moves": moves}
+    if opening_book is not None:
+        record["book_plies"] = book_plies
+    if repetitions is not None:
+        record["repetition_rule"] = list(game.get_repetition_rule())
+    return record
+
+
+def _play_game_args(args):
+    """
+    Calls play_game with a tuple of arguments, used by the worker processes.
+    :param args: Tuple of play_game arguments
+    :return: Dict record of the game
+    """
+    return play_game(*args)
+
+
+def run_selfplay(games, output, workers=1, policy="random", seed=0, max_plies=DEFAULT_MAX_PLIES,
+                 random_plies=DEFAULT_RANDOM_PLIES, depth=DEFAULT_ENGINE_DEPTH, backend="standard",
+                 record_format="jsonl", book=None, repetitions=None):
+    """
+    Function that plays many self-play games and streams them to a file.
+    :param games: Int number of games to play
+    :param output: Writable text file to write one JSON line per game to, or a writable binary file for the
+                   "binary" record format
+    :param workers: Int number of worker processes, 1 plays every game in this process
+    :param policy: "random" or "engine"
+    :param seed: Int seed of the run
+    :param max_plies: Int number of plies after which a game is stopped
+    :param random_plies: Int number of random opening plies played by the "engine" policy
+    :param depth: Int search depth of the "engine" policy
+    :param backend: Board backend name to play with
+    :param record_format: "jsonl" or "binary"
+    :param book: Path of an opening book file to play from, or None
+    :param repetitions: Int number of times a position can be reached before a game is drawn, or None
+    :return: Dict of statistics: games, plies, seconds, games_per_second, plies_per_second, average_plies,
+             book_plies, and a count of each result
+    """
+    if record_format not in FORMATS:
+        raise ValueError("Unknown self-play record format: " + str(record_format))
+    writer = GameRecordWriter(output) if record_format == "binary" else None
+    start = time.perf_counter()
+    args = [(number, seed, policy, max_plies, random_plies, depth, backend, book, repetitions)
+            for number in range(games)]
+    stats = {"games": 0, "plies": 0, "book_plies": 0, "RED_WON": 0, "BLACK_WON": 0, "DRAW": 0, "UNFINISHED": 0}
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers)
+        records = executor.map(_play_game_args, args, chunksize=max(1, min(16, games // (workers * 4))))
+    else:
+        records = map(_play_game_args, args)
+    try:
+        # Results come back in game order, so the file is the same for any number of workers
+        for record in records:
+            if writer is None:
+                output.write(json.dumps(record) + "\n")
+            else:
+                writer.write(GameRecord.from_selfplay(record))
+            stats["games"] += 1
+            stats["plies"] += record["plies"]
+            stats["book_plies"] += record.get("book_plies", 0)
+            stats[record["result"]] += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    output.flush()
+
+    seconds = time.perf_counter() - start
+    stats["seconds"] = seconds
+    stats["games_per_second"] = stats["games"] / seconds if seconds > 0 else 0.0
+    stats["plies_per_second"] = stats["plies"] / seconds if seconds > 0 else 0.0
+    stats["average_plies"] = stats["plies"] / stats["games"] if stats["games"] else 0.0
+    return stats
+
+
+def _repetitions_argument(value):
+    """
+    Converts the --repetitions argument, which set_repetition_rule needs to be at least 2.
+    Raises an argparse.ArgumentTypeError, reported by the parser as a usage error, if it isn't.
+    :param value: String from the command line
+    :return: Int number of repetitions
+    """
+    try:
+        repetitions = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid int value: %r" % value)
+    if repetitions < 2:
+        raise argparse.ArgumentTypeError("must be at least 2, got %d" % repetitions)
+    return repetitions
+
+
+def add_arguments(parser):
+    """
+    Adds the self-play command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--policy", choices=POLICIES, default="random", help="how moves are picked")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the run, the same seed plays the same games")
+    parser.add_argument("--output", default="selfplay.jsonl", help="file to write games to, - for stdout")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="plies before a game is stopped")
+    parser.add_argument("--random-plies", type=int, default=DEFAULT_RANDOM_PLIES,
+                        help="random opening plies of the engine policy")
+    parser.add_argument("--depth", type=int, default=DEFAULT_ENGINE_DEPTH, help="search depth of the engine policy")
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="standard",
+                        help="board backend to play with")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl", help="file format to write games in")
+    parser.add_argument("--book", default=None, help="opening book file to play the first moves from")
+    parser.add_argument("--repetitions", type=_repetitions_argument, default=None,
+                        help="draw a game when a position is reached this many times")
+
+
+def run_command(args):
+    """
+    Runs self-play from parsed command line arguments and prints the statistics to stderr.
+    :param args: argparse.Namespace from a parser set up with add_arguments
+    :return: Int exit code
+    """
+    binary = args.format == "binary"
+    if args.output == "-":
+        output = sys.stdout.buffer if binary else sys.stdout
+    else:
+        output = open(args.output, "wb" if binary else "w")
+    try:
+        stats = run_selfplay(args.games, output, args.workers, args.policy, args.seed, args.max_plies,
+                             args.random_plies, args.depth, args.backend, args.format, args.book, args.repetitions)
+    finally:
+        if args.output != "-":
+            output.close()
+    print("games: %d  plies: %d  seconds: %.2f" % (stats["games"], stats["plies"], stats["seconds"]),
+          file=sys.stderr)
+    print("games/sec: %.2f  plies/sec: %.1f  average game length: %.1f plies" %
+          (stats["games_per_second"], stats["plies_per_second"], stats["average_plies"]), file=sys.stderr)
+    print("RED_WON: %d  BLACK_WON: %d  DRAW: %d  UNFINISHED: %d" %
+          (stats["RED_WON"], stats["BLACK_WON"], stats["DRAW"], stats["UNFINISHED"]), file=sys.stderr)
+    if args.book is not None:
+        print("book plies: %d" % stats["book_plies"], file=sys.stderr)
+    return 0
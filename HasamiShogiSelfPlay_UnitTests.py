@@ -0,0 +1,89 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiSelfPlay module
+
+import unittest
+import unittest.mock
+import io
+import json
+import random
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiSelfPlay import play_game as play_game
+from HasamiShogiSelfPlay import run_selfplay as run_selfplay
+from HasamiShogiTools import main as tools_main
+
+
+class FirstMoveRandom(random.Random):
+    """A random.Random that always picks the first choice."""
+
+    def randrange(self, *args):
+        return 0
+
+
+class Test_run_selfplay(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiSelfPlay.run_selfplay() function."""
+
+    # The same seed writes the same games with any number of workers
+    def test1(self):
+        outputs = []
+        for workers in [1, 2]:
+            output = io.StringIO()
+            stats = run_selfplay(6, output, workers=workers, seed=11, max_plies=120)
+            self.assertEqual(6, stats["games"])
+            outputs.append(output.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(6, len(outputs[0].splitlines()))
+
+    # Replaying a saved game through make_move gives the saved result
+    def test2(self):
+        output = io.StringIO()
+        stats = run_selfplay(3, output, policy="engine", seed=5, max_plies=300, random_plies=2)
+        for line in output.getvalue().splitlines():
+            record = json.loads(line)
+            game = HasamiShogiGame()
+            with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+                for move in record["moves"]:
+                    self.assertTrue(game.make_move(move[:2], move[2:]))
+            self.assertEqual(record["result"], game.get_game_state())
+            self.assertEqual(record["captured_red"], game.get_num_captured_pieces("RED"))
+            self.assertEqual(record["plies"], len(record["moves"]))
+        self.assertEqual(stats["plies"] / 3, stats["average_plies"])
+
+    def test3(self):
+        self.assertNotEqual(play_game(0, seed=1, max_plies=50)["moves"], play_game(1, seed=1, max_plies=50)["moves"])
+        with self.assertRaises(ValueError):
+            play_game(0, policy="greedy")
+
+    # The command line entry point
+    def test4(self):
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with unittest.mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                self.assertEqual(0, tools_main(["selfplay", "--games", "2", "--max-plies", "30", "--output", "-"]))
+        self.assertEqual(2, len(stdout.getvalue().splitlines()))
+        self.assertIn("games/sec", stderr.getvalue())
+        for repetitions in ("1", "two"):
+            with unittest.mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit):
+                    tools_main(["selfplay", "--games", "1", "--repetitions", repetitions, "--output", "-"])
+            self.assertIn("--repetitions", stderr.getvalue())
+
+    # Games that repeat positions are drawn instead of running to max_plies. Always playing the first legal move
+    # moves the same pieces back and forth
+    def test5(self):
+        output = io.StringIO()
+        with unittest.mock.patch("HasamiShogiSelfPlay.random.Random", FirstMoveRandom):
+            self.assertEqual(400, play_game(0, max_plies=400)["plies"])
+            stats = run_selfplay(2, output, max_plies=400, repetitions=3)
+        self.assertEqual(2, stats["DRAW"])
+        for line in output.getvalue().splitlines():
+            record = json.loads(line)
+            game = HasamiShogiGame(quiet=True)
+            game.set_repetition_rule(3)
+            for move in record["moves"]:
+                self.assertTrue(game.make_move(move[:2], move[2:]))
+            self.assertEqual("DRAW", game.get_game_state())
+            self.assertLess(record["plies"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,726 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: asyncio server hosting many concurrent HasamiShogiGame games over line-oriented JSON, and a load
+#              generator client for it
+#
+# Usage: python -m HasamiShogiTools serve [--port 7733 | --unix PATH] [--snapshot-dir DIR]
+#        python -m HasamiShogiTools load [--games 100] [--moves 50] [--port 7733 | --unix PATH]
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE SERVER WORKS ===============
+# 1) Protocol
+#       Clients connect over TCP or a Unix socket and send one JSON object per line. Every request may have an
+#       "id", which is copied into its reply so clients can send many requests without waiting.
+#           {"op": "new", "game": optional id}                    creates a game
+#           {"op": "move", "game": id, "origin": "i1", "destination": "h1"}
+#           {"op": "move", "game": id, "move": 5895}             a move encoded with encode_move
+#           {"op": "state", "game": id}                           the game's current state
+#           {"op": "subscribe", "game": id}                       sends an update line after every move in the game
+#           {"op": "close", "game": id}                           removes the game and its snapshot
+#           {"op": "stats"}                                       server statistics
+#       Replies are {"id": ..., "ok": true/false, ...}. Moves reply with "reason" (a MoveRejection name, or null),
+#       "captured", and "state". Requests that can't be handled reply with "ok": false and an "error" message.
+#       A state is {"game", "snapshot" (see HasamiShogiGame.to_snapshot), "active_player", "game_state",
+#       "captured_red", "captured_black"}. Updates are {"update": game id, "move": "i1h1", "state": {...}}.
+#
+# 2) Serializing moves
+#       Every request is handled on the event loop thread, and a move is checked and made without awaiting
+#       anything, so moves to one game are always applied one at a time in the order they arrive.
+#       Only loading and saving snapshots await (the file is read or written in a thread). While that happens
+#       the game is marked pending, and requests for it wait until it is loaded or saved.
+#
+# 3) Batching outgoing messages
+#       Replies and updates are added to their connection's outbox, and one flush per connection is scheduled
+#       for the next pass of the event loop. Everything sent to a connection during one pass is written in a
+#       single write.
+#
+# 4) Evicting idle games
+#       With a snapshot directory, games that haven't been used for idle_timeout seconds are saved to
+#       "<game id>.snap" as a 23 byte packed snapshot and dropped from memory. The next request for the game
+#       loads it back. The snapshot holds the whole position but not the undo history. Games with a repetition
+#       rule (HasamiShogiGame.set_repetition_rule) need their history to count repetitions, so they are never
+#       evicted.
+#
+# 5) Load generator
+#       run_load opens a number of connections, creates games spread across them, and plays random legal moves
+#       in every game at once. Each game keeps a local copy to pick legal moves. It reports moves per second and
+#       the 50th and 99th percentile time between sending a move and getting its reply.
+#
+
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+
+from HasamiShogiGame import HasamiShogiGame, BOARD_BACKENDS, InvalidSnapshot, decode_move
+
+DEFAULT_PORT = 7733
+DEFAULT_IDLE_TIMEOUT = 300.0  # Seconds a game may go unused before it is evicted
+_GAME_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")  # Game ids are also snapshot file names
+_SNAPSHOT_SUFFIX = ".snap"
+
+
+class GameSession:
+    """The GameSession class holds one game hosted by the server.
+    This class will contain the following data members:
+    The game id
+    The HasamiShogiGame
+    The set of connections subscribed to the game's updates
+    The event loop time the game was last used"""
+
+    def __init__(self, game_id, game, now):
+        """The constructor for the GameSession class.
+        :param game_id: String game id
+        :param game: HasamiShogiGame
+        :param now: Float event loop time"""
+        self._game_id = game_id
+        self._game = game
+        self._subscribers = set()
+        self._last_used = now
+
+    def get_game(self):
+        """
+        Method that returns the session's game.
+        :return: HasamiShogiGame
+        """
+        return self._game
+
+    def get_subscribers(self):
+        """
+        Method that returns the connections subscribed to the game's updates.
+        :return: Set of Connection
+        """
+        return self._subscribers
+
+    def get_last_used(self):
+        """
+        Method that returns when the game was last used.
+        :return: Float event loop time
+        """
+        return self._last_used
+
+    def touch(self, now):
+        """
+        Method that records that the game was used.
+        :param now: Float event loop time
+        :return: None
+        """
+        self._last_used = now
+
+    def get_state(self):
+        """
+        Method that describes the game's current state for replies and updates.
+        :return: State dict (see the description at the top of the file)
+        """
+        game = self._game
+        return {"game": self._game_id,
+                "snapshot": game.to_snapshot(),
+                "active_player": game.get_active_player(),
+                "game_state": game.get_game_state(),
+                "captured_red": game.get_num_captured_pieces("RED"),
+                "captured_black": game.get_num_captured_pieces("BLACK")}
+
+
+class Connection:
+    """The Connection class batches the messages sent to one client.
+    This class will contain the following data members:
+    The asyncio.StreamWriter of the connection
+    A list of encoded message lines waiting to be written
+    The task that will write them, while one is scheduled"""
+
+    def __init__(self, writer):
+        """The constructor for the Connection class.
+        :param writer: asyncio.StreamWriter"""
+        self._writer = writer
+        self._outbox = []
+        self._flush_task = None
+
+    def send(self, message):
+        """
+        Method that queues a message, to be written with everything else queued during this event loop pass.
+        :param message: JSON serializable dict
+        :return: None
+        """
+        self._outbox.append(json.dumps(message, separators=(",", ":")))
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self):
+        """
+        Writes every queued message in one write.
+        :return: None
+        """
+        await asyncio.sleep(0)  # Let everything ready to run this pass add to the outbox first
+        self._flush_task = None
+        if not self._outbox or self._writer.is_closing():
+            self._outbox.clear()
+            return
+        data = ("\n".join(self._outbox) + "\n").encode()
+        self._outbox.clear()
+        self._writer.write(data)
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+
+
+class GameServer:
+    """The GameServer class hosts HasamiShogiGame games for clients connected over TCP or a Unix socket.
+    This class will contain the following data members:
+    The board backend name of new games
+    The directory idle games are saved to (or None to keep every game in memory)
+    The number of seconds before an unused game is evicted
+    A dict of game id -> GameSession of the games in memory
+    A dict of game id -> asyncio.Future of the games being loaded or saved
+    A dict of statistics counters
+    The asyncio.Server and the eviction task, while running"""
+
+    def __init__(self, snapshot_dir=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, backend="standard"):
+        """The constructor for the GameServer class.
+        :param snapshot_dir: Directory to save idle games in, or None to never evict games
+        :param idle_timeout: Float seconds a game may go unused before it is evicted
+        :param backend: Board backend name of new games"""
+        self._backend = backend
+        self._snapshot_dir = snapshot_dir
+        self._idle_timeout = idle_timeout
+        self._sessions = {}
+        self._pending = {}
+        self._stats = {"connections": 0, "requests": 0, "moves": 0, "games_created": 0, "games_evicted": 0,
+                       "games_loaded": 0}
+        self._server = None
+        self._eviction_task = None
+        if snapshot_dir is not None:
+            os.makedirs(snapshot_dir, exist_ok=True)
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """
+        Method that starts listening for connections, and starts evicting idle games if there is a snapshot
+        directory.
+        :param host: String host to listen on over TCP
+        :param port: Int TCP port, 0 picks a free port
+        :param path: Path of a Unix socket to listen on instead of TCP, or None
+        :return: asyncio.Server
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if self._snapshot_dir is not None:
+            self._eviction_task = asyncio.get_running_loop().create_task(self._evict_forever())
+        return self._server
+
+    async def stop(self):
+        """
+        Method that stops listening, stops evicting, and saves every game in memory if there is a snapshot
+        directory.
+        :return: None
+        """
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._snapshot_dir is not None:
+            await self.evict_idle(idle_timeout=-1.0)
+
+    def get_stats(self):
+        """
+        Method that returns the server's statistics.
+        :return: Dict of counters, plus games_in_memory
+        """
+        stats = dict(self._stats)
+        stats["games_in_memory"] = len(self._sessions)
+        return stats
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Handles one client connection, one request line at a time.
+        :param reader: asyncio.StreamReader
+        :param writer: asyncio.StreamWriter
+        :return: None
+        """
+        connection = Connection(writer)
+        self._stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    connection.send(await self.handle_line(line, connection))
+        finally:
+            for session in self._sessions.values():
+                session.get_subscribers().discard(connection)
+            self._stats["connections"] -= 1
+            writer.close()
+
+    async def handle_line(self, line, connection=None):
+        """
+        Method that handles one request line.
+        :param line: bytes or string line of JSON
+        :param connection: Connection the request came from (updates are sent to it when it subscribes), or None
+        :return: Reply dict
+        """
+        self._stats["requests"] += 1
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "Request is not valid JSON"}
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request is not a JSON object"}
+        reply = await self._handle_request(request, connection)
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    async def _handle_request(self, request, connection):
+        """
+        Handles one decoded request.
+        :param request: Request dict
+        :param connection: Connection the request came from, or None
+        :return: Reply dict
+        """
+        op = request.get("op")
+        if op == "stats":
+            return {"ok": True, "stats": self.get_stats()}
+        if op == "new":
+            return await self._new_game(request.get("game"))
+
+        game_id = request.get("game")
+        if not isinstance(game_id, str) or not _GAME_ID.fullmatch(game_id):
+            return {"ok": False, "error": "Invalid game id"}
+        if op not in ("move", "state", "subscribe", "close"):
+            return {"ok": False, "error": "Unknown op: " + str(op)}
+        session = await self._get_session(game_id)
+        if session is None:
+            return {"ok": False, "error": "Unknown game: " + game_id}
+        session.touch(asyncio.get_running_loop().time())
+
+        if op == "move":
+            return self._move(game_id, session, request)
+        if op == "subscribe" and connection is not None:
+            session.get_subscribers().add(connection)
+        if op == "close":
+            del self._sessions[game_id]
+            path = self._snapshot_path(game_id)
+            if path is not None:
+                # Requests for the game wait until its snapshot is gone, so they can't load it back
+                pending = asyncio.get_running_loop().create_future()
+                self._pending[game_id] = pending
+                try:
+                    await asyncio.to_thread(os.remove, path)
+                except FileNotFoundError:
+                    pass
+                finally:
+                    del self._pending[game_id]
+                    pending.set_result(None)
+        return {"ok": True, "state": session.get_state()}
+
+    async def _new_game(self, game_id):
+        """
+        Creates a game.
+        :param game_id: String game id, or None to pick a new one
+        :return: Reply dict
+        """
+        if game_id is None:
+            game_id = uuid.uuid4().hex[:16]
+        elif not isinstance(game_id, str) or not _GAME_ID.fullmatch(game_id):
+            return {"ok": False, "error": "Invalid game id"}
+        if await self._get_session(game_id) is not None:
+            return {"ok": False, "error": "Game already exists: " + game_id}
+        session = GameSession(game_id, HasamiShogiGame(self._backend, quiet=True), asyncio.get_running_loop().time())
+        self._sessions[game_id] = session
+        self._stats["games_created"] += 1
+        return {"ok": True, "state": session.get_state()}
+
+    def _move(self, game_id, session, request):
+        """
+        Makes a move and sends an update to the game's subscribers. Never awaits, so moves can't interleave.
+        :param game_id: String game id
+        :param session: GameSession of the game
+        :param request: Move request dict
+        :return: Reply dict
+        """
+        game = session.get_game()
+        if "move" in request:
+            move = request["move"]
+            if type(move) is not int:
+                return {"ok": False, "error": "move must be an int"}
+            result = game.try_move_encoded(move)
+        else:
+            origin = request.get("origin")
+            destination = request.get("destination")
+            if not isinstance(origin, str) or not isinstance(destination, str):
+                return {"ok": False, "error": "origin and destination must be strings"}
+            result = game.try_move(origin, destination)
+
+        state = session.get_state()
+        if result.is_success():
+            self._stats["moves"] += 1
+            if "move" in request:
+                origin, destination = decode_move(request["move"])
+            update = {"update": game_id, "move": origin.lower() + destination.lower(), "state": state}
+            for subscriber in session.get_subscribers():
+                subscriber.send(update)
+        return {"ok": result.is_success(),
+                "reason": None if result.is_success() else result.get_reason().name,
+                "captured": result.get_captured(),
+                "state": state}
+
+    def _snapshot_path(self, game_id):
+        """
+        Finds where a game's snapshot is saved.
+        :param game_id: String game id
+        :return: Path string, or None without a snapshot directory
+        """
+        if self._snapshot_dir is None:
+            return None
+        return os.path.join(self._snapshot_dir, game_id + _SNAPSHOT_SUFFIX)
+
+    async def _get_session(self, game_id):
+        """
+        Finds a game, loading it from its snapshot if it was evicted.
+        :param game_id: String game id
+        :return: GameSession, or None if there is no such game
+        """
+        while True:
+            session = self._sessions.get(game_id)
+            if session is not None:
+                return session
+            pending = self._pending.get(game_id)
+            if pending is None:
+                break
+            await pending
+
+        path = self._snapshot_path(game_id)
+        if path is None:
+            return None
+        pending = asyncio.get_running_loop().create_future()
+        self._pending[game_id] = pending
+        try:
+            try:
+                snapshot = await asyncio.to_thread(_read_file, path)
+            except FileNotFoundError:
+                return None
+            try:
+                game = HasamiShogiGame.from_snapshot(snapshot, self._backend, quiet=True)
+            except InvalidSnapshot:
+                return None
+            session = GameSession(game_id, game, asyncio.get_running_loop().time())
+            self._sessions[game_id] = session
+            self._stats["games_loaded"] += 1
+            return session
+        finally:
+            del self._pending[game_id]
+            pending.set_result(None)
+
+    async def evict_idle(self, idle_timeout=None):
+        """
+        Method that saves every game that hasn't been used for a while to its snapshot and drops it from memory.
+        Games with subscribers or a repetition rule are kept.
+        :param idle_timeout: Float seconds, defaults to the server's idle timeout. Negative evicts every game
+        :return: Int number of games evicted
+        """
+        if self._snapshot_dir is None:
+            return 0
+        if idle_timeout is None:
+            idle_timeout = self._idle_timeout
+        cutoff = asyncio.get_running_loop().time() - idle_timeout
+        evicting = [(game_id, session) for game_id, session in self._sessions.items()
+                    if session.get_last_used() <= cutoff and (idle_timeout < 0 or not session.get_subscribers()) and
+                    session.get_game().get_repetition_rule() is None]
+        evicted = 0
+        for game_id, session in evicting:
+            # Games used or closed while earlier games were being written are skipped
+            if self._sessions.get(game_id) is not session or (idle_timeout >= 0 and session.get_last_used() > cutoff):
+                continue
+            # Take the snapshot and drop the game at once, so no move can be made while it is being written
+            snapshot = session.get_game().to_snapshot(packed=True)
+            del self._sessions[game_id]
+            pending = asyncio.get_running_loop().create_future()
+            self._pending[game_id] = pending
+            try:
+                await asyncio.to_thread(_write_file, self._snapshot_path(game_id), snapshot)
+                self._stats["games_evicted"] += 1
+                evicted += 1
+            finally:
+                del self._pending[game_id]
+                pending.set_result(None)
+        return evicted
+
+    async def _evict_forever(self):
+        """
+        Evicts idle games every quarter of the idle timeout (at most every 10 seconds).
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(min(max(self._idle_timeout / 4, 0.01), 10.0))
+            await self.evict_idle()
+
+
+def _read_file(path):
+    """
+    Reads a whole file, used in a thread.
+    :param path: Path string
+    :return: bytes
+    """
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _write_file(path, data):
+    """
+    Replaces a file's contents without leaving a half written file behind, used in a thread.
+    :param path: Path string
+    :param data: bytes
+    :return: None
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+class GameClient:
+    """The GameClient class sends requests to a GameServer over one connection, with many requests in flight.
+    This class will contain the following data members:
+    The asyncio.StreamReader and asyncio.StreamWriter of the connection
+    The id of the next request
+    A dict of request id -> asyncio.Future of the requests waiting for a reply
+    An asyncio.Queue of the updates received
+    The task reading replies"""
+
+    def __init__(self, reader, writer):
+        """The constructor for the GameClient class. Use GameClient.connect to create one.
+        :param reader: asyncio.StreamReader
+        :param writer: asyncio.StreamWriter"""
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._updates = asyncio.Queue()
+        self._read_task = asyncio.get_running_loop().create_task(self._read_replies())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """
+        Connects to a server.
+        :param host: String host of a TCP server
+        :param port: Int TCP port
+        :param path: Path of a Unix socket to connect to instead, or None
+        :return: GameClient
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, op, **fields):
+        """
+        Method that sends a request and waits for its reply.
+        :param op: String op, see the description at the top of the file
+        :param fields: The request's other fields
+        :return: Reply dict
+        """
+        self._next_id += 1
+        fields["op"] = op
+        fields["id"] = self._next_id
+        reply = asyncio.get_running_loop().create_future()
+        self._waiting[self._next_id] = reply
+        self._writer.write((json.dumps(fields, separators=(",", ":")) + "\n").encode())
+        return await reply
+
+    async def get_update(self):
+        """
+        Method that waits for the next update of a subscribed game.
+        :return: Update dict
+        """
+        return await self._updates.get()
+
+    async def close(self):
+        """
+        Method that closes the connection.
+        :return: None
+        """
+        self._read_task.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _read_replies(self):
+        """
+        Reads replies and updates until the connection closes, handing them to whoever is waiting.
+        :return: None
+        """
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if "update" in message:
+                    self._updates.put_nowait(message)
+                else:
+                    future = self._waiting.pop(message.get("id"), None)
+                    if future is not None and not future.done():
+                        future.set_result(message)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+            self._waiting.clear()
+
+
+async def _play_load_game(client, moves, rng, latencies):
+    """
+    Creates a game and plays random legal moves in it, recording the time every move took.
+    :param client: GameClient
+    :param moves: Int number of moves to play (fewer if the game ends)
+    :param rng: random.Random
+    :param latencies: List the seconds each move took are added to
+    :return: Int number of moves made
+    """
+    reply = await client.request("new")
+    game_id = reply["state"]["game"]
+    game = HasamiShogiGame(quiet=True)
+    made = 0
+    for ply in range(moves):
+        legal_moves = list(game.get_legal_moves())
+        if game.get_game_state() != "UNFINISHED" or not legal_moves:
+            break
+        origin, destination = legal_moves[rng.randrange(len(legal_moves))]
+        start = time.perf_counter()
+        reply = await client.request("move", game=game_id, move=origin * 81 + destination)
+        latencies.append(time.perf_counter() - start)
+        if not reply["ok"]:
+            raise RuntimeError("Server rejected a legal move: " + str(reply))
+        game.try_move_encoded(origin * 81 + destination)
+        made += 1
+    await client.request("close", game=game_id)
+    return made
+
+
+def _percentile(values, fraction):
+    """
+    Finds a percentile of a list of numbers.
+    :param values: Sorted list of numbers
+    :param fraction: Float from 0 to 1
+    :return: The value at that fraction of the list, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_load(games=100, moves=50, connections=None, host="127.0.0.1", port=DEFAULT_PORT, path=None, seed=0):
+    """
+    Function that plays random games on a server at once and measures how fast it answers.
+    :param games: Int number of concurrent games
+    :param moves: Int number of moves to play in each game
+    :param connections: Int number of connections to spread the games over, defaults to min(games, 64)
+    :param host: String host of a TCP server
+    :param port: Int TCP port
+    :param path: Path of a Unix socket to connect to instead, or None
+    :param seed: Int seed of the moves played
+    :return: Dict of games, moves, seconds, moves_per_second, and p50_ms and p99_ms move latencies
+    """
+    if connections is None:
+        connections = min(games, 64)
+    clients = [await GameClient.connect(host, port, path) for number in range(max(1, connections))]
+    latencies = []
+    start = time.perf_counter()
+    try:
+        made = await asyncio.gather(*[_play_load_game(clients[number % len(clients)], moves,
+                                                      random.Random(seed * 1000003 + number), latencies)
+                                      for number in range(games)])
+    finally:
+        for client in clients:
+            await client.close()
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {"games": games,
+            "moves": sum(made),
+            "seconds": seconds,
+            "moves_per_second": sum(made) / seconds if seconds > 0 else 0.0,
+            "p50_ms": _percentile(latencies, 0.50) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000}
+
+
+def add_serve_arguments(parser):
+    """
+    Adds the server command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--unix", help="Unix socket path to listen on instead of TCP")
+    parser.add_argument("--snapshot-dir", help="directory idle games are saved to, games stay in memory without one")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="seconds before an unused game is saved and dropped from memory")
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="standard",
+                        help="board backend of new games")
+
+
+def run_serve_command(args):
+    """
+    Runs the server from parsed command line arguments until interrupted.
+    :param args: argparse.Namespace from a parser set up with add_serve_arguments
+    :return: Int exit code
+    """
+    async def serve():
+        server = GameServer(args.snapshot_dir, args.idle_timeout, args.backend)
+        listener = await server.start(args.host, args.port, args.unix)
+        print("listening on", args.unix or "%s:%d" % listener.sockets[0].getsockname()[:2], file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def add_load_arguments(parser):
+    """
+    Adds the load generator command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("--games", type=int, default=100, help="number of concurrent games")
+    parser.add_argument("--moves", type=int, default=50, help="moves to play in each game")
+    parser.add_argument("--connections", type=int, help="connections to spread the games over")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port of the server")
+    parser.add_argument("--unix", help="Unix socket path of the server instead of TCP")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the moves played")
+
+
+def run_load_command(args):
+    """
+    Runs the load generator from parsed command line arguments and prints the results to stderr.
+    :param args: argparse.Namespace from a parser set up with add_load_arguments
+    :return: Int exit code
+    """
+    stats = asyncio.run(run_load(args.games, args.moves, args.connections, args.host, args.port, args.unix,
+                                 args.seed))
+    print("games: %d  moves: %d  seconds: %.2f" % (stats["games"], stats["moves"], stats["seconds"]),
+          file=sys.stderr)
+    print("moves/sec: %.1f  p50: %.2f ms  p99: %.2f ms" %
+          (stats["moves_per_second"], stats["p50_ms"], stats["p99_ms"]), file=sys.stderr)
+    return 0
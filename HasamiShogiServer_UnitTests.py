@@ -0,0 +1,138 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiServer module
+
+import unittest
+import unittest.mock
+import asyncio
+import os
+import tempfile
+import time
+from HasamiShogiGame import encode_move as encode_move
+from HasamiShogiServer import GameClient as GameClient
+from HasamiShogiServer import GameServer as GameServer
+from HasamiShogiServer import run_load as run_load
+
+
+class Test_GameServer(unittest.IsolatedAsyncioTestCase):
+    """Contains unit tests for the HasamiShogiServer.GameServer class, through a GameClient."""
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = GameServer(self.directory.name, idle_timeout=3600.0)
+        listener = await self.server.start(port=0)
+        self.port = listener.sockets[0].getsockname()[1]
+        self.client = await GameClient.connect(port=self.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.stop()
+        self.directory.cleanup()
+
+    # Playing moves, and rejected moves
+    async def test1(self):
+        reply = await self.client.request("new", game="first")
+        self.assertTrue(reply["ok"])
+        self.assertEqual("BLACK", reply["state"]["active_player"])
+        self.assertFalse((await self.client.request("new", game="first"))["ok"])
+
+        reply = await self.client.request("move", game="first", origin="i2", destination="h2")
+        self.assertTrue(reply["ok"])
+        self.assertIsNone(reply["reason"])
+        self.assertEqual("RED", reply["state"]["active_player"])
+        reply = await self.client.request("move", game="first", move=encode_move("a1", "a2"))
+        self.assertFalse(reply["ok"])
+        self.assertEqual("PATH_BLOCKED", reply["reason"])
+        reply = await self.client.request("state", game="first")
+        self.assertEqual("RRRRRRRRR/9/9/9/9/9/9/1B7/B1BBBBBBB r 0 0 UNFINISHED", reply["state"]["snapshot"])
+        self.assertEqual(1, self.server.get_stats()["moves"])
+
+    # Requests that can't be handled
+    async def test2(self):
+        self.assertIn("Unknown game", (await self.client.request("state", game="missing"))["error"])
+        self.assertIn("Invalid game id", (await self.client.request("state", game="../etc"))["error"])
+        self.assertIn("Unknown op", (await self.client.request("jump", game="missing"))["error"])
+        game_id = (await self.client.request("new"))["state"]["game"]
+        reply = await self.client.request("move", game=game_id, move="i1h1")
+        self.assertIn("must be an int", reply["error"])
+        reply = await self.server.handle_line(b"{not json")
+        self.assertIn("not valid JSON", reply["error"])
+
+    # Subscribers get an update for every move, from any connection
+    async def test3(self):
+        game_id = (await self.client.request("new"))["state"]["game"]
+        await self.client.request("subscribe", game=game_id)
+        other = await GameClient.connect(port=self.port)
+        try:
+            await other.request("move", game=game_id, origin="i5", destination="c5")
+            update = await asyncio.wait_for(self.client.get_update(), 5)
+        finally:
+            await other.close()
+        self.assertEqual(game_id, update["update"])
+        self.assertEqual("i5c5", update["move"])
+        self.assertEqual("RED", update["state"]["active_player"])
+
+    # Idle games are saved to disk, and loaded again when used
+    async def test4(self):
+        await self.client.request("new", game="idle")
+        await self.client.request("move", game="idle", origin="i5", destination="c5")
+        state = (await self.client.request("state", game="idle"))["state"]
+        self.assertEqual(1, await self.server.evict_idle(idle_timeout=-1.0))
+        self.assertEqual(0, self.server.get_stats()["games_in_memory"])
+        self.assertEqual(23, os.path.getsize(os.path.join(self.directory.name, "idle.snap")))
+
+        self.assertEqual(state, (await self.client.request("state", game="idle"))["state"])
+        self.assertEqual(1, self.server.get_stats()["games_loaded"])
+        self.assertEqual(0, await self.server.evict_idle())
+
+        await self.client.request("close", game="idle")
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "idle.snap")))
+        self.assertFalse((await self.client.request("state", game="idle"))["ok"])
+
+    # Games with a repetition rule stay in memory, a snapshot would lose the positions they have reached
+    async def test5(self):
+        await self.client.request("new", game="ruled")
+        self.server._sessions["ruled"].get_game().set_repetition_rule(3)
+        self.assertEqual(0, await self.server.evict_idle(idle_timeout=-1.0))
+        self.assertEqual(1, self.server.get_stats()["games_in_memory"])
+
+    # Requests racing a close don't load the game back from its snapshot, and closing it twice fails cleanly
+    async def test6(self):
+        await self.client.request("new", game="closing")
+        await self.server.evict_idle(idle_timeout=-1.0)
+        await self.client.request("state", game="closing")
+        remove = os.remove
+
+        def slow_remove(path):
+            time.sleep(0.05)
+            remove(path)
+
+        with unittest.mock.patch("HasamiShogiServer.os.remove", slow_remove):
+            replies = await asyncio.gather(*(self.server.handle_line(line) for line in [
+                b'{"op": "close", "game": "closing"}', b'{"op": "state", "game": "closing"}',
+                b'{"op": "close", "game": "closing"}']))
+        self.assertEqual([True, False, False], [reply["ok"] for reply in replies])
+        self.assertIn("Unknown game", replies[2]["error"])
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "closing.snap")))
+        self.assertEqual(0, self.server.get_stats()["games_in_memory"])
+
+
+class Test_run_load(unittest.IsolatedAsyncioTestCase):
+    """Contains unit tests for the HasamiShogiServer.run_load() function."""
+
+    async def test1(self):
+        server = GameServer()
+        listener = await server.start(port=0)
+        try:
+            stats = await run_load(games=6, moves=20, connections=2, port=listener.sockets[0].getsockname()[1])
+        finally:
+            await server.stop()
+        self.assertEqual(6, stats["games"])
+        self.assertEqual(stats["moves"], server.get_stats()["moves"])
+        self.assertGreater(stats["moves"], 0)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertEqual(0, server.get_stats()["games_in_memory"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,780 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Retrograde analysis endgame tablebases for HasamiShogiGame positions with few pieces left, with
+#              a memory-mapped file per table and a probe API for the search
+
+
+# =============== DETAILED TEXT DESCRIPTIONS OF HOW THE TABLEBASE WORKS ===============
+# 1) Tables
+#       A table holds every position with the same configuration: (red pieces, black pieces, red needs,
+#       black needs). A player's needs is the number of captures they still have to make to win, 9 minus
+#       the captured pieces count of the pieces they captured. The needs aren't always the opponent's pieces
+#       count, because corner captures count even when the corner is empty or holds the mover's own piece
+#       (see Board.get_sandwiched).
+#       A move that captures always lowers the mover's needs, so every capture either wins the game or moves
+#       the position into a table with lower total needs. Moves that don't capture stay in the same table.
+#       get_dependencies lists a table and every table it can reach, in the order they have to be generated.
+#
+# 2) Perfect index
+#       Every position of a table has exactly one index, from 0 to (table size - 1), with no gaps:
+#           index = (side * C(81, red pieces) + red rank) * C(81 - red pieces, black pieces) + black rank
+#       side is 0 with black to move and 1 with red to move. The ranks use the combinatorial number system:
+#       the rank of the sorted squares s1 < s2 < ... < sk is C(s1, 1) + C(s2, 2) + ... + C(sk, k).
+#       Black squares are numbered from 0 to 80 - red pieces, skipping the squares red pieces are on.
+#
+# 3) Values
+#       Every position is stored as a 16 bit value for the player to move:
+#           bits 0-13   distance, the number of plies until the game ends with best play (0 for a draw)
+#           bits 14-15  result, DRAW (0), WIN (1), or LOSS (2)
+#       A winning player wins as fast as possible, a losing player loses as slowly as possible. A player with
+#       no legal moves, and every position neither player can force a win from, is a draw.
+#
+# 4) File layout
+#       Every table is its own file, named like "r2b1_n12.hstb" for 2 red pieces, 1 black piece, red needs 1,
+#       and black needs 2. Every number is little endian.
+#           4 bytes  magic b"HSTB"
+#           1 byte   format version (1)
+#           4 bytes  red pieces, black pieces, red needs, black needs
+#           3 bytes  reserved, always 0
+#           8 bytes  number of positions
+#       followed by the 2 byte value of every position, in index order.
+#       Tablebase maps the files with mmap, so probing reads only the pages it needs.
+#
+# 5) Generating a table
+#       The scan looks at every position of the table once. It counts the moves that stay in the table and
+#       works out the best result of the moves that capture, from the tables already generated.
+#       The retrograde pass then resolves positions in order of distance, starting from the ones the scan
+#       settled. When a position is a loss, every position that can move into it is a win one ply longer.
+#       When a position is a win, the move count of every position that can move into it goes down by one,
+#       and a position with no moves left that isn't already a win is a loss (or a draw, if a capture draws).
+#       The positions that can move into a position are found by sliding the last mover's pieces backward,
+#       skipping pieces whose arrival would have captured something.
+#       Positions still unresolved at the end are draws.
+#
+# 6) Parallel and resumable generation
+#       The scan is split into chunks of positions, which are scanned by worker processes when workers > 1.
+#       Every finished chunk is saved in a "<table>.scan" directory next to the table, and every finished table
+#       is written to a temporary file and renamed into place. Running generate again after it was stopped
+#       skips the tables and chunks that were already finished.
+#
+
+import bisect
+import math
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from HasamiShogiGame import RAYS, SQUARE_XY
+
+MAGIC = b"HSTB"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBBBB3xQ")
+_FILE_NAME = "r%db%d_n%d%d.hstb"
+_FILE_NAME_PATTERN = re.compile(r"^r(\d)b(\d)_n(\d)(\d)\.hstb$")
+DEFAULT_CHUNK_SIZE = 100000  # Positions scanned per chunk, and saved per checkpoint file
+
+DRAW = 0
+WIN = 1
+LOSS = 2
+RESULTS = ("DRAW", "WIN", "LOSS")
+_RESULT_SHIFT = 14
+_DISTANCE_MASK = (1 << _RESULT_SHIFT) - 1
+_WIN = WIN << _RESULT_SHIFT
+_LOSS = LOSS << _RESULT_SHIFT
+_NO_EXIT = 0xFFFF  # Scan value of a position with no capturing moves
+
+_BITS = [1 << index for index in range(81)]
+_CORNERS = (0, 8, 72, 80)
+# Neighbors of every square, and whether one of them is a corner, so most capture checks can be skipped
+_NEIGHBORS = [sum(_BITS[ray[0]] for ray in (RAYS[direction][index] for direction in RAYS) if ray)
+              for index in range(81)]
+_NEXT_TO_CORNER = [any(_BITS[corner] & _NEIGHBORS[index] for corner in _CORNERS) for index in range(81)]
+# Both neighbors of every corner, as a mask (0 for squares that aren't corners)
+_CORNER_NEIGHBORS = [_NEIGHBORS[index] if index in _CORNERS else 0 for index in range(81)]
+# Rays walked from every square when checking for captures, and when generating moves
+_CAPTURE_RAYS = [tuple(RAYS[direction][index] for direction in ("LEFT", "RIGHT", "DOWN", "UP")
+                       if RAYS[direction][index]) for index in range(81)]
+_MOVE_RAYS = [tuple(RAYS[direction][index] for direction in ("UP", "DOWN", "LEFT", "RIGHT")
+                    if RAYS[direction][index]) for index in range(81)]
+# _COMBINATIONS[k][n] is C(n, k), increasing in n, so ranks can be unranked with bisect
+_COMBINATIONS = [[math.comb(n, k) for n in range(82)] for k in range(10)]
+
+
+class InvalidTable(ValueError):
+    pass
+
+
+def table_name(configuration):
+    """
+    Function that returns the file name of a table.
+    :param configuration: (red pieces, black pieces, red needs, black needs) tuple of ints
+    :return: String file name
+    """
+    return _FILE_NAME % tuple(configuration)
+
+
+def get_dependencies(configuration):
+    """
+    Function that finds every table a table's positions can move into, including the table itself.
+    :param configuration: (red pieces, black pieces, red needs, black needs) tuple of ints, needs from 1 to 9
+    :return: List of configuration tuples in the order they have to be generated, the given one last
+    """
+    red_pieces, black_pieces, red_needs, black_needs = configuration
+    if not (0 <= red_pieces <= 9 and 0 <= black_pieces <= 9 and 1 <= red_needs <= 9 and 1 <= black_needs <= 9):
+        raise ValueError("Invalid tablebase configuration: %r" % (configuration,))
+    configurations = [(red, black, red_left, black_left)
+                      for red in range(red_pieces + 1) for black in range(black_pieces + 1)
+                      for red_left in range(1, red_needs + 1) for black_left in range(1, black_needs + 1)]
+    configurations.sort(key=lambda item: (item[2] + item[3], item[0] + item[1], item))
+    return configurations
+
+
+def _squares(mask):
+    """
+    Function that lists the squares set in a mask.
+    :param mask: 81 bit int
+    :return: List of square indices, in increasing order
+    """
+    squares = []
+    while mask:
+        lowest = mask & -mask
+        squares.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return squares
+
+
+def _captures(destination, mover, opponent):
+    """
+    Function that finds what a piece captures when it arrives on a square, exactly like
+    HasamiShogiGame._execute_move does it.
+    :param destination: Square index the piece arrived on
+    :param mover: 81 bit mask of the mover's pieces, after the move
+    :param opponent: 81 bit mask of the opponent's pieces
+    :return: (count, taken, lost) tuple: the number of squares captured (added to the mover's captured pieces
+             count), a mask of the opponent pieces captured, and a mask of the mover's own pieces captured
+    """
+    if not (opponent & _NEIGHBORS[destination] or _NEXT_TO_CORNER[destination]):
+        return 0, 0, 0
+    count = 0
+    taken = 0
+    lost = 0
+    for ray in _CAPTURE_RAYS[destination]:
+        square = ray[0]
+        neighbors = _CORNER_NEIGHBORS[square]
+        if neighbors:
+            # Corners are captured when both neighbors hold the mover's pieces, whatever is on them
+            if mover & neighbors == neighbors:
+                count += 1
+                bit = _BITS[square]
+                if opponent & bit:
+                    taken |= bit
+                elif mover & bit:
+                    lost |= bit
+            continue
+        line = 0
+        length = 0
+        for square in ray:
+            bit = _BITS[square]
+            if opponent & bit:
+                line |= bit
+                length += 1
+            else:
+                if mover & bit:
+                    taken |= line
+                    count += length
+                break
+    return count, taken, lost
+
+
+def _value_order(value):
+    """
+    Function that orders values from the point of view of the player choosing between them.
+    :param value: 16 bit value
+    :return: Int, higher for better values
+    """
+    result = value >> _RESULT_SHIFT
+    if result == WIN:
+        return 0x10000 - (value & _DISTANCE_MASK)
+    if result == LOSS:
+        return (value & _DISTANCE_MASK) - 0x10000
+    return 0
+
+
+def _after_move(child_value):
+    """
+    Function that converts the value of the position after a move, for its player to move, to the value of
+    the move for the player making it.
+    :param child_value: 16 bit value
+    :return: 16 bit value
+    """
+    result = child_value >> _RESULT_SHIFT
+    if result == WIN:
+        return _LOSS | ((child_value & _DISTANCE_MASK) + 1)
+    if result == LOSS:
+        return _WIN | ((child_value & _DISTANCE_MASK) + 1)
+    return child_value
+
+
+class _Layout:
+    """The _Layout class is used to convert between the positions of a table and their indices.
+    This class will contain the following data members:
+    The number of red pieces and of black pieces
+    The number of ways to place the red pieces, C(81, red pieces)
+    The number of ways to place the black pieces on the other squares, C(81 - red pieces, black pieces)
+    The number of positions, 2 * red count * black count"""
+
+    def __init__(self, red_pieces, black_pieces):
+        """The constructor for the _Layout class.
+        :param red_pieces: Int number of red pieces
+        :param black_pieces: Int number of black pieces"""
+        self._red_pieces = red_pieces
+        self._black_pieces = black_pieces
+        self._red_count = math.comb(81, red_pieces)
+        self._black_count = math.comb(81 - red_pieces, black_pieces)
+        self._size = 2 * self._red_count * self._black_count
+
+    def get_size(self):
+        """
+        Method that returns the number of positions in the table.
+        :return: Int
+        """
+        return self._size
+
+    def encode(self, black_to_move, red, black):
+        """
+        Method that returns the index of a position.
+        :param black_to_move: True if black is the player to move
+        :param red: 81 bit mask of the red pieces
+        :param black: 81 bit mask of the black pieces
+        :return: Int index
+        """
+        return self.encode_squares(black_to_move, _squares(red), _squares(black))
+
+    def encode_squares(self, black_to_move, red_squares, black_squares):
+        """
+        Method that returns the index of a position given as lists of squares.
+        :param black_to_move: True if black is the player to move
+        :param red_squares: List of the square indices of the red pieces, in increasing order
+        :param black_squares: List of the square indices of the black pieces, in increasing order
+        :return: Int index
+        """
+        red_rank = 0
+        k = 1
+        for square in red_squares:
+            red_rank += _COMBINATIONS[k][square]
+            k += 1
+        black_rank = 0
+        k = 1
+        for square in black_squares:
+            below = square
+            for red_square in red_squares:
+                if red_square < square:
+                    below -= 1
+            black_rank += _COMBINATIONS[k][below]
+            k += 1
+        return ((0 if black_to_move else 1) * self._red_count + red_rank) * self._black_count + black_rank
+
+    def decode(self, index):
+        """
+        Method that returns the position of an index.
+        :param index: Int from 0 to size - 1
+        :return: (black to move, red squares, black squares) tuple, the squares as lists of square indices in
+                 increasing order
+        """
+        rest, black_rank = divmod(index, self._black_count)
+        side, red_rank = divmod(rest, self._red_count)
+        red_squares = _unrank(red_rank, self._red_pieces)
+        black_squares = _unrank(black_rank, self._black_pieces)
+        for red_square in red_squares:
+            for number, square in enumerate(black_squares):
+                if square >= red_square:
+                    black_squares[number] = square + 1
+        return side == 0, red_squares, black_squares
+
+
+def _unrank(rank, pieces):
+    """
+    Function that finds the squares with a combinatorial number system rank.
+    :param rank: Int rank
+    :param pieces: Int number of squares
+    :return: List of square indices, in increasing order
+    """
+    squares = []
+    for k in range(pieces, 0, -1):
+        square = bisect.bisect_right(_COMBINATIONS[k], rank) - 1
+        rank -= _COMBINATIONS[k][square]
+        squares.append(square)
+    squares.reverse()
+    return squares
+
+
+class Tablebase:
+    """The Tablebase class is used to look up positions in the tables of a directory.
+    This class will contain the following data members:
+    The path of the directory the tables are in
+    A set of the configurations that have a table file
+    A dict of configuration -> (mmap, _Layout) for every table opened so far"""
+
+    def __init__(self, directory):
+        """The constructor for the Tablebase class.
+        Tables are opened the first time they are probed.
+        :param directory: Path of the directory holding the table files"""
+        self._directory = directory
+        self._configurations = set()
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                match = _FILE_NAME_PATTERN.match(name)
+                if match:
+                    self._configurations.add(tuple(int(number) for number in match.groups()))
+        self._needs = {configuration[2:] for configuration in self._configurations}
+        self._tables = {}
+
+    def get_configurations(self):
+        """
+        Method that returns the configurations that have a table.
+        :return: Sorted list of (red pieces, black pieces, red needs, black needs) tuples
+        """
+        return sorted(self._configurations)
+
+    def close(self):
+        """
+        Method that closes every table opened so far.
+        :return: None
+        """
+        for buffer, layout in self._tables.values():
+            buffer.close()
+        self._tables = {}
+
+    def _open(self, configuration):
+        """
+        Opens a table, checking its header.
+        Raises an InvalidTable exception if the file isn't a finished table of the configuration.
+        :param configuration: Configuration tuple
+        :return: (mmap, _Layout) tuple
+        """
+        table = self._tables.get(configuration)
+        if table is None:
+            path = os.path.join(self._directory, table_name(configuration))
+            layout = _Layout(configuration[0], configuration[1])
+            with open(path, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(buffer) < _HEADER.size or _read_header(buffer) != (configuration, layout.get_size()):
+                buffer.close()
+                raise InvalidTable("Not a finished table of %r: %s" % (configuration, path))
+            if len(buffer) != _HEADER.size + 2 * layout.get_size():
+                buffer.close()
+                raise InvalidTable("Truncated table: " + path)
+            table = self._tables[configuration] = (buffer, layout)
+        return table
+
+    def _probe_value(self, configuration, black_to_move, red, black):
+        """
+        Looks up the 16 bit value of a position.
+        :param configuration: Configuration tuple of a table this tablebase has
+        :param black_to_move: True if black is the player to move
+        :param red: 81 bit mask of the red pieces
+        :param black: 81 bit mask of the black pieces
+        :return: 16 bit value
+        """
+        buffer, layout = self._open(configuration)
+        offset = _HEADER.size + 2 * layout.encode(black_to_move, red, black)
+        return buffer[offset] | buffer[offset + 1] << 8
+
+    def probe_position(self, red, black, black_to_move, red_needs, black_needs):
+        """
+        Method that looks up a position given as bitboards.
+        :param red: 81 bit mask of the red pieces
+        :param black: 81 bit mask of the black pieces
+        :param black_to_move: True if black is the player to move
+        :param red_needs: Int captures red still has to make to win, 9 minus the number of black pieces captured
+        :param black_needs: Int captures black still has to make to win
+        :return: (result, distance) tuple for the player to move, result "WIN", "LOSS", or "DRAW" and distance the
+                 number of plies until the game ends (0 for draws), or None if there is no table for the position
+        """
+        configuration = (len(_squares(red)), len(_squares(black)), red_needs, black_needs)
+        if configuration not in self._configurations:
+            return None
+        value = self._probe_value(configuration, black_to_move, red, black)
+        return RESULTS[value >> _RESULT_SHIFT], value & _DISTANCE_MASK
+
+    def probe(self, game):
+        """
+        Method that looks up the current position of a game. Positions without a table are rejected after
+        looking only at the captured pieces counts, so probing positions with many pieces left is cheap.
+        :param game: A HasamiShogiGame
+        :return: (result, distance) tuple for the active player, see probe_position, or None if the game is over
+                 or there is no table for the position
+        """
+        if game.get_game_state() != "UNFINISHED":
+            return None
+        red_needs = 9 - game.get_num_captured_pieces("BLACK")
+        black_needs = 9 - game.get_num_captured_pieces("RED")
+        if (red_needs, black_needs) not in self._needs:
+            return None
+        red, black = game._board.get_masks()
+        return self.probe_position(red, black, game.get_active_player() == "BLACK", red_needs, black_needs)
+
+    def get_best_move(self, game):
+        """
+        Method that finds the best move in a position with a table. The game is left in the same position.
+        :param game: A HasamiShogiGame
+        :return: ((origin, destination) square index tuple, (result, distance) tuple of the position) or None if
+                 the position can't be probed or has no legal moves. Ties go to the lowest move
+        """
+        position = self.probe(game)
+        if position is None:
+            return None
+        best_move = None
+        best_order = None
+        for move in game.get_legal_moves():
+            game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+            try:
+                if game.get_game_state() != "UNFINISHED":
+                    value = _WIN | 1
+                else:
+                    child = self.probe(game)
+                    if child is None:
+                        raise InvalidTable("Missing table after move %r" % (move,))
+                    value = _after_move(RESULTS.index(child[0]) << _RESULT_SHIFT | child[1])
+            finally:
+                game._unmake_move()
+            order = _value_order(value)
+            if best_order is None or order > best_order or (order == best_order and move < best_move):
+                best_move = move
+                best_order = order
+        if best_move is None:
+            return None
+        return best_move, position
+
+
+def _read_header(buffer):
+    """
+    Reads the header of a table file.
+    :param buffer: Bytes-like object starting with the header
+    :return: (configuration tuple, number of positions), or None if the magic or version are wrong
+    """
+    magic, version, red_pieces, black_pieces, red_needs, black_needs, size = _HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return (red_pieces, black_pieces, red_needs, black_needs), size
+
+
+def _is_finished(directory, configuration):
+    """
+    Checks whether a table has already been generated.
+    :param directory: Path of the tablebase directory
+    :param configuration: Configuration tuple
+    :return: True if the table file exists with the right header and size
+    """
+    path = os.path.join(directory, table_name(configuration))
+    size = _Layout(configuration[0], configuration[1]).get_size()
+    try:
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size or _read_header(header) != (configuration, size):
+                return False
+            return os.fstat(file.fileno()).st_size == _HEADER.size + 2 * size
+    except OSError:
+        return False
+
+
+def _scan_chunk(directory, configuration, start, stop):
+    """
+    Scans positions start to stop - 1 of a table and saves the result as a checkpoint file in the table's
+    scan directory. Does nothing if the chunk was already saved.
+    :param directory: Path of the tablebase directory, holding every table the configuration depends on
+    :param configuration: Configuration tuple
+    :param start: Int index of the first position
+    :param stop: Int index after the last position
+    :return: Path of the checkpoint file, holding the move counts then the capture values (see _scan)
+    """
+    scan_directory = os.path.join(directory, table_name(configuration) + ".scan")
+    path = os.path.join(scan_directory, "%d.bin" % start)
+    if os.path.exists(path):
+        return path
+    os.makedirs(scan_directory, exist_ok=True)
+    counts, exits = _scan(Tablebase(directory), configuration, start, stop)
+    temporary = path + ".tmp%d" % os.getpid()
+    with open(temporary, "wb") as file:
+        counts.tofile(file)
+        exits.tofile(file)
+    os.replace(temporary, path)
+    return path
+
+
+def _scan(tablebase, configuration, start, stop):
+    """
+    Scans positions of a table, generating every legal move.
+    :param tablebase: Tablebase holding every table the configuration depends on
+    :param configuration: Configuration tuple
+    :param start: Int index of the first position
+    :param stop: Int index after the last position
+    :return: (counts, exits) tuple of arrays with one item per position. counts has the number of moves that
+             don't capture, exits the best value of the moves that capture for the player to move, or _NO_EXIT
+    """
+    red_pieces, black_pieces, red_needs, black_needs = configuration
+    layout = _Layout(red_pieces, black_pieces)
+    counts = array("H", bytes(2 * (stop - start)))
+    exits = array("H", [_NO_EXIT]) * (stop - start)
+    for index in range(start, stop):
+        black_to_move, red_squares, black_squares = layout.decode(index)
+        red = 0
+        for square in red_squares:
+            red |= _BITS[square]
+        black = 0
+        for square in black_squares:
+            black |= _BITS[square]
+        if black_to_move:
+            mover_squares, mover, opponent, needs = black_squares, black, red, black_needs
+        else:
+            mover_squares, mover, opponent, needs = red_squares, red, black, red_needs
+        occupied = red | black
+        moves = 0
+        best = _NO_EXIT
+        best_order = None
+        for origin in mover_squares:
+            remaining = mover ^ _BITS[origin]
+            for ray in _MOVE_RAYS[origin]:
+                for destination in ray:
+                    bit = _BITS[destination]
+                    if occupied & bit:
+                        break
+                    moved = remaining | bit
+                    count, taken, lost = _captures(destination, moved, opponent)
+                    if not count:
+                        moves += 1
+                        continue
+                    if count >= needs:
+                        value = _WIN | 1
+                    else:
+                        moved ^= lost
+                        if black_to_move:
+                            child = (red_pieces - len(_squares(taken)), black_pieces - len(_squares(lost)),
+                                     red_needs, black_needs - count)
+                            value = tablebase._probe_value(child, False, opponent ^ taken, moved)
+                        else:
+                            child = (red_pieces - len(_squares(lost)), black_pieces - len(_squares(taken)),
+                                     red_needs - count, black_needs)
+                            value = tablebase._probe_value(child, True, moved, opponent ^ taken)
+                        value = _after_move(value)
+                    order = _value_order(value)
+                    if best_order is None or order > best_order:
+                        best = value
+                        best_order = order
+        counts[index - start] = moves
+        exits[index - start] = best
+    return counts, exits
+
+
+def _predecessors(layout, black_to_move, red_squares, black_squares):
+    """
+    Finds every position of the same table that has a move (that doesn't capture) to a position.
+    :param layout: _Layout of the table
+    :param black_to_move: True if black is the player to move in the position
+    :param red_squares: List of the square indices of the red pieces, in increasing order
+    :param black_squares: List of the square indices of the black pieces, in increasing order
+    :return: List of indices of positions where the other player is to move
+    """
+    red = 0
+    for square in red_squares:
+        red |= _BITS[square]
+    black = 0
+    for square in black_squares:
+        black |= _BITS[square]
+    if black_to_move:
+        mover_squares, last_mover, opponent = red_squares, red, black
+    else:
+        mover_squares, last_mover, opponent = black_squares, black, red
+    occupied = red | black
+    indices = []
+    for square in mover_squares:
+        # A piece that would have captured on arriving here can't have just moved without leaving the table
+        if _captures(square, last_mover, opponent)[0]:
+            continue
+        others = [other for other in mover_squares if other != square]
+        for ray in _MOVE_RAYS[square]:
+            for origin in ray:
+                if occupied & _BITS[origin]:
+                    break
+                moved = others[:]
+                bisect.insort(moved, origin)
+                if black_to_move:
+                    indices.append(layout.encode_squares(False, moved, black_squares))
+                else:
+                    indices.append(layout.encode_squares(True, red_squares, moved))
+    return indices
+
+
+def _retrograde(layout, counts, exits):
+    """
+    Resolves every position of a table from its scan (see the description at the top of the file).
+    :param layout: _Layout of the table
+    :param counts: array of the number of moves of every position that don't capture, changed in place
+    :param exits: array of the best capturing move value of every position, or _NO_EXIT
+    :return: array of the 16 bit value of every position
+    """
+    values = array("H", bytes(2 * layout.get_size()))
+    buckets = {}
+    for index, best in enumerate(exits):
+        if best == _NO_EXIT:
+            continue
+        result = best >> _RESULT_SHIFT
+        if result == WIN or (result == LOSS and counts[index] == 0):
+            values[index] = best
+            buckets.setdefault(best & _DISTANCE_MASK, []).append(index)
+
+    distance = 0
+    while buckets:
+        distance += 1
+        for index in buckets.pop(distance, ()):
+            value = values[index]
+            if value & _DISTANCE_MASK != distance:
+                continue  # Replaced by a faster win
+            previous_indices = _predecessors(layout, *layout.decode(index))
+            if value >> _RESULT_SHIFT == LOSS:
+                win = _WIN | (distance + 1)
+                for previous in previous_indices:
+                    current = values[previous]
+                    if current >> _RESULT_SHIFT != WIN or current > win:
+                        values[previous] = win
+                        buckets.setdefault(distance + 1, []).append(previous)
+            else:
+                for previous in previous_indices:
+                    counts[previous] -= 1
+                    if counts[previous] or values[previous] >> _RESULT_SHIFT == WIN:
+                        continue
+                    best = exits[previous]
+                    if best == _NO_EXIT:
+                        loss = distance + 1
+                    elif best >> _RESULT_SHIFT == LOSS:
+                        loss = max(distance + 1, best & _DISTANCE_MASK)
+                    else:
+                        continue  # A capture draws
+                    values[previous] = _LOSS | loss
+                    buckets.setdefault(loss, []).append(previous)
+    return values
+
+
+def _generate_table(directory, configuration, executor, chunk_size):
+    """
+    Generates one table, every table it depends on must already be finished.
+    :param directory: Path of the tablebase directory
+    :param configuration: Configuration tuple
+    :param executor: ProcessPoolExecutor to scan chunks in, or None to scan in this process
+    :param chunk_size: Int number of positions per chunk
+    :return: Dict of statistics, see generate
+    """
+    start_time = time.perf_counter()
+    layout = _Layout(configuration[0], configuration[1])
+    size = layout.get_size()
+    scan_directory = os.path.join(directory, table_name(configuration) + ".scan")
+    starts = range(0, size, chunk_size)
+    args = [(directory, configuration, start, min(start + chunk_size, size)) for start in starts]
+    if executor is not None:
+        paths = list(executor.map(_scan_chunk, *zip(*args)))
+    else:
+        paths = [_scan_chunk(*arg) for arg in args]
+
+    counts = array("H")
+    exits = array("H")
+    for (directory, configuration, start, stop), path in zip(args, paths):
+        with open(path, "rb") as file:
+            counts.fromfile(file, stop - start)
+            exits.fromfile(file, stop - start)
+    values = _retrograde(layout, counts, exits)
+
+    path = os.path.join(directory, table_name(configuration))
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, *configuration, size))
+        if sys.byteorder != "little":
+            values.byteswap()
+        values.tofile(file)
+    os.replace(temporary, path)
+    shutil.rmtree(scan_directory)
+
+    stats = {"table": table_name(configuration), "positions": size, "max_distance": 0,
+             "seconds": time.perf_counter() - start_time}
+    for name in RESULTS:
+        stats[name] = 0
+    for value in values:
+        stats[RESULTS[value >> _RESULT_SHIFT]] += 1
+        if value & _DISTANCE_MASK > stats["max_distance"]:
+            stats["max_distance"] = value & _DISTANCE_MASK
+    return stats
+
+
+def generate(directory, red_pieces, black_pieces, red_needs=None, black_needs=None, workers=1,
+             chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Function that generates a table and every table it depends on, skipping tables that are already finished.
+    :param directory: Path of the directory to write tables to, created if missing
+    :param red_pieces: Int number of red pieces
+    :param black_pieces: Int number of black pieces
+    :param red_needs: Int captures red still has to make to win, defaults to black_pieces
+    :param black_needs: Int captures black still has to make to win, defaults to red_pieces
+    :param workers: Int number of worker processes to scan in, 1 scans in this process
+    :param chunk_size: Int number of positions scanned per chunk and checkpoint file
+    :param progress: Function called with the statistics dict of every generated table, or None
+    :return: List of statistics dicts of the tables generated (not the ones skipped), each with "table",
+             "positions", "WIN", "LOSS", "DRAW", "max_distance", and "seconds"
+    """
+    if red_needs is None:
+        red_needs = max(1, black_pieces)
+    if black_needs is None:
+        black_needs = max(1, red_pieces)
+    os.makedirs(directory, exist_ok=True)
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    generated = []
+    try:
+        for configuration in get_dependencies((red_pieces, black_pieces, red_needs, black_needs)):
+            if _is_finished(directory, configuration):
+                continue
+            stats = _generate_table(directory, configuration, executor, chunk_size)
+            generated.append(stats)
+            if progress is not None:
+                progress(stats)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return generated
+
+
+def add_arguments(parser):
+    """
+    Adds the tablebase command line arguments to an argparse parser.
+    :param parser: argparse.ArgumentParser
+    :return: None
+    """
+    parser.add_argument("directory", help="directory to write the tables to")
+    parser.add_argument("--red", type=int, default=1, help="number of red pieces")
+    parser.add_argument("--black", type=int, default=1, help="number of black pieces")
+    parser.add_argument("--red-needs", type=int, default=None,
+                        help="captures red still has to make to win, defaults to the number of black pieces")
+    parser.add_argument("--black-needs", type=int, default=None,
+                        help="captures black still has to make to win, defaults to the number of red pieces")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="positions per checkpoint")
+
+
+def run_command(args):
+    """
+    Generates tables from parsed command line arguments, printing every table generated to stderr.
+    :param args: argparse.Namespace from a parser set up with add_arguments
+    :return: Int exit code
+    """
+    def report(stats):
+        print("%s: %d positions  WIN: %d  LOSS: %d  DRAW: %d  longest: %d plies  %.1f seconds" %
+              (stats["table"], stats["positions"], stats["WIN"], stats["LOSS"], stats["DRAW"],
+               stats["max_distance"], stats["seconds"]), file=sys.stderr)
+
+    generated = generate(args.directory, args.red, args.black, args.red_needs, args.black_needs, args.workers,
+                         args.chunk_size, report)
+    print("%d tables generated" % len(generated), file=sys.stderr)
+    return 0
@@ -0,0 +1,198 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Unit tests for the HasamiShogiTablebase module
+
+import unittest
+import unittest.mock
+import io
+import os
+import random
+import tempfile
+import HasamiShogiTablebase as tablebase_module
+from HasamiShogiGame import HasamiShogiGame as HasamiShogiGame
+from HasamiShogiGame import SQUARE_XY as SQUARE_XY
+from HasamiShogiSearch import AlphaBetaSearch as AlphaBetaSearch
+from HasamiShogiSearch import WIN_SCORE as WIN_SCORE
+from HasamiShogiSearch import find_best_move as find_best_move
+from HasamiShogiTablebase import Tablebase as Tablebase
+from HasamiShogiTablebase import generate as generate
+from HasamiShogiTablebase import get_dependencies as get_dependencies
+from HasamiShogiTablebase import table_name as table_name
+from HasamiShogiTools import main as tools_main
+
+
+def game_at(index, configuration, backend="standard"):
+    """Builds a quiet game in the position with an index in a table."""
+    black_to_move, red_squares, black_squares = tablebase_module._Layout(*configuration[:2]).decode(index)
+    value = sum(1 << square for square in red_squares) | sum(1 << square for square in black_squares) << 81
+    if black_to_move:
+        value |= 1 << 162
+    snapshot = value.to_bytes(21, "little") + bytes((9 - configuration[3], 9 - configuration[2]))
+    return HasamiShogiGame.from_snapshot(snapshot, backend, quiet=True)
+
+
+class Test_Layout(unittest.TestCase):
+    """Contains unit tests for the perfect index of the HasamiShogiTablebase tables."""
+
+    # Every index of a table is a different position, and encodes back to itself
+    def test1(self):
+        layout = tablebase_module._Layout(1, 1)
+        self.assertEqual(2 * 81 * 80, layout.get_size())
+        positions = set()
+        for index in range(layout.get_size()):
+            black_to_move, red_squares, black_squares = layout.decode(index)
+            self.assertFalse(set(red_squares) & set(black_squares))
+            self.assertEqual(index, layout.encode_squares(black_to_move, red_squares, black_squares))
+            positions.add((black_to_move, tuple(red_squares), tuple(black_squares)))
+        self.assertEqual(layout.get_size(), len(positions))
+
+    def test2(self):
+        layout = tablebase_module._Layout(3, 2)
+        rng = random.Random(5)
+        for attempt in range(200):
+            squares = rng.sample(range(81), 5)
+            red = sum(1 << square for square in squares[:3])
+            black = sum(1 << square for square in squares[3:])
+            index = layout.encode(attempt % 2 == 0, red, black)
+            self.assertLess(index, layout.get_size())
+            self.assertEqual((attempt % 2 == 0, sorted(squares[:3]), sorted(squares[3:])), layout.decode(index))
+
+    # Dependencies come before the tables that need them
+    def test3(self):
+        dependencies = get_dependencies((2, 1, 1, 2))
+        self.assertEqual(12, len(dependencies))
+        self.assertEqual((2, 1, 1, 2), dependencies[-1])
+        self.assertLess(dependencies.index((2, 1, 1, 1)), dependencies.index((2, 1, 1, 2)))
+        with self.assertRaises(ValueError):
+            get_dependencies((2, 1, 0, 2))
+
+
+class Test_generate(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiTablebase.generate() function."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Finished tables are skipped when generating again
+    def test1(self):
+        generated = generate(self.directory.name, 2, 0, 1, 1, chunk_size=1000)
+        self.assertEqual(["r0b0_n11.hstb", "r1b0_n11.hstb", "r2b0_n11.hstb"], [stats["table"] for stats in generated])
+        # Red wins in one by capturing an empty corner, then black has no pieces to move
+        self.assertEqual(120, generated[-1]["WIN"])
+        self.assertEqual(0, generated[-1]["LOSS"])
+        self.assertEqual(20 + 2 * 6480, os.path.getsize(os.path.join(self.directory.name, "r2b0_n11.hstb")))
+        self.assertEqual([], generate(self.directory.name, 2, 0, 1, 1))
+        self.assertEqual(["r0b0_n11.hstb", "r1b0_n11.hstb", "r2b0_n11.hstb"], sorted(os.listdir(self.directory.name)))
+
+    # Chunks scanned before generation was stopped are reused
+    def test2(self):
+        generate(self.directory.name, 1, 0)
+        tablebase_module._scan_chunk(self.directory.name, (2, 0, 1, 1), 0, 1000)
+        with unittest.mock.patch.object(tablebase_module, "_scan", wraps=tablebase_module._scan) as scan:
+            generate(self.directory.name, 2, 0, 1, 1, chunk_size=1000)
+        self.assertEqual(6, scan.call_count)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "r2b0_n11.hstb.scan")))
+
+        with open(os.path.join(self.directory.name, "r2b0_n11.hstb"), "rb") as file:
+            resumed = file.read()
+        with tempfile.TemporaryDirectory() as directory:
+            generate(directory, 2, 0, 1, 1, workers=2, chunk_size=2000)
+            with open(os.path.join(directory, "r2b0_n11.hstb"), "rb") as file:
+                self.assertEqual(file.read(), resumed)
+
+    def test3(self):
+        arguments = ["tablebase", self.directory.name, "--red", "1", "--black", "1"]
+        with unittest.mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(0, tools_main(arguments))
+        self.assertIn("4 tables generated", stderr.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, table_name((1, 1, 1, 1)))))
+
+
+class Test_Tablebase(unittest.TestCase):
+    """Contains unit tests for the HasamiShogiTablebase.Tablebase class, on the 2 red against 1 black table."""
+
+    configuration = (2, 1, 1, 1)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        generate(cls.directory.name, 2, 1, 1, 1)
+        cls.tablebase = Tablebase(cls.directory.name)
+        rng = random.Random(18)
+        size = tablebase_module._Layout(2, 1).get_size()
+        cls.indices = [rng.randrange(size) for attempt in range(400)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        cls.directory.cleanup()
+
+    def probe_all(self, backend="standard"):
+        return [self.tablebase.probe(game_at(index, self.configuration, backend)) for index in self.indices]
+
+    def test1(self):
+        self.assertIn(self.configuration, self.tablebase.get_configurations())
+        self.assertIsNone(self.tablebase.probe(HasamiShogiGame(quiet=True)))
+        game = game_at(self.indices[0], self.configuration)
+        game._game_state = "RED_WON"
+        self.assertIsNone(self.tablebase.probe(game))
+        self.assertEqual(self.probe_all(), self.probe_all("bitboard"))
+
+    # Short results match a plain search to the same depth, which can't find them one ply shallower
+    def test2(self):
+        checked = 0
+        for index in self.indices:
+            game = game_at(index, self.configuration)
+            result, distance = self.tablebase.probe(game)
+            if result == "DRAW" or distance > 3:
+                continue
+            search = AlphaBetaSearch()
+            expected = WIN_SCORE - distance if result == "WIN" else -WIN_SCORE + distance
+            self.assertEqual(expected, search._negamax(game, distance, -WIN_SCORE - 1, WIN_SCORE + 1, 0))
+            shallower = search._negamax(game, distance - 1, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+            if result == "WIN":
+                self.assertLess(shallower, WIN_SCORE - distance)
+            checked += 1
+        self.assertGreater(checked, 20)
+
+    # Both players following get_best_move end the game in exactly the probed number of plies
+    def test3(self):
+        for index in self.indices[:40]:
+            game = game_at(index, self.configuration)
+            result, distance = self.tablebase.probe(game)
+            if result == "DRAW":
+                continue
+            winner = game.get_active_player() if result == "WIN" else \
+                ("RED" if game.get_active_player() == "BLACK" else "BLACK")
+            for ply in range(distance):
+                move, position = self.tablebase.get_best_move(game)
+                self.assertEqual(distance - ply, position[1])
+                game._execute_move(SQUARE_XY[move[0]], SQUARE_XY[move[1]])
+            self.assertEqual(winner + "_WON", game.get_game_state())
+
+    # The search scores positions with a table exactly
+    def test4(self):
+        for index in self.indices[:10]:
+            game = game_at(index, self.configuration)
+            result, distance = self.tablebase.probe(game)
+            score = find_best_move(game, depth=1, tablebase=self.tablebase).get_score()
+            if result == "WIN":
+                self.assertEqual(WIN_SCORE - distance, score)
+            elif result == "LOSS":
+                self.assertEqual(-WIN_SCORE + distance, score)
+
+    # Games with a repetition rule are searched without the tables, which don't know about repetitions
+    def test5(self):
+        game = game_at(self.indices[0], self.configuration)
+        game.set_repetition_rule(3)
+        with unittest.mock.patch.object(self.tablebase, "probe", wraps=self.tablebase.probe) as probe:
+            result = find_best_move(game, depth=2, tablebase=self.tablebase)
+        probe.assert_not_called()
+        self.assertEqual(find_best_move(game, depth=2).get_score(), result.get_score())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# Author: Shawn Robinson
+# Date: 2026/10/18
+# Description: Command line entry point for the HasamiShogiGame tools
+#
+# Usage: python -m HasamiShogiTools <command> [options]
+#     selfplay    Play games against itself and save them (see HasamiShogiSelfPlay.py)
+#     bench       Run the benchmark suite and compare it against a baseline (see HasamiShogiBenchmarks.py)
+#     serve       Host games for clients over TCP or a Unix socket (see HasamiShogiServer.py)
+#     load        Play many games on a running server and report moves/sec and latency
+#     record      Convert self-play games to binary game records, or check a record file (see HasamiShogiRecord.py)
+#     book        Build an opening book from game record or self-play files (see HasamiShogiBook.py)
+#     tablebase   Generate endgame tables for positions with few pieces left (see HasamiShogiTablebase.py)
+#     perft       Count the move tree below a position, or compare it between board backends (see HasamiShogiPerft.py)
+
+import argparse
+import sys
+
+import HasamiShogiBenchmarks
+import HasamiShogiBook
+import HasamiShogiPerft
+import HasamiShogiRecord
+import HasamiShogiSelfPlay
+import HasamiShogiServer
+import HasamiShogiTablebase
+
+
+def main(argv=None):
+    """
+    Parses the command line and runs the requested tool.
+    :param argv: List of command line arguments, defaults to sys.argv[1:]
+    :return: Int exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m HasamiShogiTools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    selfplay = commands.add_parser("selfplay", help="play games against itself and save them")
+    HasamiShogiSelfPlay.add_arguments(selfplay)
+    selfplay.set_defaults(run=HasamiShogiSelfPlay.run_command)
+
+    record = commands.add_parser("record", help="convert or check binary game record files")
+    HasamiShogiRecord.add_arguments(record)
+    record.set_defaults(run=HasamiShogiRecord.run_command)
+
+    book = commands.add_parser("book", help="build an opening book from saved games")
+    HasamiShogiBook.add_arguments(book)
+    book.set_defaults(run=HasamiShogiBook.run_command)
+
+    bench = commands.add_parser("bench", help="run the benchmark suite")
+    HasamiShogiBenchmarks.add_arguments(bench)
+    bench.set_defaults(run=HasamiShogiBenchmarks.run_command)
+
+    serve = commands.add_parser("serve", help="host games for clients over TCP or a Unix socket")
+    HasamiShogiServer.add_serve_arguments(serve)
+    serve.set_defaults(run=HasamiShogiServer.run_serve_command)
+
+    load = commands.add_parser("load", help="play many games on a running server and measure it")
+    HasamiShogiServer.add_load_arguments(load)
+    load.set_defaults(run=HasamiShogiServer.run_load_command)
+
+    tablebase = commands.add_parser("tablebase", help="generate endgame tables")
+    HasamiShogiTablebase.add_arguments(tablebase)
+    tablebase.set_defaults(run=HasamiShogiTablebase.run_command)
+
+    perft = commands.add_parser("perft", help="count the move tree below a position")
+    HasamiShogiPerft.add_arguments(perft)
+    perft.set_defaults(run=HasamiShogiPerft.run_command)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())